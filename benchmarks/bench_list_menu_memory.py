@@ -0,0 +1,126 @@
+"""Benchmark peak memory of list_menu search: buffered decoding vs streaming parser.
+
+Usage:
+    python benchmarks/bench_list_menu_memory.py [interface_count]
+
+Builds a synthetic list_menu body, serves it through httpx.MockTransport in 64 KiB
+chunks and measures the tracemalloc peak (excluding the prebuilt body) of:
+
+- buffered: the previous implementation (response.json() + _cat_name injection)
+- streaming: YApiClient.search_interfaces on top of JSONStreamParser
+"""
+
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Callable, Coroutine
+from typing import Any
+
+import httpx
+
+from yapi_mcp.yapi.client import YApiClient
+from yapi_mcp.yapi.models import YApiInterfaceSummary
+
+BASE_URL = "https://yapi.example.com"
+CHUNK_SIZE = 64 * 1024
+DEFAULT_COUNT = 20_000
+PER_CATEGORY = 200
+
+
+def build_body(count: int) -> bytes:
+    categories = []
+    for cat_index in range(0, count, PER_CATEGORY):
+        items = [
+            {
+                "_id": i,
+                "catid": cat_index,
+                "project_id": 1,
+                "title": f"接口 {i}",
+                "path": f"/api/module{cat_index}/resource{i}",
+                "method": "GET" if i % 2 else "POST",
+                "status": "done",
+                "uid": 11,
+                "edit_uid": 0,
+                "add_time": 1_700_000_000,
+                "up_time": 1_700_000_000 + i,
+            }
+            for i in range(cat_index, min(cat_index + PER_CATEGORY, count))
+        ]
+        categories.append(
+            {"_id": cat_index, "name": f"分类 {cat_index}", "desc": "x" * 64, "list": items}
+        )
+    return json.dumps({"errcode": 0, "errmsg": "成功！", "data": categories}).encode()
+
+
+def make_client(body: bytes) -> YApiClient:
+    async def chunks() -> AsyncIterator[bytes]:
+        view = memoryview(body)
+        for start in range(0, len(body), CHUNK_SIZE):
+            yield bytes(view[start : start + CHUNK_SIZE])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=chunks(), request=request)
+
+    client = YApiClient(BASE_URL, {})
+    client.client = httpx.AsyncClient(
+        base_url=f"{BASE_URL}/api", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+async def buffered_search(client: YApiClient, keyword: str) -> int:
+    response = await client.client.get("/interface/list_menu", params={"project_id": 1})
+    data = response.json()
+    interfaces = []
+    for cat in data.get("data", []):
+        for iface in cat.get("list", []):
+            iface["_cat_name"] = cat.get("name", "")
+            interfaces.append(iface)
+    keyword_lower = keyword.lower()
+    interfaces = [
+        iface
+        for iface in interfaces
+        if keyword_lower in iface.get("title", "").lower()
+        or keyword_lower in iface.get("path", "").lower()
+        or keyword_lower in iface.get("_cat_name", "").lower()
+    ]
+    return len([YApiInterfaceSummary(**iface) for iface in interfaces])
+
+
+async def streaming_search(client: YApiClient, keyword: str) -> int:
+    return len(await client.search_interfaces(1, keyword))
+
+
+async def measure(
+    name: str,
+    body: bytes,
+    search: Callable[[YApiClient, str], Coroutine[Any, Any, int]],
+) -> None:
+    client = make_client(body)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    hits = await search(client, "resource1")
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await client.close()
+    print(
+        f"{name:<10} hits={hits:<6} peak={(peak - baseline) / 1024 / 1024:8.2f} MiB "
+        f"time={elapsed * 1000:8.1f} ms"
+    )
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    body = build_body(count)
+    print(f"list_menu body: {count} interfaces, {len(body) / 1024 / 1024:.2f} MiB")
+    await measure("buffered", body, buffered_search)
+    await measure("streaming", body, streaming_search)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Benchmark tool-response serialization: validate + dump vs trusted fast path.
+
+Usage:
+    python benchmarks/bench_model_serialization.py [interface_count]
+
+Compares, for search summaries and full interface definitions:
+
+- strict: Model(**data) -> model_dump(by_alias=True) -> json.dumps (previous path)
+- fast:   Model.model_construct(**data) -> precompiled TypeAdapter.dump_json
+"""
+
+import json
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from yapi_mcp.yapi.models import (
+    INTERFACE_LIST_ADAPTER,
+    SUMMARY_LIST_ADAPTER,
+    YApiInterface,
+    YApiInterfaceSummary,
+)
+
+DEFAULT_COUNT = 5_000
+ROUNDS = 5
+
+
+def make_interface(i: int) -> dict[str, Any]:
+    return {
+        "_id": i,
+        "catid": i // 100,
+        "project_id": 1,
+        "title": f"查询订单详情 {i}",
+        "path": f"/api/orders/{i}",
+        "method": "GET",
+        "status": "done",
+        "desc": "<p>订单详情</p>",
+        "markdown": "订单详情",
+        "req_query": [{"name": "id", "required": "1", "desc": "订单ID", "example": str(i)}],
+        "req_headers": [{"name": "Authorization", "value": "Bearer x", "required": "1"}],
+        "req_params": [],
+        "res_body_type": "json",
+        "res_body_is_json_schema": True,
+        "res_body": json.dumps({"type": "object", "properties": {"id": {"type": "integer"}}}),
+        "tag": ["order"],
+        "add_time": 1_700_000_000,
+        "up_time": 1_700_000_000 + i,
+    }
+
+
+def strict(model: type[BaseModel], items: list[dict[str, Any]]) -> str:
+    models = [model(**item) for item in items]
+    return json.dumps(
+        [item.model_dump(by_alias=True) for item in models], ensure_ascii=False, indent=2
+    )
+
+
+def fast(model: type[BaseModel], adapter: TypeAdapter[Any], items: list[dict[str, Any]]) -> str:
+    models = [model.model_construct(**item) for item in items]
+    return adapter.dump_json(models, by_alias=True, indent=2, warnings=False).decode()
+
+
+def bench(name: str, count: int, run: Callable[[], str]) -> None:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        output = run()
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    print(
+        f"{name:<16} {elapsed * 1000:8.1f} ms  {count / elapsed:10.0f} items/s  "
+        f"({len(output) / 1024:.0f} KiB)"
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    interfaces = [make_interface(i) for i in range(count)]
+    summaries = [
+        {key: item[key] for key in ("_id", "title", "path", "method")} for item in interfaces
+    ]
+    print(f"{count} items, mean of {ROUNDS} rounds")
+    bench("summary strict", count, lambda: strict(YApiInterfaceSummary, summaries))
+    bench(
+        "summary fast",
+        count,
+        lambda: fast(YApiInterfaceSummary, SUMMARY_LIST_ADAPTER, summaries),
+    )
+    bench("interface strict", count, lambda: strict(YApiInterface, interfaces))
+    bench(
+        "interface fast",
+        count,
+        lambda: fast(YApiInterface, INTERFACE_LIST_ADAPTER, interfaces),
+    )
+
+
+if __name__ == "__main__":
+    main()
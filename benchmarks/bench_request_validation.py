@@ -0,0 +1,72 @@
+"""Benchmark create/update request preparation: validate + build payload, no network.
+
+Usage:
+    python benchmarks/bench_request_validation.py [form_field_count]
+
+Compares, for a large req_body_form plus query/header/param/tag arrays:
+
+- twice: validation decodes the JSON strings, the payload builder decodes them again
+  (previous path)
+- once:  validation returns ParsedInterfaceArrays and the payload uses those lists
+"""
+
+import json
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from yapi_mcp.server import _validate_interface_request
+
+DEFAULT_COUNT = 2_000
+ROUNDS = 20
+
+
+def make_arguments(count: int) -> dict[str, str]:
+    def array(prefix: str) -> str:
+        return json.dumps(
+            [
+                {"name": f"{prefix}_{i}", "type": "text", "required": "1", "desc": f"字段 {i}"}
+                for i in range(count)
+            ],
+            ensure_ascii=False,
+        )
+
+    return {
+        "req_body_form": array("form"),
+        "req_query": array("query"),
+        "req_headers": array("header"),
+        "req_params": array("param"),
+        "tag": json.dumps([f"tag{i}" for i in range(count)]),
+    }
+
+
+def twice(arguments: dict[str, str]) -> dict[str, Any]:
+    _validate_interface_request(req_body_type="form", **arguments)
+    return {name: json.loads(value) for name, value in arguments.items()}
+
+
+def once(arguments: dict[str, str]) -> dict[str, Any]:
+    arrays = _validate_interface_request(req_body_type="form", **arguments)
+    return {name: getattr(arrays, name) for name in arguments}
+
+
+def bench(name: str, run: Callable[[], dict[str, Any]]) -> None:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        run()
+    elapsed = (time.perf_counter() - started) / ROUNDS
+    print(f"{name:<6} {elapsed * 1000:8.2f} ms per request")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    arguments = make_arguments(count)
+    size = sum(len(value) for value in arguments.values())
+    print(f"{count} fields per array ({size / 1024:.0f} KiB of JSON), mean of {ROUNDS} rounds")
+    bench("twice", lambda: twice(arguments))
+    bench("once", lambda: once(arguments))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark memory per 10k cached interfaces: list_menu dicts vs ProjectSnapshot.
+
+Usage:
+    python benchmarks/bench_snapshot_memory.py [interface_count]
+
+Reports the tracemalloc size of each representation kept alive after building,
+normalised to 10k interfaces, plus keyword search latency over it.
+"""
+
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from yapi_mcp.yapi.models import YApiInterfaceSummary
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+
+DEFAULT_COUNT = 50_000
+PER_CATEGORY = 200
+PER_10K = 10_000
+SEARCH_ROUNDS = 20
+
+
+def make_records(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "_id": i,
+            "catid": i // PER_CATEGORY,
+            "title": f"查询用户订单详情 {i}",
+            "path": f"/api/v1/module{i // PER_CATEGORY}/orders/{i}/detail",
+            "method": ("GET", "POST", "PUT", "DELETE")[i % 4],
+            "status": "done" if i % 3 else "undone",
+            "tag": ["order"] if i % 5 == 0 else [],
+            "up_time": 1_700_000_000 + i,
+            "_cat_name": f"分类 {i // PER_CATEGORY}",
+        }
+        for i in range(count)
+    ]
+
+
+def build_dicts(records: list[dict[str, Any]]) -> object:
+    dicts = [dict(record) for record in records]
+    summaries = [YApiInterfaceSummary(**record) for record in dicts]
+    return dicts, summaries
+
+
+def build_snapshot(records: list[dict[str, Any]]) -> object:
+    return ProjectSnapshot(1).extend(records).freeze()
+
+
+def measure(name: str, records: list[dict[str, Any]], build: Callable[..., object]) -> object:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = build(records)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_10k = (after - before) / len(records) * PER_10K
+    print(f"{name:<22} {per_10k / 1024 / 1024:8.2f} MiB per 10k interfaces")
+    return kept
+
+
+def search_dicts(kept: object, keyword: str) -> int:
+    dicts, _ = kept  # type: ignore[misc]
+    return sum(
+        1
+        for iface in dicts
+        if keyword in iface["title"].lower()
+        or keyword in iface["path"].lower()
+        or keyword in iface["_cat_name"].lower()
+    )
+
+
+def search_snapshot(kept: object, keyword: str) -> int:
+    return len(kept.search(keyword))  # type: ignore[attr-defined]
+
+
+def time_search(name: str, kept: object, search: Callable[[object, str], int]) -> None:
+    started = time.perf_counter()
+    for _ in range(SEARCH_ROUNDS):
+        hits = search(kept, "orders/4999")
+    elapsed = (time.perf_counter() - started) / SEARCH_ROUNDS
+    print(f"{name:<22} search {elapsed * 1000:8.2f} ms ({hits} hits)")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    records = make_records(count)
+    print(f"{count} interfaces")
+    dicts = measure("dicts + summaries", records, build_dicts)
+    snapshot = measure("ProjectSnapshot", records, build_snapshot)
+    time_search("dicts + summaries", dicts, search_dicts)
+    time_search("ProjectSnapshot", snapshot, search_snapshot)
+
+
+if __name__ == "__main__":
+    main()
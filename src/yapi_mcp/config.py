@@ -2,6 +2,7 @@
 
 import os
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -48,6 +49,89 @@ class ServerConfig(BaseSettings):
         description="Optional CAS authentication cookie (e.g., ZYBIPSCAS for custom deployments)",
     )
 
+    yapi_project_tokens: dict[int, str] = Field(
+        default_factory=dict,
+        description="Project ID -> project token for YApi open APIs (JSON object)",
+        examples=[{"11": "project-token"}],
+    )
+
+    yapi_cache_ttl: float = Field(
+        default=300.0,
+        ge=0,
+        description="Seconds cached interface data stays fresh (0 disables cache reads)",
+    )
+
+    yapi_offline_retry: float = Field(
+        default=30.0,
+        ge=0,
+        description=(
+            "Seconds after a network failure during which reads use the local cache "
+            "without trying YApi and writes fail fast (0 always tries YApi first)"
+        ),
+    )
+
+    yapi_query_cache_size: int = Field(
+        default=256,
+        ge=0,
+        description="Maximum number of cached search results (0 disables the result cache)",
+    )
+
+    yapi_search_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum concurrent list_menu requests for cross-project search",
+    )
+
+    yapi_strict_validation: bool = Field(
+        default=False,
+        description="Fully validate YApi responses with pydantic instead of trusting them",
+    )
+
+    yapi_update_debounce: float = Field(
+        default=0.0,
+        ge=0,
+        description="Seconds to hold and merge successive updates of an interface (0 disables)",
+    )
+
+    yapi_validate_schema: bool = Field(
+        default=False,
+        description="Check req_body/res_body JSON Schemas against the meta-schema before writing",
+    )
+
+    yapi_watch_min_interval: float = Field(
+        default=10.0,
+        gt=0,
+        description="Seconds between polls of a watched project right after it changed",
+    )
+
+    yapi_watch_max_interval: float = Field(
+        default=300.0,
+        gt=0,
+        description="Longest poll interval (seconds) of an idle watched project",
+    )
+
+    yapi_shared_projects: list[int] = Field(
+        default_factory=list,
+        description="Project IDs every user may read; their cached data is shared across users",
+        examples=[[11, 12]],
+    )
+
+    yapi_client_idle_timeout: float = Field(
+        default=300.0,
+        ge=0,
+        description="Seconds a per-user YApi client stays open without being used",
+    )
+
+    yapi_allow_default_login: bool = Field(
+        default=False,
+        description="Serve http/sse calls without credential headers as the configured login",
+    )
+
+    yapi_cache_path: Path | None = Field(
+        default=None,
+        description="SQLite file caching YApi data for all worker processes on this host",
+    )
+
     @property
     def cookies(self) -> dict[str, str]:
         """Return cookies dictionary for YApi API authentication."""
@@ -60,6 +144,39 @@ class ServerConfig(BaseSettings):
         return cookies
 
 
+class TransportConfig(BaseSettings):
+    """How the MCP server is exposed, loaded before and independently of YApi settings."""
+
+    model_config = SettingsConfigDict(
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    yapi_mcp_transport: Literal["stdio", "http", "sse"] = Field(
+        default="stdio",
+        description="MCP transport: stdio (one client), http (streamable HTTP) or sse",
+    )
+
+    yapi_mcp_host: str = Field(
+        default="127.0.0.1",
+        description="Address the http/sse transport listens on",
+    )
+
+    yapi_mcp_port: int = Field(
+        default=8000,
+        ge=1,
+        le=65535,
+        description="Port the http/sse transport listens on",
+    )
+
+    yapi_session_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum concurrent tool calls per MCP session in http/sse mode",
+    )
+
+
 def resolve_env_file_path() -> Path | None:
     """Resolve an explicit .env file path from the environment."""
     raw_env_file = os.getenv(ENV_FILE_ENV_VAR)
@@ -81,3 +198,9 @@ def load_server_config() -> ServerConfig:
     """Load server config from process env and optional explicit .env file."""
     env_file = resolve_env_file_path()
     return ServerConfig(_env_file=env_file)
+
+
+def load_transport_config() -> TransportConfig:
+    """Load transport settings from process env and optional explicit .env file."""
+    env_file = resolve_env_file_path()
+    return TransportConfig(_env_file=env_file)
@@ -1,31 +1,70 @@
 """YApi MCP Server - Main server module with fastmcp."""
 
+import asyncio
 import json
 import sys
-from collections.abc import AsyncIterator
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
-from functools import cache
-from typing import Annotated, Any
+from datetime import datetime
+from functools import cache, partial
+from operator import attrgetter
+from pathlib import Path
+from typing import Annotated, Any, TypeVar
 
 import httpx
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
 from pydantic import ValidationError
 
 from yapi_mcp.config import (
     ENV_FILE_ENV_VAR,
     EnvFileConfigurationError,
     ServerConfig,
+    TransportConfig,
     load_server_config,
+    load_transport_config,
+)
+from yapi_mcp.yapi.backend import SQLiteCacheBackend
+from yapi_mcp.yapi.cache import YApiCache
+from yapi_mcp.yapi.client import (
+    DetailedSearchResult,
+    ProjectSearchResult,
+    YApiClient,
+    check_import_options,
 )
-from yapi_mcp.yapi.client import YApiClient
 from yapi_mcp.yapi.errors import (
     ERROR_TYPE_AUTH_FAILED,
+    ERROR_TYPE_CONFLICT,
     ERROR_TYPE_NETWORK_ERROR,
+    ERROR_TYPE_OFFLINE,
+    ERROR_TYPE_SERVER_ERROR,
     ERROR_TYPE_VALIDATION_FAILED,
+    MCP_CODE_CONFLICT,
     MCP_CODE_INVALID_PARAMS,
+    OfflineError,
+    UpdateConflictError,
     format_tool_error,
     map_http_error_to_mcp,
 )
+from yapi_mcp.yapi.field_index import FIELD_LOCATIONS, FieldIndexer
+from yapi_mcp.yapi.models import (
+    INTERFACE_LIST_ADAPTER,
+    SUMMARY_LIST_ADAPTER,
+    ParsedInterfaceArrays,
+    YApiInterface,
+)
+from yapi_mcp.yapi.offline import Connectivity
+from yapi_mcp.yapi.openapi import ImportPlan, SpecOperation, load_spec, operations_from_spec
+from yapi_mcp.yapi.pool import ClientPool, Credentials
+from yapi_mcp.yapi.query import QuerySyntaxError
+from yapi_mcp.yapi.schema import schema_errors
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+from yapi_mcp.yapi.watcher import ProjectWatcher, SnapshotChanges
+from yapi_mcp.yapi.write_queue import UpdateCoalescer
+
+_T = TypeVar("_T")
 
 
 class MCPToolError(RuntimeError):
@@ -86,6 +125,22 @@ def _network_error_to_tool_error(
     return MCPToolError(error_json)
 
 
+def _offline_to_tool_error(
+    error: OfflineError,
+    operation: str,
+    params: dict[str, Any],
+) -> MCPToolError:
+    error_json = format_tool_error(
+        error_type=ERROR_TYPE_OFFLINE,
+        message=str(error),
+        operation=operation,
+        params=params,
+        error_code=-32000,
+        retryable=True,
+    )
+    return MCPToolError(error_json)
+
+
 def _wrap_validation_error(
     error: ValueError,
     operation: str,
@@ -102,11 +157,99 @@ def _wrap_validation_error(
     return MCPValidationError(error_json)
 
 
+def _conflict_to_tool_error(
+    error: UpdateConflictError,
+    operation: str,
+    params: dict[str, Any],
+) -> MCPToolError:
+    error_json = format_tool_error(
+        error_type=ERROR_TYPE_CONFLICT,
+        message=str(error),
+        operation=operation,
+        params={**params, "current_up_time": error.current_up_time},
+        error_code=MCP_CODE_CONFLICT,
+        retryable=False,
+    )
+    return MCPToolError(error_json)
+
+
 def _wrap_tool_error(prefix: str, error: Exception) -> MCPToolError:
     message = f"{prefix}: {error!s}"
     return MCPToolError(message)
 
 
+def _describe_project_error(error: Exception) -> dict[str, Any]:
+    """Summarize a per-project failure for partial cross-project results."""
+    if isinstance(error, httpx.HTTPStatusError):
+        mcp_error = map_http_error_to_mcp(error)
+        return {"error_type": mcp_error.error_type, "message": mcp_error.message}
+    if isinstance(error, (httpx.TimeoutException, httpx.ConnectError)):
+        return {"error_type": ERROR_TYPE_NETWORK_ERROR, "message": f"网络错误: {error!s}"}
+    return {"error_type": ERROR_TYPE_SERVER_ERROR, "message": str(error)}
+
+
+def _format_search_all_result(result: ProjectSearchResult, limit: int) -> str:
+    return json.dumps(
+        {
+            "results": [
+                {"project_id": hit.project_id, **hit.summary, "score": hit.score}
+                for hit in result.hits[:limit]
+            ],
+            "total": len(result.hits),
+            "partial": result.partial,
+            "failed": [
+                {"project_id": project_id, **_describe_project_error(error)}
+                for project_id, error in result.errors.items()
+            ],
+            "timed_out": result.timed_out,
+        },
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+def _ensure_search_scope(project_ids: list[int] | None, group_id: int | None) -> None:
+    if not project_ids and group_id is None:
+        msg = "project_ids 和 group_id 至少需要提供一个"
+        raise ValueError(msg)
+
+
+def _ensure_field_query(field: str, location: str | None) -> None:
+    if not field.strip():
+        msg = "field 不能为空"
+        raise ValueError(msg)
+    if location is not None and location not in FIELD_LOCATIONS:
+        msg = f"location 无效: {location}。可选值为: {'/'.join(FIELD_LOCATIONS)}"
+        raise ValueError(msg)
+
+
+def _ensure_positive(name: str, value: int) -> None:
+    if value < 1:
+        msg = f"{name} 必须大于等于 1"
+        raise ValueError(msg)
+
+
+def _format_detailed_search_result(result: DetailedSearchResult, max_chars: int) -> str:
+    """Include full definitions while they fit in max_chars; list the rest as summaries."""
+    interfaces: list[dict[str, Any]] = []
+    omitted: list[dict[str, Any]] = []
+    used = 0
+    for interface in result.interfaces:
+        data = interface.model_dump(by_alias=True, mode="json", warnings=False)
+        size = len(json.dumps(data, ensure_ascii=False))
+        if omitted or used + size > max_chars:
+            # 超出预算后只保留摘要，可再用 yapi_get_interface 单独获取
+            omitted.append({key: data[key] for key in ("_id", "title", "path", "method")})
+            continue
+        used += size
+        interfaces.append(data)
+    return json.dumps(
+        {"interfaces": interfaces, "omitted": omitted, "total": result.total},
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
 def _ensure_path_starts_with_slash(path: str) -> None:
     if not path.startswith("/"):
         raise InvalidInterfacePathError
@@ -132,17 +275,28 @@ def _validate_interface_request(
     req_body_type: str | None = None,
     req_body: str | None = None,
     req_body_form: str | None = None,
+    req_body_is_json_schema: bool | None = None,
+    res_body: str | None = None,
     res_body_type: str | None = None,
+    res_body_is_json_schema: bool | None = None,
     status: str | None = None,
     req_query: str | None = None,
     req_headers: str | None = None,
     req_params: str | None = None,
     tag: str | None = None,
-) -> None:
+    check_schema: bool = False,
+) -> ParsedInterfaceArrays:
     """Validate cross-field constraints for interface create/update requests.
 
     Treats both None and "" as "not provided" to unify create (default "")
     and update (default None) tool signatures.
+
+    Args:
+        check_schema: Also check req_body/res_body against the JSON Schema
+            meta-schema when they are JSON Schema bodies
+
+    Returns:
+        The JSON array arguments decoded once, for the client to send as-is
     """
 
     def _provided(v: str | None) -> bool:
@@ -151,8 +305,7 @@ def _validate_interface_request(
     # 1. Enum value validation
     if method is not None and method not in _VALID_METHODS:
         raise ValueError(
-            f'method "{method}" 无效。'
-            f"支持的 HTTP 方法为：{'、'.join(sorted(_VALID_METHODS))}。"
+            f'method "{method}" 无效。支持的 HTTP 方法为：{"、".join(sorted(_VALID_METHODS))}。'
         )
 
     if req_body_type is not None and req_body_type not in _VALID_REQ_BODY_TYPES:
@@ -162,14 +315,10 @@ def _validate_interface_request(
         )
 
     if res_body_type is not None and res_body_type not in _VALID_RES_BODY_TYPES:
-        raise ValueError(
-            f'res_body_type "{res_body_type}" 无效。支持的值为：json、raw。'
-        )
+        raise ValueError(f'res_body_type "{res_body_type}" 无效。支持的值为：json、raw。')
 
     if status is not None and status not in _VALID_STATUSES:
-        raise ValueError(
-            f'status "{status}" 无效。支持的值为：undone（未完成）、done（已完成）。'
-        )
+        raise ValueError(f'status "{status}" 无效。支持的值为：undone（未完成）、done（已完成）。')
 
     has_req_body = _provided(req_body)
     has_req_body_form = _provided(req_body_form)
@@ -213,28 +362,236 @@ def _validate_interface_request(
         "req_params": req_params,
         "tag": tag,
     }
-    for field_name, field_value in json_array_fields.items():
-        if not _provided(field_value):
-            continue
-        example = _JSON_ARRAY_FIELD_EXAMPLES[field_name]
-        try:
-            parsed = json.loads(field_value)  # type: ignore[arg-type]
-        except json.JSONDecodeError as exc:
-            raise ValueError(
-                f"{field_name} 必须是合法的 JSON 数组格式（如 {example}），"
-                f"当前值无法解析为 JSON：{exc.msg}。"
-            ) from exc
-        if not isinstance(parsed, list):
-            raise ValueError(
-                f"{field_name} 必须是 JSON 数组格式（以 [ 开头，以 ] 结尾），"
-                f"如：{example}。当前值解析后不是数组类型。"
-            )
+    parsed_arrays = {
+        field_name: _parse_json_array(field_name, field_value)
+        for field_name, field_value in json_array_fields.items()
+        if _provided(field_value)
+    }
+
+    # 5. Optional JSON Schema meta-schema validation
+    if check_schema:
+        _check_schema_body("req_body", req_body, req_body_type, req_body_is_json_schema)
+        _check_schema_body("res_body", res_body, res_body_type, res_body_is_json_schema)
+
+    return ParsedInterfaceArrays(**parsed_arrays)
+
+
+# 批量预校验时逐项检查的字段(与 yapi_create_interface 参数同名)
+_DRY_RUN_REQUIRED_FIELDS = ("title", "path", "method")
+_DRY_RUN_STRING_FIELDS = (
+    "method",
+    "req_body_type",
+    "req_body",
+    "req_body_form",
+    "res_body",
+    "res_body_type",
+    "status",
+    "req_query",
+    "req_headers",
+    "req_params",
+    "tag",
+)
+
+
+def _dry_run_interface(payload: dict[str, Any]) -> list[str]:
+    """Run every local create-time check on one payload and return its problems."""
+    missing = [name for name in _DRY_RUN_REQUIRED_FIELDS if not payload.get(name)]
+    if missing:
+        return [f"缺少必填字段: {'、'.join(missing)}"]
+
+    # 允许直接传入已解析的数组/对象，按工具参数的字符串形式校验
+    arguments = {
+        name: value if value is None or isinstance(value, str) else json.dumps(value)
+        for name in _DRY_RUN_STRING_FIELDS
+        if (value := payload.get(name)) is not None
+    }
+    try:
+        _ensure_path_starts_with_slash(str(payload["path"]))
+        _validate_interface_request(
+            **arguments,
+            req_body_is_json_schema=payload.get("req_body_is_json_schema"),
+            res_body_is_json_schema=payload.get("res_body_is_json_schema"),
+            check_schema=True,
+        )
+    except ValueError as exc:
+        return [str(exc)]
+    return []
+
+
+def _ensure_payload_objects(interfaces: list[Any]) -> None:
+    if not all(isinstance(payload, dict) for payload in interfaces):
+        msg = "interfaces 的每一项都必须是 JSON 对象"
+        raise ValueError(msg)
+
+
+def _dry_run_batch(interfaces: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    results = []
+    for index, payload in enumerate(interfaces):
+        errors = _dry_run_interface(payload)
+        results.append(
+            {
+                "index": index,
+                "title": payload.get("title"),
+                "method": payload.get("method"),
+                "path": payload.get("path"),
+                "valid": not errors,
+                "errors": errors,
+            }
+        )
+    return results
+
+
+def _read_spec_file(spec_path: str) -> str:
+    try:
+        return Path(spec_path).expanduser().read_text(encoding="utf-8")
+    except OSError as exc:
+        msg = f"无法读取规范文件 {spec_path}: {exc}"
+        raise ValueError(msg) from exc
+
+
+def _load_spec_operations(spec_path: str) -> tuple[list[SpecOperation], list[dict[str, Any]]]:
+    """Read and convert a spec file; split operations into valid ones and problems."""
+    valid, invalid = [], []
+    for operation in operations_from_spec(load_spec(_read_spec_file(spec_path))):
+        errors = _dry_run_interface(operation.payload)
+        if errors:
+            invalid.append({"method": operation.method, "path": operation.path, "errors": errors})
+        else:
+            valid.append(operation)
+    return valid, invalid
+
+
+def _load_import_data(spec_path: str, data_type: str) -> str:
+    """Read a file for /api/open/import_data as JSON text (YAML specs are converted)."""
+    text = _read_spec_file(spec_path)
+    if data_type == "swagger":
+        return json.dumps(load_spec(text), ensure_ascii=False)
+    try:
+        json.loads(text)
+    except ValueError as exc:
+        msg = f"无法解析为 JSON: {exc}"
+        raise ValueError(msg) from exc
+    return text
+
+
+def _project_token(config: ServerConfig, project_id: int) -> str:
+    token = config.yapi_project_tokens.get(project_id)
+    if not token:
+        msg = (
+            f"未配置项目 {project_id} 的 token:请在 YAPI_PROJECT_TOKENS 中添加"
+            f'(如 {{"{project_id}": "<项目设置 → token 配置 中的 token>"}})'
+        )
+        raise ValueError(msg)
+    return token
+
+
+def _import_report(
+    plan: ImportPlan, invalid: list[dict[str, Any]], outcomes: list[dict[str, Any]] | None
+) -> dict[str, Any]:
+    invalid = invalid + [
+        {"method": operation.method, "path": operation.path, "errors": [error]}
+        for operation, error in plan.errors
+    ]
+    create, update, failed = [], [], []
+    for index, write in enumerate(plan.writes):
+        operation = write.operation
+        entry: dict[str, Any] = {
+            "method": operation.method,
+            "path": operation.path,
+            "title": operation.payload["title"],
+            "category": operation.category,
+            "interface_id": write.interface_id,
+        }
+        outcome = outcomes[index] if outcomes is not None else None
+        if outcome is not None and outcome["action"] == "failed":
+            failed.append({**entry, "error": outcome["error"]})
+        elif write.interface_id is None:
+            if outcome is not None:
+                entry["interface_id"] = outcome["interface_id"]
+            create.append(entry)
+        else:
+            update.append({**entry, "changed": write.changed})
+    return {
+        "project_id": plan.project_id,
+        "dry_run": outcomes is None,
+        "summary": {
+            "create": len(create),
+            "update": len(update),
+            "unchanged": plan.unchanged,
+            "invalid": len(invalid),
+            "failed": len(failed),
+        },
+        "new_categories": plan.new_categories,
+        "create": create,
+        "update": update,
+        "invalid": invalid,
+        "failed": failed,
+    }
+
+
+def _parse_json_array(field_name: str, field_value: str | None) -> list[Any]:
+    example = _JSON_ARRAY_FIELD_EXAMPLES[field_name]
+    try:
+        parsed = json.loads(field_value)  # type: ignore[arg-type]
+    except json.JSONDecodeError as exc:
+        raise ValueError(
+            f"{field_name} 必须是合法的 JSON 数组格式（如 {example}），"
+            f"当前值无法解析为 JSON：{exc.msg}。"
+        ) from exc
+    if not isinstance(parsed, list):
+        raise ValueError(
+            f"{field_name} 必须是 JSON 数组格式（以 [ 开头，以 ] 结尾），"
+            f"如：{example}。当前值解析后不是数组类型。"
+        )
+    return parsed
+
+
+def _is_schema_body(body: str | None, body_type: str | None, is_json_schema: bool | None) -> bool:
+    """Whether a body is sent as a JSON Schema (json bodies default to schemas on create)."""
+    if not body or is_json_schema is False:
+        return False
+    return is_json_schema is True or body_type in (None, "json")
+
+
+def _check_schema_body(
+    field_name: str, body: str | None, body_type: str | None, is_json_schema: bool | None
+) -> None:
+    if not _is_schema_body(body, body_type, is_json_schema):
+        return
+    problems = schema_errors(body)  # type: ignore[arg-type]
+    if problems:
+        raise ValueError(
+            f"{field_name} 不是合法的 JSON Schema：{'；'.join(problems)}。"
+            f"如果 {field_name} 是示例数据而非 Schema，"
+            f"请将 {field_name}_is_json_schema 设为 false。"
+        )
 
 
 SEARCH_INTERFACES_ERROR = "搜索接口失败"
 GET_INTERFACE_ERROR = "获取接口失败"
+EXPORT_PROJECT_ERROR = "导出项目接口失败"
+SEARCH_ALL_ERROR = "跨项目搜索接口失败"
+SEARCH_FIELDS_ERROR = "搜索接口字段失败"
+SEARCH_AND_GET_ERROR = "搜索并获取接口失败"
+CACHE_STATS_ERROR = "获取缓存统计失败"
+LIST_CATEGORIES_ERROR = "获取接口分类失败"
 CREATE_INTERFACE_ERROR = "创建接口失败"
 UPDATE_INTERFACE_ERROR = "更新接口失败"
+VALIDATE_INTERFACES_ERROR = "批量校验接口失败"
+IMPORT_OPENAPI_ERROR = "导入 OpenAPI 规范失败"
+IMPORT_DATA_ERROR = "批量导入接口失败"
+WATCH_PROJECT_ERROR = "设置项目监听失败"
+PROJECT_RESOURCE_ERROR = "读取项目接口索引失败"
+
+OFFLINE_PARAM_DESCRIPTION = "只读取本地缓存,不请求 YApi(结果标注 stale 及获取时间)"
+
+# HTTP/SSE 模式下客户端可在请求头中携带自己的 YApi 登录，未携带时使用配置中的凭据
+TOKEN_HEADER = "x-yapi-token"  # noqa: S105
+UID_HEADER = "x-yapi-uid"
+CAS_HEADER = "x-yapi-cas"
+
+# 共享缓存后端中共享项目数据所在的分区
+SHARED_SCOPE = "shared"
 
 
 def _print_startup_http_error(error: httpx.HTTPStatusError, *, has_cas_cookie: bool) -> None:
@@ -270,8 +627,8 @@ def _print_startup_http_error(error: httpx.HTTPStatusError, *, has_cas_cookie: b
         )
 
 
-@asynccontextmanager
-async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+async def _validate_startup() -> None:
+    """Check configuration and credentials once before serving, exiting on failure."""
     try:
         config = get_config()
         async with YApiClient(str(config.yapi_server_url), config.cookies) as client:
@@ -289,7 +646,10 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
         missing = [e["loc"][0] for e in exc.errors() if e["type"] == "missing"]
         if missing:
             for field in missing:
-                print(f"[yapi-mcp] ERROR: Required configuration missing: {str(field).upper()}", file=sys.stderr)
+                print(
+                    f"[yapi-mcp] ERROR: Required configuration missing: {str(field).upper()}",
+                    file=sys.stderr,
+                )
         else:
             print(f"[yapi-mcp] ERROR: Configuration error: {exc}", file=sys.stderr)
         print(
@@ -309,9 +669,68 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
         print("[yapi-mcp] Check YAPI_SERVER_URL environment variable.", file=sys.stderr)
         raise MCPStartupError from None
     except Exception as exc:
-        print(f"[yapi-mcp] ERROR: Unexpected error during startup validation: {exc}", file=sys.stderr)
+        print(
+            f"[yapi-mcp] ERROR: Unexpected error during startup validation: {exc}", file=sys.stderr
+        )
         raise MCPStartupError from None
-    yield {}
+
+
+@asynccontextmanager
+async def app_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    # HTTP/SSE 模式下每个会话都会进入 lifespan，校验与清理由 _serve 在进程级别完成
+    if get_transport_config().yapi_mcp_transport != "stdio":
+        yield {}
+        return
+    await _validate_startup()
+    try:
+        yield {}
+    finally:
+        await _shutdown()
+
+
+async def _shutdown() -> None:
+    # 退出前提交各登录写缓冲中尚未发送的更新并停止监听
+    await get_tenants().close()
+
+
+async def _serve(transport: TransportConfig) -> None:
+    """Validate once, serve http/sse until stopped, then close every login."""
+    await _validate_startup()
+    try:
+        await mcp.run_async(
+            transport=transport.yapi_mcp_transport,
+            host=transport.yapi_mcp_host,
+            port=transport.yapi_mcp_port,
+        )
+    finally:
+        await _shutdown()
+
+
+class SessionConcurrencyLimit(Middleware):
+    """Caps concurrent tool calls per MCP session so one client cannot starve the others."""
+
+    def __init__(self, limit: int) -> None:
+        """Create the middleware.
+
+        Args:
+            limit: Maximum tool calls of one session running at once; later calls wait
+        """
+        self.limit = limit
+        self._slots: weakref.WeakKeyDictionary[object, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def on_call_tool(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:  # noqa: ANN401
+        ctx = context.fastmcp_context
+        if ctx is None:
+            return await call_next(context)
+        slot = self._slots.get(ctx.session)
+        if slot is None:
+            slot = self._slots[ctx.session] = asyncio.Semaphore(self.limit)
+        async with slot:
+            return await call_next(context)
 
 
 # Initialize MCP server
@@ -328,22 +747,315 @@ def get_config() -> ServerConfig:
     return load_server_config()
 
 
+@cache
+def get_transport_config() -> TransportConfig:
+    """Get or create TransportConfig instance (cached)."""
+    return load_transport_config()
+
+
+@cache
+def get_cache_backend() -> SQLiteCacheBackend | None:
+    """Get or open the cache database shared with other worker processes (cached)."""
+    path = get_config().yapi_cache_path
+    return SQLiteCacheBackend(path) if path is not None else None
+
+
+@cache
+def get_shared_cache() -> YApiCache:
+    """Get or create the cache of YAPI_SHARED_PROJECTS, shared by every login (cached)."""
+    config = get_config()
+    return YApiCache(
+        ttl=config.yapi_cache_ttl,
+        query_cache_size=config.yapi_query_cache_size,
+        backend=get_cache_backend(),
+        scope=SHARED_SCOPE,
+    )
+
+
+class _Tenant:
+    """Everything serving one YApi login: client, caches, field index, update queue, watcher."""
+
+    def __init__(self, credentials: Credentials, config: ServerConfig) -> None:
+        self.cache = YApiCache(
+            ttl=config.yapi_cache_ttl,
+            query_cache_size=config.yapi_query_cache_size,
+            shared=get_shared_cache(),
+            shared_projects=config.yapi_shared_projects,
+            backend=get_cache_backend(),
+            scope=credentials.fingerprint,
+        )
+        # 字段索引须在任何详情写入缓存之前开始跟随缓存
+        self.indexer = FieldIndexer(self.cache)
+        self.client = YApiClient(
+            credentials.server_url,
+            credentials.cookies,
+            cache=self.cache,
+            strict_validation=config.yapi_strict_validation,
+        )
+        self.coalescer = UpdateCoalescer(
+            partial(_send_update, self), delay=config.yapi_update_debounce
+        )
+        self.watcher = ProjectWatcher(
+            partial(_fetch_watched_snapshot, self),
+            partial(_on_project_change, self),
+            min_interval=config.yapi_watch_min_interval,
+            max_interval=config.yapi_watch_max_interval,
+            initial=self.cache.peek_snapshot,
+            on_error=_report_poll_error,
+        )
+
+    @property
+    def busy(self) -> bool:
+        """Whether updates are queued or in flight or projects watched: the login must stay open."""
+        return bool(self.coalescer.pending or self.coalescer.inflight or self.watcher.projects)
+
+    async def close(self) -> None:
+        # 提交写缓冲中尚未发送的更新
+        await self.coalescer.flush()
+        await self.watcher.stop()
+        # 共享缓存比本登录存活更久，须注销字段索引的监听
+        self.indexer.close()
+        await self.client.close()
+
+
+@cache
+def get_tenants() -> ClientPool[_Tenant]:
+    """Get or create the pool of per-login clients and caches (cached)."""
+    config = get_config()
+    return ClientPool(
+        partial(_Tenant, config=config),
+        idle_timeout=config.yapi_client_idle_timeout,
+        busy=attrgetter("busy"),
+    )
+
+
+def _request_credentials(config: ServerConfig) -> Credentials:
+    """YApi login of the current call: its credential headers, else the configured one.
+
+    Raises:
+        ValueError: If an http/sse call lacks the headers and the configured
+            login is not offered to anonymous callers
+    """
+    headers = get_http_headers()
+    token, uid = headers.get(TOKEN_HEADER), headers.get(UID_HEADER)
+    server_url = str(config.yapi_server_url)
+    if token is None and uid is None:
+        # 共享的 HTTP 服务默认不让匿名调用者以运维配置的身份访问 YApi
+        single_user = get_transport_config().yapi_mcp_transport == "stdio"
+        if not single_user and not config.yapi_allow_default_login:
+            msg = f"缺少请求头 {TOKEN_HEADER} 与 {UID_HEADER}，请以自己的 YApi 身份调用"
+            raise ValueError(msg)
+        return Credentials(server_url, config.yapi_token, config.yapi_uid, config.yapi_cas)
+    if not token or not uid:
+        msg = f"请求头 {TOKEN_HEADER} 与 {UID_HEADER} 需同时提供"
+        raise ValueError(msg)
+    return Credentials(server_url, token, uid, headers.get(CAS_HEADER))
+
+
+def _current_tenant() -> _Tenant:
+    return get_tenants().get(_request_credentials(get_config()))
+
+
+def get_cache() -> YApiCache:
+    """Get the cache of the calling login."""
+    return _current_tenant().cache
+
+
+def get_field_indexer() -> FieldIndexer:
+    """Get the field indexer following the calling login's cache."""
+    return _current_tenant().indexer
+
+
+@cache
+def get_connectivity() -> Connectivity:
+    """Get or create the process-wide YApi reachability tracker (cached)."""
+    return Connectivity(retry_interval=get_config().yapi_offline_retry)
+
+
+async def _read_with_fallback(
+    connectivity: Connectivity,
+    online: Callable[[], Awaitable[_T]],
+    local: Callable[[], tuple[_T, float]],
+    *,
+    offline: bool = False,
+) -> tuple[_T, float | None]:
+    """Run a read against YApi, serving it from the local cache while YApi is unreachable.
+
+    Args:
+        connectivity: Reachability tracker updated with the outcome
+        online: Performs the read (may use fresh cache entries)
+        local: Serves the read from the last cached copy, raising OfflineError without one
+        offline: Only use the local copy, never contact YApi
+
+    Returns:
+        The result and, when served from the local copy, the wall-clock time that
+        copy was fetched (None for a live result)
+    """
+    if offline or connectivity.offline:
+        try:
+            return local()
+        except OfflineError:
+            # 自动离线时本地没有副本，仍尝试请求 YApi
+            if offline:
+                raise
+    try:
+        result = await online()
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        connectivity.mark_down()
+        try:
+            return local()
+        except OfflineError:
+            raise exc from None
+    connectivity.mark_up()
+    return result, None
+
+
+def _stale_response(
+    fetched_at: float,
+    *,
+    indent: int | None = 2,
+    **data: Any,  # noqa: ANN401
+) -> str:
+    """Dump a result served from the local cache, marked stale with its fetch time."""
+    response = {
+        "stale": True,
+        "fetched_at": datetime.fromtimestamp(fetched_at).astimezone().isoformat("seconds"),
+        **data,
+    }
+    return json.dumps(response, ensure_ascii=False, indent=indent)
+
+
+async def _send_update(tenant: _Tenant, interface_id: int, patch: dict[str, Any]) -> dict[str, Any]:
+    return await tenant.client.update_interface(interface_id, **patch)
+
+
+def get_update_coalescer() -> UpdateCoalescer:
+    """Get the write-behind queue for interface updates of the calling login."""
+    return _current_tenant().coalescer
+
+
+def _report_queued_update(future: asyncio.Future[dict[str, Any]]) -> None:
+    """Log the outcome of an update whose caller did not wait for it."""
+    if not future.cancelled() and future.exception() is not None:
+        print(
+            f"[yapi-mcp] ERROR: Queued interface update failed: {future.exception()}",
+            file=sys.stderr,
+        )
+
+
+@asynccontextmanager
+async def _open_client(config: ServerConfig) -> AsyncIterator[YApiClient]:
+    """Yield the pooled YApiClient of the calling login, bound to that login's cache."""
+    async with get_tenants().acquire(_request_credentials(config)) as tenant:
+        yield tenant.client
+
 
 @mcp.tool()
 async def yapi_search_interfaces(
     project_id: Annotated[int, "YApi 项目 ID"],
-    keyword: Annotated[str, "搜索关键词(匹配接口标题/路径/描述)"],
+    keyword: Annotated[
+        str,
+        "搜索关键词(匹配接口标题/路径/描述),可组合字段条件,"
+        "如 method:POST,PUT path:/order/* tag:payment status:undone cat:订单 退款",
+    ],
+    fuzzy: Annotated[bool, "容错模糊匹配(关键词拼写有误时使用,结果按相似度排序)"] = False,
+    offline: Annotated[bool, OFFLINE_PARAM_DESCRIPTION] = False,
 ) -> str:
-    """在指定 YApi 项目中搜索接口,支持按标题、路径、描述模糊匹配."""
+    """在指定 YApi 项目中搜索接口,支持标题/路径/描述模糊匹配及 method/path/tag/status/cat 过滤."""
     config = get_config()
     operation = "yapi_search_interfaces"
-    params = {"project_id": project_id, "keyword": keyword}
+    params = {"project_id": project_id, "keyword": keyword, "fuzzy": fuzzy}
 
     try:
-        async with YApiClient(str(config.yapi_server_url), config.cookies) as client:
-            results = await client.search_interfaces(project_id, keyword)
+        async with _open_client(config) as client:
+            results, fetched_at = await _read_with_fallback(
+                get_connectivity(),
+                lambda: client.search_interfaces(project_id, keyword, fuzzy=fuzzy),
+                lambda: client.search_local(project_id, keyword, fuzzy=fuzzy),
+                offline=offline,
+            )
+        if fetched_at is not None:
+            return _stale_response(
+                fetched_at,
+                results=SUMMARY_LIST_ADAPTER.dump_python(
+                    results, mode="json", by_alias=True, warnings=False
+                ),
+            )
+        return SUMMARY_LIST_ADAPTER.dump_json(
+            results, by_alias=True, indent=2, warnings=False
+        ).decode()
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except OfflineError as exc:
+        raise _offline_to_tool_error(exc, operation, params) from exc
+    except QuerySyntaxError as exc:
+        raise _wrap_validation_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = SEARCH_INTERFACES_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+@mcp.tool()
+async def yapi_search_all(
+    keyword: Annotated[str, "搜索关键词或字段条件(语法同 yapi_search_interfaces)"],
+    project_ids: Annotated[list[int] | None, "要搜索的项目 ID 列表"] = None,
+    group_id: Annotated[int | None, "分组 ID(搜索该分组下全部项目)"] = None,
+    limit: Annotated[int, "最多返回的结果数"] = 50,
+    timeout: Annotated[float, "整体超时时间(秒),超时项目不计入结果"] = 30.0,
+) -> str:
+    """跨多个 YApi 项目并发搜索接口,按匹配度排序并标注所属项目;部分项目失败时返回其余结果."""
+    config = get_config()
+    operation = "yapi_search_all"
+    params = {"keyword": keyword, "project_ids": project_ids, "group_id": group_id}
+
+    try:
+        _ensure_search_scope(project_ids, group_id)
+
+        async with _open_client(config) as client:
+            ids = list(project_ids or [])
+            if group_id is not None:
+                projects = await client.list_group_projects(group_id)
+                ids.extend(int(project["_id"]) for project in projects)
+
+            result = await client.search_projects(
+                ids,
+                keyword,
+                concurrency=config.yapi_search_concurrency,
+                timeout=timeout,
+            )
+            return _format_search_all_result(result, limit)
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except ValueError as exc:
+        raise _wrap_validation_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = SEARCH_ALL_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+@mcp.tool()
+async def yapi_list_categories(
+    project_id: Annotated[int, "YApi 项目 ID"],
+    name: Annotated[str | None, "按分类名筛选(不区分大小写,无完全匹配时按包含匹配)"] = None,
+) -> str:
+    """列出项目的接口分类(catid、名称及接口数),用于创建接口时确定 catid."""
+    config = get_config()
+    operation = "yapi_list_categories"
+    params = {"project_id": project_id, "name": name}
+
+    try:
+        async with _open_client(config) as client:
+            categories = await client.list_categories(project_id, name)
             return json.dumps(
-                [result.model_dump(by_alias=True) for result in results],
+                {"categories": categories, "total": len(categories)},
                 ensure_ascii=False,
                 indent=2,
             )
@@ -354,13 +1066,14 @@ async def yapi_search_interfaces(
     except (httpx.TimeoutException, httpx.ConnectError) as exc:
         raise _network_error_to_tool_error(exc, operation, params) from exc
     except Exception as exc:
-        prefix = SEARCH_INTERFACES_ERROR
+        prefix = LIST_CATEGORIES_ERROR
         raise _wrap_tool_error(prefix, exc) from exc
 
 
 @mcp.tool()
 async def yapi_get_interface(
     interface_id: Annotated[int, "接口 ID"],
+    offline: Annotated[bool, OFFLINE_PARAM_DESCRIPTION] = False,
 ) -> str:
     """获取 YApi 接口的完整定义(包括请求参数、响应结构、描述等)."""
     config = get_config()
@@ -368,24 +1081,179 @@ async def yapi_get_interface(
     params = {"interface_id": interface_id}
 
     try:
-        async with YApiClient(str(config.yapi_server_url), config.cookies) as client:
-            interface = await client.get_interface(interface_id)
-            return json.dumps(
-                interface.model_dump(by_alias=True),
-                ensure_ascii=False,
-                indent=2,
+        async with _open_client(config) as client:
+
+            async def fetch() -> YApiInterface:
+                # 先提交该接口尚在写缓冲中的更新，避免读到旧定义
+                await get_update_coalescer().flush(interface_id)
+                return await client.get_interface(interface_id)
+
+            interface, fetched_at = await _read_with_fallback(
+                get_connectivity(),
+                fetch,
+                lambda: client.get_local_interface(interface_id),
+                offline=offline,
+            )
+        if fetched_at is not None:
+            return _stale_response(
+                fetched_at,
+                interface=interface.model_dump(mode="json", by_alias=True, warnings=False),
             )
+        return interface.model_dump_json(by_alias=True, indent=2, warnings=False)
     except MCPToolError:
         raise
     except httpx.HTTPStatusError as exc:
         raise _http_error_to_tool_error(exc, operation, params) from exc
     except (httpx.TimeoutException, httpx.ConnectError) as exc:
         raise _network_error_to_tool_error(exc, operation, params) from exc
+    except OfflineError as exc:
+        raise _offline_to_tool_error(exc, operation, params) from exc
     except Exception as exc:
         prefix = GET_INTERFACE_ERROR
         raise _wrap_tool_error(prefix, exc) from exc
 
 
+@mcp.tool()
+async def yapi_search_and_get(
+    project_id: Annotated[int, "YApi 项目 ID"],
+    keyword: Annotated[str, "搜索关键词或字段条件(语法同 yapi_search_interfaces)"],
+    top: Annotated[int, "返回完整定义的最佳匹配接口数"] = 3,
+    fuzzy: Annotated[bool, "容错模糊匹配"] = False,
+    max_chars: Annotated[int, "完整定义的总字符数上限,超出部分只返回摘要"] = 30000,
+) -> str:
+    """搜索接口并一次返回匹配度最高的若干接口的完整定义(替代搜索后逐个调用 yapi_get_interface)."""
+    config = get_config()
+    operation = "yapi_search_and_get"
+    params = {"project_id": project_id, "keyword": keyword, "top": top}
+
+    try:
+        _ensure_positive("top", top)
+
+        async with _open_client(config) as client:
+            result = await client.search_with_details(
+                project_id,
+                keyword,
+                top=top,
+                fuzzy=fuzzy,
+                concurrency=config.yapi_search_concurrency,
+            )
+            return _format_detailed_search_result(result, max_chars)
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except ValueError as exc:
+        raise _wrap_validation_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = SEARCH_AND_GET_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+@mcp.tool()
+async def yapi_export_project(
+    project_id: Annotated[int, "YApi 项目 ID"],
+) -> str:
+    """一次请求导出 YApi 项目下全部接口的完整定义(结果同时写入详情缓存)."""
+    config = get_config()
+    operation = "yapi_export_project"
+    params = {"project_id": project_id}
+
+    try:
+        async with _open_client(config) as client:
+            interfaces = await client.export_project(project_id)
+            return INTERFACE_LIST_ADAPTER.dump_json(
+                interfaces, by_alias=True, indent=2, warnings=False
+            ).decode()
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = EXPORT_PROJECT_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+async def _index_project_fields(config: ServerConfig, project_id: int) -> dict[str, int]:
+    """Index every interface of a project, returning how many are indexed out of the total."""
+    indexer = get_field_indexer()
+    async with _open_client(config) as client:
+        total = len(await client.get_project_snapshot(project_id))
+        if indexer.flush().project_size(project_id) < total:
+            # 字段索引只覆盖已缓存的接口详情：项目未完全索引时整体导出一次补齐
+            async for _interface in client.iter_export_project(project_id):
+                pass
+    return {"indexed": indexer.flush().project_size(project_id), "total": total}
+
+
+@mcp.tool()
+async def yapi_search_fields(
+    field: Annotated[str, "字段名(如 merchant_id、refund_amount),不区分大小写"],
+    location: Annotated[
+        str | None, "字段位置: query/params/headers/form/req_body/res_body,不填为全部"
+    ] = None,
+    project_id: Annotated[int | None, "限定项目 ID;该项目未完全索引时先导出项目补齐索引"] = None,
+    partial_match: Annotated[bool, "是否按字段名包含匹配(默认完全匹配)"] = False,
+    limit: Annotated[int, "最多返回的接口数"] = 50,
+) -> str:
+    """按字段名搜索接口:查找请求参数、请求头、表单或请求/响应体中包含某字段的接口."""
+    config = get_config()
+    operation = "yapi_search_fields"
+    params = {"field": field, "location": location, "project_id": project_id}
+
+    try:
+        _ensure_field_query(field, location)
+
+        coverage = None
+        if project_id is not None:
+            coverage = await _index_project_fields(config, project_id)
+        index = get_field_indexer().flush()
+
+        matches = index.search(
+            field, location=location, project_id=project_id, partial=partial_match
+        )
+        response: dict[str, Any] = {
+            "results": [match.to_dict() for match in matches[:limit]],
+            "total": len(matches),
+            "indexed_interfaces": len(index),
+        }
+        if coverage is not None:
+            # 已索引数少于项目接口数时结果只覆盖其中一部分
+            response["project_coverage"] = coverage
+        return json.dumps(response, ensure_ascii=False, indent=2)
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except ValueError as exc:
+        raise _wrap_validation_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = SEARCH_FIELDS_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+@mcp.tool()
+async def yapi_cache_stats() -> str:
+    """查看当前登录的缓存统计:已缓存的接口详情数、项目快照数及搜索结果缓存命中率."""
+    try:
+        stats = get_cache().stats()
+        stats["field_index"] = {
+            "interfaces": len(get_field_indexer().index),
+            "pending": get_field_indexer().pending,
+        }
+        if get_config().yapi_shared_projects:
+            stats["shared_projects"] = get_shared_cache().stats()
+        return json.dumps(stats, ensure_ascii=False, indent=2)
+    except Exception as exc:
+        prefix = CACHE_STATS_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
 @mcp.tool()
 async def yapi_create_interface(
     project_id: Annotated[int, "项目 ID"],
@@ -415,6 +1283,9 @@ async def yapi_create_interface(
     status: Annotated[str | None, "接口状态(undone/done)"] = None,
     tag: Annotated[str, '标签(JSON数组:["标签1","标签2"])'] = "",
     api_opened: Annotated[bool | None, "是否公开API"] = None,
+    idempotency_key: Annotated[
+        str | None, "幂等键;重试同一次创建时传入相同的值(默认按请求内容生成)"
+    ] = None,
 ) -> str:
     """在 YApi 项目中创建新接口。"""
     config = get_config()
@@ -429,20 +1300,25 @@ async def yapi_create_interface(
 
     try:
         _ensure_path_starts_with_slash(path)
-        _validate_interface_request(
+        arrays = _validate_interface_request(
             method=method,
             req_body_type=req_body_type,
             req_body=req_body,
             req_body_form=req_body_form,
+            req_body_is_json_schema=req_body_is_json_schema,
+            res_body=res_body,
             res_body_type=res_body_type,
+            res_body_is_json_schema=res_body_is_json_schema,
             status=status,
             req_query=req_query,
             req_headers=req_headers,
             req_params=req_params,
             tag=tag,
+            check_schema=config.yapi_validate_schema,
         )
+        get_connectivity().check_writable()
 
-        async with YApiClient(str(config.yapi_server_url), config.cookies) as client:
+        async with _open_client(config) as client:
             result = await client.create_interface(
                 project_id=project_id,
                 catid=catid,
@@ -452,32 +1328,37 @@ async def yapi_create_interface(
                 req_body=req_body,
                 req_body_type=req_body_type,
                 req_body_is_json_schema=req_body_is_json_schema,
-                req_body_form=req_body_form,
+                req_body_form=arrays.req_body_form,
                 res_body=res_body,
                 res_body_type=res_body_type,
                 res_body_is_json_schema=res_body_is_json_schema,
-                req_query=req_query,
-                req_headers=req_headers,
-                req_params=req_params,
+                req_query=arrays.req_query,
+                req_headers=arrays.req_headers,
+                req_params=arrays.req_params,
                 markdown=markdown,
                 status=status,
-                tag=tag,
+                tag=arrays.tag,
                 api_opened=api_opened,
+                idempotency_key=idempotency_key,
             )
-            return json.dumps(
-                {
-                    "action": result["action"],
-                    "interface_id": result["interface_id"],
-                    "message": "接口创建成功",
-                },
-                ensure_ascii=False,
-            )
+            response: dict[str, Any] = {
+                "action": result["action"],
+                "interface_id": result["interface_id"],
+                "message": "接口创建成功",
+            }
+            if result.get("replayed"):
+                response["replayed"] = True
+                response["message"] = "接口此前已创建,返回已有接口"
+            return json.dumps(response, ensure_ascii=False)
     except MCPToolError:
         raise
     except httpx.HTTPStatusError as exc:
         raise _http_error_to_tool_error(exc, operation, params) from exc
     except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        get_connectivity().mark_down()
         raise _network_error_to_tool_error(exc, operation, params) from exc
+    except OfflineError as exc:
+        raise _offline_to_tool_error(exc, operation, params) from exc
     except ValueError as exc:
         raise _wrap_validation_error(exc, operation, params) from exc
     except Exception as exc:
@@ -518,66 +1399,107 @@ async def yapi_update_interface(
     api_opened: Annotated[bool | None, "是否公开API"] = None,
     switch_notice: Annotated[bool | None, "是否通知团队成员"] = None,
     message: Annotated[str | None, "变更说明"] = None,
+    expected_up_time: Annotated[
+        int | None, "上次读取到的 up_time;YApi 上的接口已被修改(up_time 变化)时拒绝更新"
+    ] = None,
+    check_conflict: Annotated[
+        bool, "未传 expected_up_time 时,以本服务最近一次获取的接口定义的 up_time 做冲突检查"
+    ] = False,
+    wait: Annotated[
+        bool, "启用写缓冲(YAPI_UPDATE_DEBOUNCE)时是否等待合并后的更新完成;false 时立即返回"
+    ] = True,
 ) -> str:
     """增量更新 YApi 接口定义。自动获取现有数据并合并,仅更新传入的字段。"""
     config = get_config()
     operation = "yapi_update_interface"
-    params = {"interface_id": interface_id}
+    params = {"interface_id": interface_id, "expected_up_time": expected_up_time}
 
     try:
         if path is not None:
             _ensure_path_starts_with_slash(path)
-        _validate_interface_request(
+        arrays = _validate_interface_request(
             method=method,
             req_body_type=req_body_type,
             req_body=req_body,
             req_body_form=req_body_form,
+            req_body_is_json_schema=req_body_is_json_schema,
+            res_body=res_body,
             res_body_type=res_body_type,
+            res_body_is_json_schema=res_body_is_json_schema,
             status=status,
             req_query=req_query,
             req_headers=req_headers,
             req_params=req_params,
             tag=tag,
+            check_schema=config.yapi_validate_schema,
         )
 
-        async with YApiClient(str(config.yapi_server_url), config.cookies) as client:
-            result = await client.update_interface(
-                interface_id=interface_id,
-                catid=catid,
-                title=title,
-                path=path,
-                method=method,
-                req_body=req_body,
-                req_body_type=req_body_type,
-                req_body_is_json_schema=req_body_is_json_schema,
-                req_body_form=req_body_form,
-                res_body=res_body,
-                res_body_type=res_body_type,
-                res_body_is_json_schema=res_body_is_json_schema,
-                req_query=req_query,
-                req_headers=req_headers,
-                req_params=req_params,
-                markdown=markdown,
-                status=status,
-                tag=tag,
-                api_opened=api_opened,
-                switch_notice=switch_notice,
-                message=message,
-            )
-            return json.dumps(
-                {
-                    "action": result["action"],
-                    "interface_id": result["interface_id"],
-                    "message": "接口更新成功",
-                },
-                ensure_ascii=False,
-            )
+        patch: dict[str, Any] = {
+            "catid": catid,
+            "title": title,
+            "path": path,
+            "method": method,
+            "req_body": req_body,
+            "req_body_type": req_body_type,
+            "req_body_is_json_schema": req_body_is_json_schema,
+            "req_body_form": arrays.req_body_form,
+            "res_body": res_body,
+            "res_body_type": res_body_type,
+            "res_body_is_json_schema": res_body_is_json_schema,
+            "req_query": arrays.req_query,
+            "req_headers": arrays.req_headers,
+            "req_params": arrays.req_params,
+            "markdown": markdown,
+            "status": status,
+            "tag": arrays.tag,
+            "api_opened": api_opened,
+            "switch_notice": switch_notice,
+            "message": message,
+            "expected_up_time": expected_up_time,
+            # False 不应覆盖同一批中更早调用要求的冲突检查
+            "check_conflict": check_conflict or None,
+        }
+        get_connectivity().check_writable()
+
+        if config.yapi_update_debounce > 0:
+            future = get_update_coalescer().submit(interface_id, patch)
+            if not wait:
+                future.add_done_callback(_report_queued_update)
+                return json.dumps(
+                    {
+                        "action": "queued",
+                        "interface_id": interface_id,
+                        "message": f"更新已排队,将在 {config.yapi_update_debounce} 秒内合并提交",
+                    },
+                    ensure_ascii=False,
+                )
+            result = await future
+        else:
+            async with _open_client(config) as client:
+                result = await client.update_interface(
+                    interface_id,
+                    **{key: value for key, value in patch.items() if value is not None},
+                )
+
+        response = {
+            "action": result["action"],
+            "interface_id": result["interface_id"],
+            "message": "接口更新成功",
+        }
+        if result.get("merged_updates", 1) > 1:
+            response["merged_updates"] = result["merged_updates"]
+        return json.dumps(response, ensure_ascii=False)
     except MCPToolError:
         raise
     except httpx.HTTPStatusError as exc:
         raise _http_error_to_tool_error(exc, operation, params) from exc
     except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        get_connectivity().mark_down()
         raise _network_error_to_tool_error(exc, operation, params) from exc
+    except OfflineError as exc:
+        raise _offline_to_tool_error(exc, operation, params) from exc
+    except UpdateConflictError as exc:
+        raise _conflict_to_tool_error(exc, operation, params) from exc
     except ValueError as exc:
         raise _wrap_validation_error(exc, operation, params) from exc
     except Exception as exc:
@@ -585,13 +1507,291 @@ async def yapi_update_interface(
         raise _wrap_tool_error(prefix, exc) from exc
 
 
+@mcp.tool()
+async def yapi_validate_interfaces(
+    interfaces: Annotated[
+        list[dict[str, Any]],
+        "待校验的接口定义列表,每项字段同 yapi_create_interface"
+        "(title/path/method 必填,可含 req_body/res_body/req_query/tag 等)",
+    ],
+) -> str:
+    """批量预校验接口定义(不访问 YApi):检查参数取值、JSON 数组及请求/响应体 JSON Schema."""
+    operation = "yapi_validate_interfaces"
+    params = {"count": len(interfaces)}
+
+    try:
+        _ensure_payload_objects(interfaces)
+        # Schema 校验是纯 CPU 计算，放到工作线程执行，避免阻塞事件循环
+        results = await asyncio.to_thread(_dry_run_batch, interfaces)
+        return json.dumps(
+            {
+                "results": results,
+                "total": len(results),
+                "invalid": sum(1 for result in results if not result["valid"]),
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+    except MCPToolError:
+        raise
+    except ValueError as exc:
+        raise _wrap_validation_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = VALIDATE_INTERFACES_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+@mcp.tool()
+async def yapi_import_openapi(
+    project_id: Annotated[int, "项目 ID"],
+    spec_path: Annotated[str, "本地 OpenAPI 3 / Swagger 2 规范文件路径(JSON 或 YAML)"],
+    catid: Annotated[int | None, "未打 tag 的操作放入的分类 ID(默认为项目的公共分类)"] = None,
+    dry_run: Annotated[bool, "只报告将要创建/更新的接口,不写入 YApi"] = False,
+) -> str:
+    """将 OpenAPI/Swagger 规范同步到 YApi 项目:只创建新增接口、更新有变化的接口。"""
+    config = get_config()
+    operation = "yapi_import_openapi"
+    params = {"project_id": project_id, "spec_path": spec_path, "dry_run": dry_run}
+
+    try:
+        # 读取、转换与本地校验是纯 CPU/文件操作，放到工作线程执行
+        operations, invalid = await asyncio.to_thread(_load_spec_operations, spec_path)
+        if not dry_run:
+            get_connectivity().check_writable()
+        async with _open_client(config) as client:
+            plan = await client.plan_import(project_id, operations, default_catid=catid)
+            outcomes = None if dry_run else await client.apply_import(plan)
+        return json.dumps(_import_report(plan, invalid, outcomes), ensure_ascii=False, indent=2)
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        get_connectivity().mark_down()
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except OfflineError as exc:
+        raise _offline_to_tool_error(exc, operation, params) from exc
+    except ValueError as exc:
+        raise _wrap_validation_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = IMPORT_OPENAPI_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+@mcp.tool()
+async def yapi_import_data(
+    project_id: Annotated[int, "项目 ID(需在 YAPI_PROJECT_TOKENS 中配置其 token)"],
+    spec_path: Annotated[str, "本地数据文件路径:swagger 为 OpenAPI/Swagger(JSON 或 YAML)"],
+    data_type: Annotated[str, "数据格式:swagger(OpenAPI/Swagger)或 json(YApi 导出的 JSON)"] = (
+        "swagger"
+    ),
+    merge: Annotated[
+        str, "合并模式:normal(跳过已存在接口)/good(智能合并)/mergin(完全覆盖)"
+    ] = "normal",
+) -> str:
+    """通过 YApi 开放接口一次性导入整份数据,由服务端合并,适合大批量同步。"""
+    config = get_config()
+    operation = "yapi_import_data"
+    params = {"project_id": project_id, "data_type": data_type, "merge": merge}
+
+    try:
+        check_import_options(data_type, merge)
+        token = _project_token(config, project_id)
+        data = await asyncio.to_thread(_load_import_data, spec_path, data_type)
+        get_connectivity().check_writable()
+        async with _open_client(config) as client:
+            result = await client.import_data(
+                project_id, token, data, data_type=data_type, merge=merge
+            )
+        return json.dumps(result, ensure_ascii=False)
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        get_connectivity().mark_down()
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except OfflineError as exc:
+        raise _offline_to_tool_error(exc, operation, params) from exc
+    except ValueError as exc:
+        raise _wrap_validation_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = IMPORT_DATA_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+PROJECT_INTERFACES_URI = "yapi://project/{project_id}/interfaces"
+INTERFACE_URI = "yapi://interface/{interface_id}"
+
+
+def _project_listing(snapshot: ProjectSnapshot) -> dict[str, Any]:
+    """Index of a project's interfaces, each linked to its interface resource."""
+    return {
+        "project_id": snapshot.project_id,
+        "categories": [{"_id": catid, "name": name} for catid, name in snapshot.categories.items()],
+        "interfaces": [
+            {**snapshot.record(row), "uri": INTERFACE_URI.format(interface_id=snapshot.ids[row])}
+            for row in range(len(snapshot))
+        ],
+    }
+
+
+@mcp.resource(PROJECT_INTERFACES_URI, mime_type="application/json")
+async def project_interfaces_resource(project_id: int) -> str:
+    """项目全部接口的索引(分类、方法、路径、状态、标签、up_time 及接口资源 URI),读自接口列表缓存."""
+    config = get_config()
+    operation = "project_interfaces_resource"
+    params = {"project_id": project_id}
+
+    try:
+        async with _open_client(config) as client:
+
+            def local() -> tuple[ProjectSnapshot, float]:
+                snapshot = client.local_snapshot(project_id)
+                return snapshot, snapshot.fetched_at
+
+            snapshot, fetched_at = await _read_with_fallback(
+                get_connectivity(), lambda: client.get_project_snapshot(project_id), local
+            )
+        listing = _project_listing(snapshot)
+        if fetched_at is not None:
+            return _stale_response(fetched_at, indent=None, **listing)
+        return json.dumps(listing, ensure_ascii=False)
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = PROJECT_RESOURCE_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+@mcp.resource(INTERFACE_URI, mime_type="application/json")
+async def interface_resource(interface_id: int) -> str:
+    """接口的完整定义(同 yapi_get_interface),读自接口详情缓存."""
+    config = get_config()
+    operation = "interface_resource"
+    params = {"interface_id": interface_id}
+
+    try:
+        async with _open_client(config) as client:
+
+            async def fetch() -> YApiInterface:
+                await get_update_coalescer().flush(interface_id)
+                return await client.get_interface(interface_id)
+
+            interface, fetched_at = await _read_with_fallback(
+                get_connectivity(), fetch, lambda: client.get_local_interface(interface_id)
+            )
+        if fetched_at is not None:
+            return _stale_response(
+                fetched_at,
+                indent=None,
+                interface=interface.model_dump(mode="json", by_alias=True, warnings=False),
+            )
+        return interface.model_dump_json(by_alias=True, warnings=False)
+    except MCPToolError:
+        raise
+    except httpx.HTTPStatusError as exc:
+        raise _http_error_to_tool_error(exc, operation, params) from exc
+    except (httpx.TimeoutException, httpx.ConnectError) as exc:
+        raise _network_error_to_tool_error(exc, operation, params) from exc
+    except Exception as exc:
+        prefix = GET_INTERFACE_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
+async def _fetch_watched_snapshot(tenant: _Tenant, project_id: int) -> ProjectSnapshot:
+    return await tenant.client.get_project_snapshot(project_id, refresh=True)
+
+
+async def _on_project_change(
+    tenant: _Tenant, project_id: int, changes: SnapshotChanges, subscribers: frozenset[Any]
+) -> None:
+    """Refresh cached definitions of changed interfaces and notify the watching sessions."""
+    cache = tenant.cache
+    for interface_id in changes.removed:
+        cache.invalidate_interface(interface_id)
+    # 只预取本进程已缓存过的接口，下次读取即可命中缓存
+    stale = [iid for iid in changes.modified if cache.peek_interface(iid) is not None]
+    if stale:
+        await asyncio.gather(
+            *(tenant.client.get_interface(iid, refresh=True) for iid in stale),
+            return_exceptions=True,
+        )
+
+    uris = [
+        PROJECT_INTERFACES_URI.format(project_id=project_id),
+        *(INTERFACE_URI.format(interface_id=iid) for iid in changes.interface_ids),
+    ]
+    for session in subscribers:
+        try:
+            for uri in uris:
+                await session.send_resource_updated(uri)
+        except Exception:
+            # 会话已关闭，不再为其监听
+            tenant.watcher.forget(session)
+
+
+def _report_poll_error(project_id: int, error: Exception) -> None:
+    if isinstance(error, httpx.TimeoutException | httpx.ConnectError):
+        get_connectivity().mark_down()
+    print(f"[yapi-mcp] WARNING: Polling project {project_id} failed: {error}", file=sys.stderr)
+
+
+def get_project_watcher() -> ProjectWatcher:
+    """Get the change watcher of projects subscribed with the calling login."""
+    return _current_tenant().watcher
+
+
+@mcp.tool()
+async def yapi_watch_project(
+    project_id: Annotated[int, "项目 ID"],
+    ctx: Context,
+    watch: Annotated[bool, "true 开始监听,false 取消当前会话的监听"] = True,
+) -> str:
+    """监听项目接口变更:轮询接口列表,接口 up_time 变化时刷新缓存并向当前会话发送资源更新通知."""
+    try:
+        watcher = get_project_watcher()
+        if watch:
+            watcher.watch(project_id, ctx.session)
+        else:
+            watcher.unwatch(project_id, ctx.session)
+        return json.dumps(
+            {
+                "project_id": project_id,
+                "watching": watch,
+                "interval": watcher.interval(project_id),
+                "resources": [
+                    PROJECT_INTERFACES_URI.format(project_id=project_id),
+                    INTERFACE_URI,
+                ],
+            },
+            ensure_ascii=False,
+        )
+    except MCPToolError:
+        raise
+    except Exception as exc:
+        prefix = WATCH_PROJECT_ERROR
+        raise _wrap_tool_error(prefix, exc) from exc
+
+
 def main() -> None:
     """Entry point for uvx yapi-mcp command."""
     startup_failed = False
 
     try:
+        transport = get_transport_config()
         try:
-            mcp.run()
+            if transport.yapi_mcp_transport == "stdio":
+                mcp.run()
+            else:
+                # 多个会话共享同一进程内的客户端连接池、缓存与搜索索引
+                mcp.add_middleware(SessionConcurrencyLimit(transport.yapi_session_concurrency))
+                # 启动校验失败须在开始监听前退出进程，不能等到首个会话建立
+                asyncio.run(_serve(transport))
         except* MCPStartupError:
             startup_failed = True
 
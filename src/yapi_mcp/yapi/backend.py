@@ -0,0 +1,260 @@
+"""Cache storage shared by the worker processes of one deployment.
+
+Several ``yapi-mcp`` workers behind a load balancer would otherwise each keep
+their own snapshots and definitions and each fetch them from YApi. A
+``CacheBackend`` sits behind every ``YApiCache`` as a second level: entries
+are written through to it and read from it on a local miss, so a project
+fetched by one worker is served by all of them.
+
+The backend also carries what keeps the workers consistent:
+
+- invalidations: a write through one worker is recorded as an event which the
+  other caches (in any process) replay to drop their local copies;
+- refresh leases: a short-lived per-key lock so that when a project snapshot
+  expires only one worker requests list_menu while the others wait for its
+  result.
+
+``SQLiteCacheBackend`` implements this with a SQLite database in WAL mode on a
+local disk, which lets readers proceed while one process writes.
+"""
+
+import json
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+# 失效事件保留时长（秒），落后更久的缓存中的条目早已过期
+EVENT_RETENTION = 3600.0
+# 其他进程持有写锁时最长等待时间（毫秒）
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    scope TEXT NOT NULL,
+    project_id INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, project_id)
+);
+CREATE TABLE IF NOT EXISTS interfaces (
+    scope TEXT NOT NULL,
+    interface_id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (scope, interface_id)
+);
+CREATE INDEX IF NOT EXISTS interfaces_by_project ON interfaces (project_id);
+CREATE TABLE IF NOT EXISTS invalidations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    project_id INTEGER,
+    interface_id INTEGER,
+    whole INTEGER NOT NULL DEFAULT 0,
+    at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class StoredEntry:
+    """A cached value and the wall-clock time it was fetched from YApi."""
+
+    data: dict[str, Any]
+    fetched_at: float
+
+
+@dataclass(frozen=True, slots=True)
+class Invalidation:
+    """A write recorded by one cache for every other cache to replay.
+
+    Attributes:
+        seq: Position in the event log
+        origin: Cache that made the write (skips its own events)
+        project_id: Project whose snapshot changed, if any
+        interface_id: Interface whose definition changed, if any
+        whole: The whole project changed, definitions included
+    """
+
+    seq: int
+    origin: str
+    project_id: int | None
+    interface_id: int | None
+    whole: bool
+
+
+class CacheBackend(Protocol):
+    """Second-level cache storage shared between processes.
+
+    Values are partitioned by ``scope`` (one YApi login, or the shared
+    projects) so that data is only ever read back with the login that fetched
+    it. Invalidations apply to every scope.
+    """
+
+    def version(self) -> object:
+        """Opaque token that changes whenever an invalidation may have been recorded."""
+        ...
+
+    def load_snapshot(self, scope: str, project_id: int) -> StoredEntry | None: ...
+
+    def save_snapshot(self, scope: str, project_id: int, entry: StoredEntry) -> None: ...
+
+    def load_interface(self, scope: str, interface_id: int) -> StoredEntry | None: ...
+
+    def save_interface(
+        self, scope: str, interface_id: int, project_id: int, entry: StoredEntry
+    ) -> None: ...
+
+    def invalidate(
+        self,
+        origin: str,
+        *,
+        project_id: int | None = None,
+        interface_id: int | None = None,
+        whole: bool = False,
+    ) -> None:
+        """Delete the affected entries of every scope and record the event."""
+        ...
+
+    def last_invalidation(self) -> int:
+        """Sequence number of the newest recorded invalidation (0 for none)."""
+        ...
+
+    def invalidations_since(self, seq: int) -> list[Invalidation]: ...
+
+    def acquire_lease(self, key: str, holder: str, ttl: float) -> bool:
+        """Take or renew the lease on key unless another holder has an unexpired one."""
+        ...
+
+    def release_lease(self, key: str, holder: str) -> None: ...
+
+
+class SQLiteCacheBackend:
+    """CacheBackend on a SQLite database in WAL mode, shared by processes on one host.
+
+    Every call is a short local transaction made directly on the event loop
+    thread; the database must live on a local disk (WAL does not work over
+    network file systems).
+    """
+
+    def __init__(self, path: str | Path, clock: Callable[[], float] = time.time) -> None:
+        """Open (creating if needed) the database.
+
+        Args:
+            path: Database file shared by the worker processes
+            clock: Wall-clock time source, injectable for tests
+        """
+        self.path = Path(path)
+        self._clock = clock
+        self._db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        # data_version 只反映其他连接的提交，本连接的写入另行计数
+        self._local_writes = 0
+
+    def close(self) -> None:
+        self._db.close()
+
+    def version(self) -> object:
+        (data_version,) = self._db.execute("PRAGMA data_version").fetchone()
+        return (data_version, self._local_writes)
+
+    def _load(self, sql: str, params: tuple[Any, ...]) -> StoredEntry | None:
+        row = self._db.execute(sql, params).fetchone()
+        return StoredEntry(json.loads(row[1]), row[0]) if row is not None else None
+
+    def load_snapshot(self, scope: str, project_id: int) -> StoredEntry | None:
+        return self._load(
+            "SELECT fetched_at, data FROM snapshots WHERE scope = ? AND project_id = ?",
+            (scope, project_id),
+        )
+
+    def save_snapshot(self, scope: str, project_id: int, entry: StoredEntry) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+            (scope, project_id, entry.fetched_at, json.dumps(entry.data, ensure_ascii=False)),
+        )
+
+    def load_interface(self, scope: str, interface_id: int) -> StoredEntry | None:
+        return self._load(
+            "SELECT fetched_at, data FROM interfaces WHERE scope = ? AND interface_id = ?",
+            (scope, interface_id),
+        )
+
+    def save_interface(
+        self, scope: str, interface_id: int, project_id: int, entry: StoredEntry
+    ) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO interfaces VALUES (?, ?, ?, ?, ?)",
+            (
+                scope,
+                interface_id,
+                project_id,
+                entry.fetched_at,
+                json.dumps(entry.data, ensure_ascii=False),
+            ),
+        )
+
+    def invalidate(
+        self,
+        origin: str,
+        *,
+        project_id: int | None = None,
+        interface_id: int | None = None,
+        whole: bool = False,
+    ) -> None:
+        now = self._clock()
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            if interface_id is not None:
+                self._db.execute("DELETE FROM interfaces WHERE interface_id = ?", (interface_id,))
+            if project_id is not None:
+                self._db.execute("DELETE FROM snapshots WHERE project_id = ?", (project_id,))
+                if whole:
+                    self._db.execute("DELETE FROM interfaces WHERE project_id = ?", (project_id,))
+            self._db.execute(
+                "INSERT INTO invalidations (origin, project_id, interface_id, whole, at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (origin, project_id, interface_id, int(whole), now),
+            )
+            self._db.execute("DELETE FROM invalidations WHERE at < ?", (now - EVENT_RETENTION,))
+        self._local_writes += 1
+
+    def last_invalidation(self) -> int:
+        (seq,) = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM invalidations").fetchone()
+        return seq
+
+    def invalidations_since(self, seq: int) -> list[Invalidation]:
+        rows = self._db.execute(
+            "SELECT seq, origin, project_id, interface_id, whole FROM invalidations "
+            "WHERE seq > ? ORDER BY seq",
+            (seq,),
+        )
+        return [Invalidation(*row[:4], whole=bool(row[4])) for row in rows]
+
+    def acquire_lease(self, key: str, holder: str, ttl: float) -> bool:
+        now = self._clock()
+        with self._db:
+            # IMMEDIATE 事务保证检查与写入之间没有其他进程插入
+            self._db.execute("BEGIN IMMEDIATE")
+            row = self._db.execute(
+                "SELECT holder, expires FROM leases WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[0] != holder and row[1] > now:
+                return False
+            self._db.execute(
+                "INSERT OR REPLACE INTO leases VALUES (?, ?, ?)", (key, holder, now + ttl)
+            )
+        return True
+
+    def release_lease(self, key: str, holder: str) -> None:
+        self._db.execute("DELETE FROM leases WHERE key = ? AND holder = ?", (key, holder))
@@ -0,0 +1,37 @@
+"""Row sets as Python int bitsets (bit r set for row r).
+
+Set algebra over many rows then runs as a few C-level big-integer operations;
+used by snapshot column bitmaps, query evaluation and the trigram index.
+"""
+
+import re
+from collections.abc import Sequence
+
+_NONZERO_BYTES = re.compile(rb"[^\x00]+")
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def bitmap_from_rows(rows: Sequence[int]) -> int:
+    """Build an int bitset (bit r set for row r) from row numbers."""
+    if not rows:
+        return 0
+    data = bytearray(max(rows) // 8 + 1)
+    for row in rows:
+        data[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(data, "little")
+
+
+def rows_from_bitmap(mask: int, limit: int | None = None) -> list[int]:
+    """Return the ascending row numbers set in an int bitset.
+
+    With ``limit`` only (at least) the first ``limit`` rows are decoded.
+    """
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    rows: list[int] = []
+    for match in _NONZERO_BYTES.finditer(data):
+        for offset in range(match.start(), match.end()):
+            base = offset * 8
+            rows.extend(base + bit for bit in _BYTE_BITS[data[offset]])
+            if limit is not None and len(rows) >= limit:
+                return rows
+    return rows
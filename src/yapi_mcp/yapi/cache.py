@@ -0,0 +1,506 @@
+"""In-process caches for YApi data shared across tool calls."""
+
+import asyncio
+import itertools
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Collection, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from .backend import CacheBackend, StoredEntry
+from .idempotency import CreateLedger
+from .metadata import ProjectMetadata
+from .models import YApiInterface
+from .snapshot import ProjectSnapshot
+
+DEFAULT_CACHE_TTL = 300.0
+DEFAULT_QUERY_CACHE_SIZE = 256
+DEFAULT_SCOPE = "default"
+
+# 刷新租约时长（秒）：持有者异常退出时，其他进程最多等待这么久
+REFRESH_LEASE_TTL = 30.0
+# 等待租约期间检查其他进程是否已写入快照的间隔（秒）
+LEASE_POLL_INTERVAL = 0.05
+
+# 详情缓存变更监听器：写入时传入新定义，失效时传入 None
+DetailListener = Callable[[int, YApiInterface | None], None]
+
+# 快照版本在进程内全局递增，不同 YApiCache 中的快照版本也互不相同
+_snapshot_versions = itertools.count(1)
+
+
+@dataclass(slots=True)
+class _DetailEntry:
+    interface: YApiInterface
+    stored_at: float
+
+
+@dataclass(slots=True)
+class _SnapshotEntry:
+    snapshot: ProjectSnapshot
+    stored_at: float
+
+
+@dataclass(slots=True)
+class _MetadataEntry:
+    metadata: ProjectMetadata
+    stored_at: float
+
+
+@dataclass(slots=True)
+class _ResultEntry:
+    version: int
+    value: Any
+
+
+class QueryResultCache:
+    """LRU cache of search results computed from project snapshots.
+
+    Keys combine the project ID with a caller-chosen hashable key (normalized
+    query plus options). Each entry remembers the ``version`` of the snapshot
+    it was computed from and only answers lookups made against that same
+    version, so replacing a snapshot (TTL refresh or a local write dropping it)
+    invalidates exactly that project's results.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUERY_CACHE_SIZE) -> None:
+        """Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries (0 disables the cache)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[int, Hashable], _ResultEntry] = OrderedDict()
+
+    def get(self, snapshot: ProjectSnapshot, key: Hashable) -> Any | None:  # noqa: ANN401
+        """Return the cached result for key computed from this snapshot, or None."""
+        entry_key = (snapshot.project_id, key)
+        entry = self._entries.get(entry_key)
+        if entry is None or entry.version != snapshot.version:
+            if entry is not None:
+                del self._entries[entry_key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(entry_key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, snapshot: ProjectSnapshot, key: Hashable, value: object) -> None:
+        """Store a result computed from snapshot, evicting the least recently used."""
+        if self.maxsize <= 0:
+            return
+        entry_key = (snapshot.project_id, key)
+        self._entries[entry_key] = _ResultEntry(snapshot.version, value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate_project(self, project_id: int) -> None:
+        """Drop every result of a project."""
+        for entry_key in [key for key in self._entries if key[0] == project_id]:
+            del self._entries[entry_key]
+
+    def clear(self) -> None:
+        """Drop all results (counters are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return size and hit-rate counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class YApiCache:
+    """Process-wide cache of interface definitions and project snapshots.
+
+    Details are keyed by interface ID, snapshots by project ID. Entries older
+    than ``ttl`` seconds are treated as missing. A ``ttl`` of 0 disables reads
+    from the cache while still accepting writes.
+
+    Every stored snapshot gets a new, process-wide increasing ``version`` so that
+    results derived from a snapshot can tell whether it has been replaced.
+
+    Derived indexes over interface details register with ``subscribe`` and are
+    told about every detail write and invalidation. Search results derived from
+    snapshots live in ``results``, outcomes of keyed creates in ``creates``.
+    ``fingerprints`` maps interface ID -> ``(up_time, content hash)`` so spec
+    imports can skip re-reading interfaces that have not changed since.
+
+    Project metadata (see ``get_metadata``) is derived from a snapshot but
+    outlives its invalidation: local writes update it in place instead.
+
+    A cache can be scoped to one user's permissions and still share the data of
+    ``shared_projects`` (readable by every user) through a ``shared`` cache:
+    snapshots, metadata and details of those projects are stored in and read
+    from the shared cache, and its detail writes reach this cache's listeners.
+
+    With a ``backend`` (see backend.CacheBackend) snapshots and details are
+    written through to storage shared with other worker processes and read
+    back from it on a local miss or expiry; invalidations are published there
+    and replayed from it, and ``refresh_lease`` lets one process at a time
+    refresh a project.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+        query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE,
+        *,
+        shared: "YApiCache | None" = None,
+        shared_projects: Collection[int] = (),
+        backend: CacheBackend | None = None,
+        scope: str = DEFAULT_SCOPE,
+    ) -> None:
+        """Initialize cache.
+
+        Args:
+            ttl: Seconds an entry stays fresh (default: 300)
+            clock: Monotonic time source, injectable for tests
+            query_cache_size: Maximum number of cached search results
+            shared: Cache holding the data of ``shared_projects`` for every scope
+            shared_projects: IDs of projects every user may read
+            backend: Second-level storage shared with other processes
+            scope: Partition of ``backend`` this cache reads and writes
+        """
+        self.ttl = ttl
+        self.shared = shared
+        self.shared_projects = frozenset(shared_projects) if shared is not None else frozenset()
+        self.backend = backend
+        self.scope = scope
+        self._clock = clock
+        self.results = QueryResultCache(query_cache_size)
+        self.creates = CreateLedger(clock=clock)
+        self.fingerprints: dict[int, tuple[int, str]] = {}
+        self._details: dict[int, _DetailEntry] = {}
+        self._snapshots: dict[int, _SnapshotEntry] = {}
+        self._metadata: dict[int, _MetadataEntry] = {}
+        self._listeners: list[DetailListener] = []
+        # 租约持有者与失效事件来源标识，区分同一进程内的多个缓存
+        self._origin = uuid.uuid4().hex
+        self._backend_version = backend.version() if backend is not None else None
+        self._cursor = backend.last_invalidation() if backend is not None else 0
+
+    def _owner(self, project_id: int) -> "YApiCache":
+        """Cache that stores a project's data: the shared one for shared projects."""
+        if self.shared is not None and project_id in self.shared_projects:
+            return self.shared
+        return self
+
+    def _expired(self, stored_at: float) -> bool:
+        return self._clock() - stored_at >= self.ttl
+
+    def _stored_at(self, fetched_at: float) -> float:
+        """Local clock reading of a wall-clock fetch time."""
+        return self._clock() - (time.time() - fetched_at)
+
+    def _sync(self) -> None:
+        """Replay invalidations other caches recorded in the backend since the last call."""
+        if self.backend is None:
+            return
+        version = self.backend.version()
+        if version == self._backend_version:
+            return
+        self._backend_version = version
+        for event in self.backend.invalidations_since(self._cursor):
+            self._cursor = event.seq
+            if event.origin == self._origin:
+                continue
+            if event.interface_id is not None:
+                self._forget_interface(event.interface_id)
+            if event.project_id is not None:
+                self._forget_project(event.project_id, whole=event.whole)
+
+    def _publish(
+        self, *, project_id: int | None = None, interface_id: int | None = None, whole: bool = False
+    ) -> None:
+        if self.backend is not None:
+            self.backend.invalidate(
+                self._origin, project_id=project_id, interface_id=interface_id, whole=whole
+            )
+
+    def _forget_interface(self, interface_id: int) -> None:
+        if self._details.pop(interface_id, None) is not None:
+            self._notify(interface_id, None)
+
+    def _forget_project(self, project_id: int, *, whole: bool = False) -> None:
+        self._snapshots.pop(project_id, None)
+        self.results.invalidate_project(project_id)
+        if whole:
+            self._metadata.pop(project_id, None)
+            for interface_id, entry in list(self._details.items()):
+                if entry.interface.project_id == project_id:
+                    self._forget_interface(interface_id)
+                    self.fingerprints.pop(interface_id, None)
+
+    def subscribe(self, listener: DetailListener) -> None:
+        """Register a callback for detail writes and invalidations (shared ones included)."""
+        self._listeners.append(listener)
+        if self.shared is not None:
+            self.shared.subscribe(listener)
+
+    def unsubscribe(self, listener: DetailListener) -> None:
+        """Remove a callback registered with ``subscribe`` (from the shared cache too)."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+        if self.shared is not None:
+            self.shared.unsubscribe(listener)
+
+    def interfaces(self) -> list[YApiInterface]:
+        """Return every stored interface definition, including expired ones."""
+        interfaces = [entry.interface for entry in self._details.values()]
+        if self.shared is not None:
+            interfaces.extend(self.shared.interfaces())
+        return interfaces
+
+    def _notify(self, interface_id: int, interface: YApiInterface | None) -> None:
+        for listener in self._listeners:
+            listener(interface_id, interface)
+
+    def _detail_entry(self, interface_id: int) -> _DetailEntry | None:
+        """Local entry of a definition, replaced by a newer one from the backend."""
+        self._sync()
+        entry = self._details.get(interface_id)
+        if self.backend is None or (entry is not None and not self._expired(entry.stored_at)):
+            return entry
+        stored = self.backend.load_interface(self.scope, interface_id)
+        if stored is None:
+            return entry
+        stored_at = self._stored_at(stored.fetched_at)
+        if entry is not None and entry.stored_at >= stored_at:
+            return entry
+        # 其他进程获取的定义：载入本地并通知字段索引
+        entry = _DetailEntry(YApiInterface.model_validate(stored.data), stored_at)
+        self._details[interface_id] = entry
+        self._notify(interface_id, entry.interface)
+        return entry
+
+    def get_interface(self, interface_id: int) -> YApiInterface | None:
+        """Return a fresh cached interface definition, or None."""
+        entry = self._detail_entry(interface_id)
+        if entry is None and self.shared is not None:
+            # 共享缓存只保存共享项目的接口，任何用户都可读取
+            return self.shared.get_interface(interface_id)
+        if entry is None or self._expired(entry.stored_at):
+            return None
+        return entry.interface
+
+    def peek_interface(self, interface_id: int) -> YApiInterface | None:
+        """Return the last stored definition of an interface, even if expired."""
+        entry = self._detail_entry(interface_id)
+        if entry is None and self.shared is not None:
+            return self.shared.peek_interface(interface_id)
+        return entry.interface if entry is not None else None
+
+    def interface_fetched_at(self, interface_id: int) -> float | None:
+        """Return the wall-clock time a stored definition was fetched, or None."""
+        entry = self._detail_entry(interface_id)
+        if entry is None and self.shared is not None:
+            return self.shared.interface_fetched_at(interface_id)
+        if entry is None:
+            return None
+        return time.time() - (self._clock() - entry.stored_at)
+
+    def put_interface(self, interface: YApiInterface) -> None:
+        """Store or replace a complete interface definition."""
+        owner = self._owner(interface.project_id)
+        if owner is not self:
+            owner.put_interface(interface)
+            return
+        self._details[interface.id] = _DetailEntry(interface, self._clock())
+        self._notify(interface.id, interface)
+        if self.backend is not None:
+            self.backend.save_interface(
+                self.scope,
+                interface.id,
+                interface.project_id,
+                StoredEntry(interface.model_dump(mode="json", by_alias=True), time.time()),
+            )
+
+    def invalidate_interface(self, interface_id: int) -> None:
+        """Drop a cached interface definition (e.g. after a write), in every process."""
+        self._forget_interface(interface_id)
+        if self.shared is not None:
+            self.shared.invalidate_interface(interface_id)
+        else:
+            self._publish(interface_id=interface_id)
+
+    def _snapshot_entry(self, project_id: int) -> _SnapshotEntry | None:
+        """Local entry of a snapshot, replaced by a newer one from the backend."""
+        self._sync()
+        entry = self._snapshots.get(project_id)
+        if self.backend is None or (entry is not None and not self._expired(entry.stored_at)):
+            return entry
+        stored = self.backend.load_snapshot(self.scope, project_id)
+        if stored is None:
+            return entry
+        stored_at = self._stored_at(stored.fetched_at)
+        if entry is not None and entry.stored_at >= stored_at:
+            return entry
+        snapshot = ProjectSnapshot.restore(project_id, stored.data, stored.fetched_at)
+        snapshot.version = next(_snapshot_versions)
+        entry = self._snapshots[project_id] = _SnapshotEntry(snapshot, stored_at)
+        return entry
+
+    def get_snapshot(self, project_id: int) -> ProjectSnapshot | None:
+        """Return a fresh cached project snapshot, or None."""
+        owner = self._owner(project_id)
+        if owner is not self:
+            return owner.get_snapshot(project_id)
+        entry = self._snapshot_entry(project_id)
+        if entry is None or self._expired(entry.stored_at):
+            return None
+        return entry.snapshot
+
+    def peek_snapshot(self, project_id: int) -> ProjectSnapshot | None:
+        """Return the last stored snapshot of a project, even if expired."""
+        owner = self._owner(project_id)
+        if owner is not self:
+            return owner.peek_snapshot(project_id)
+        entry = self._snapshot_entry(project_id)
+        return entry.snapshot if entry is not None else None
+
+    def put_snapshot(self, snapshot: ProjectSnapshot) -> ProjectSnapshot:
+        """Store or replace a project snapshot and assign it a new version.
+
+        A snapshot with the same rows as the one already stored only renews that
+        entry, which keeps its version and the result cache and indexes built on it.
+
+        Returns:
+            The snapshot now cached: the given one or the unchanged stored one
+        """
+        owner = self._owner(snapshot.project_id)
+        if owner is not self:
+            return owner.put_snapshot(snapshot)
+        entry = self._snapshots.get(snapshot.project_id)
+        if entry is not None and entry.snapshot.same_rows(snapshot):
+            entry.snapshot.fetched_at = snapshot.fetched_at
+            snapshot = entry.snapshot
+        else:
+            snapshot.version = next(_snapshot_versions)
+        self._snapshots[snapshot.project_id] = _SnapshotEntry(snapshot, self._clock())
+        if self.backend is not None:
+            self.backend.save_snapshot(
+                self.scope, snapshot.project_id, StoredEntry(snapshot.export(), snapshot.fetched_at)
+            )
+        return snapshot
+
+    @asynccontextmanager
+    async def refresh_lease(self, project_id: int) -> AsyncIterator[ProjectSnapshot | None]:
+        """Hold the backend lease on refreshing a project's snapshot.
+
+        Only the lease holder fetches list_menu; other processes wait until
+        it stores the new snapshot (or its lease expires, e.g. if it died).
+
+        Yields:
+            A fresh snapshot stored meanwhile by another process (nothing to
+            fetch), or None when the caller holds the lease and should fetch.
+            Without a backend, None at once.
+        """
+        owner = self._owner(project_id)
+        if owner is not self:
+            async with owner.refresh_lease(project_id) as snapshot:
+                yield snapshot
+            return
+        if self.backend is None:
+            yield None
+            return
+        key = f"{self.scope}:snapshot:{project_id}"
+        while not self.backend.acquire_lease(key, self._origin, REFRESH_LEASE_TTL):
+            await asyncio.sleep(LEASE_POLL_INTERVAL)
+            snapshot = self.get_snapshot(project_id)
+            if snapshot is not None:
+                yield snapshot
+                return
+        try:
+            # 等待租约期间可能已有其他进程写入
+            yield self.get_snapshot(project_id)
+        finally:
+            self.backend.release_lease(key, self._origin)
+
+    def get_metadata(self, project_id: int) -> ProjectMetadata | None:
+        """Return fresh metadata of a project, or None.
+
+        Metadata is rebuilt from the cached snapshot whenever that snapshot is
+        newer than the one it was derived from (keeping a known basepath). Once
+        the snapshot is dropped by a local write the existing metadata stays in
+        use until it expires.
+        """
+        owner = self._owner(project_id)
+        if owner is not self:
+            return owner.get_metadata(project_id)
+        now = self._clock()
+        entry = self._metadata.get(project_id)
+        snapshot_entry = self._snapshot_entry(project_id)
+        if snapshot_entry is not None and now - snapshot_entry.stored_at < self.ttl:
+            snapshot = snapshot_entry.snapshot
+            if entry is None or entry.metadata.snapshot_version != snapshot.version:
+                metadata = ProjectMetadata.from_snapshot(snapshot)
+                if entry is not None:
+                    metadata.basepath = entry.metadata.basepath
+                entry = _MetadataEntry(metadata, snapshot_entry.stored_at)
+                self._metadata[project_id] = entry
+        if entry is None or now - entry.stored_at >= self.ttl:
+            return None
+        return entry.metadata
+
+    def locate_interface(self, interface_id: int) -> ProjectMetadata | None:
+        """Return fresh metadata of the cached project containing an interface, or None."""
+        for project_id in {*self._snapshots, *self._metadata}:
+            metadata = self.get_metadata(project_id)
+            if metadata is not None and metadata.route_of(interface_id) is not None:
+                return metadata
+        return self.shared.locate_interface(interface_id) if self.shared is not None else None
+
+    def invalidate_project(self, project_id: int) -> None:
+        """Drop a cached project snapshot and its search results (e.g. after a write)."""
+        owner = self._owner(project_id)
+        self._forget_project(project_id)
+        if owner is not self:
+            owner.invalidate_project(project_id)
+        else:
+            self._publish(project_id=project_id)
+
+    def drop_project(self, project_id: int) -> None:
+        """Drop everything cached about a project (e.g. after a server-side import)."""
+        owner = self._owner(project_id)
+        self._forget_project(project_id, whole=True)
+        if owner is not self:
+            owner.drop_project(project_id)
+        else:
+            self._publish(project_id=project_id, whole=True)
+
+    def clear(self) -> None:
+        """Drop all data cached in this process."""
+        for interface_id in list(self._details):
+            self._forget_interface(interface_id)
+        self._snapshots.clear()
+        self._metadata.clear()
+        self.results.clear()
+        self.creates.clear()
+        self.fingerprints.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry counts and search-result cache counters."""
+        return {
+            "interfaces": len(self._details),
+            "snapshots": len(self._snapshots),
+            "query_results": self.results.stats(),
+        }
+
+    def __len__(self) -> int:
+        return len(self._details)
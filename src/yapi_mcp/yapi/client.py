@@ -1,12 +1,46 @@
 """YApi API HTTP client implementation."""
 
+import asyncio
 import json
-from typing import Any, NoReturn
+from collections.abc import AsyncIterator, Callable, Hashable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, NoReturn, TypeVar
 
 import httpx
 import markdown as md_lib
 
+from .cache import YApiCache
+from .errors import OfflineError, UpdateConflictError
+from .idempotency import create_key, maybe_applied
+from .metadata import ProjectMetadata, UnknownCategoryError
 from .models import YApiErrorResponse, YApiInterface, YApiInterfaceSummary
+from .openapi import (
+    ImportPlan,
+    PlannedWrite,
+    SpecOperation,
+    changed_fields,
+    fingerprint,
+    interface_fields,
+    spec_fields,
+)
+from .query import SearchQuery
+from .snapshot import ProjectSnapshot
+from .stream import EVENT_END, JSONPath, JSONStreamParser
+
+_T = TypeVar("_T")
+
+# YApi 新建项目时自带的分类，未打 tag 且未指定 catid 的操作放入其中
+DEFAULT_CATEGORY_NAME = "公共分类"
+# 导入时逐个更新接口的变更说明
+IMPORT_CHANGE_MESSAGE = "OpenAPI 导入"
+
+# /api/open/import_data 支持的数据格式与合并模式：
+# normal 不导入已存在的接口；good 智能合并（保留已有接口的改动，合并新的响应定义）；
+# mergin 完全覆盖已存在的接口
+IMPORT_DATA_TYPES = ("swagger", "json")
+IMPORT_MERGE_MODES = ("normal", "good", "mergin")
+# 服务端整体导入可能较慢，单独使用更长的超时（秒）
+IMPORT_DATA_TIMEOUT = 120.0
 
 # Markdown 转 HTML 转换器（单例）
 _md_converter = md_lib.Markdown(extensions=["extra", "codehilite", "nl2br"])
@@ -31,10 +65,83 @@ def _set_if_not_none(payload: dict[str, Any], key: str, value: Any) -> None:  #
         payload[key] = value
 
 
-def _set_json_if_not_none(payload: dict[str, Any], key: str, value: str | None) -> None:
-    """Set payload key from JSON string if value is not None."""
+# JSON 数组参数：工具层校验时已解析好的列表直接使用，字符串则在此解析
+JSONArrayArg = str | list[Any]
+
+
+def _json_array(value: JSONArrayArg) -> list[Any]:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _set_json_if_not_none(payload: dict[str, Any], key: str, value: JSONArrayArg | None) -> None:
+    """Set payload key from a JSON string or pre-parsed list if value is not None."""
     if value is not None:
-        payload[key] = json.loads(value)
+        payload[key] = _json_array(value)
+
+
+def _create_payload(
+    project_id: int,
+    catid: int,
+    title: str,
+    path: str,
+    method: str,
+    *,
+    req_body: str,
+    req_body_type: str | None,
+    req_body_is_json_schema: bool | None,
+    req_body_form: JSONArrayArg | None,
+    res_body: str,
+    res_body_type: str | None,
+    res_body_is_json_schema: bool | None,
+    req_query: JSONArrayArg | None,
+    req_headers: JSONArrayArg | None,
+    req_params: JSONArrayArg | None,
+    markdown: str,
+    status: str | None,
+    tag: JSONArrayArg | None,
+    api_opened: bool | None,
+) -> dict[str, Any]:
+    """Build the /interface/add payload, leaving out fields that were not provided."""
+    payload: dict[str, Any] = {
+        "project_id": project_id,
+        "catid": catid,
+        "title": title,
+        "path": path,
+        "method": method.upper(),
+    }
+
+    if req_body:
+        payload["req_body_other"] = req_body
+        payload["req_body_type"] = req_body_type or "json"
+        payload["req_body_is_json_schema"] = (
+            req_body_is_json_schema if req_body_is_json_schema is not None else True
+        )
+    if req_body_form:
+        payload["req_body_form"] = _json_array(req_body_form)
+        if not req_body_type:
+            payload["req_body_type"] = "form"
+    if res_body:
+        payload["res_body"] = res_body
+        payload["res_body_type"] = res_body_type or "json"
+        payload["res_body_is_json_schema"] = (
+            res_body_is_json_schema if res_body_is_json_schema is not None else True
+        )
+    if req_query:
+        payload["req_query"] = _json_array(req_query)
+    if req_headers:
+        payload["req_headers"] = _json_array(req_headers)
+    if req_params:
+        payload["req_params"] = _json_array(req_params)
+    if markdown:
+        payload["markdown"] = markdown
+        payload["desc"] = _markdown_to_html(markdown)
+    if status is not None:
+        payload["status"] = status
+    if tag:
+        payload["tag"] = _json_array(tag)
+    if api_opened is not None:
+        payload["api_opened"] = api_opened
+    return payload
 
 
 def _raise_yapi_api_error(response: httpx.Response, error: YApiErrorResponse) -> NoReturn:
@@ -46,18 +153,139 @@ def _raise_yapi_api_error(response: httpx.Response, error: YApiErrorResponse) ->
     )
 
 
+def _raise_streamed_api_error(response: httpx.Response, error_data: dict[str, Any]) -> NoReturn:
+    # 流式响应体已被消费，重建一个只含错误信息的响应供错误映射读取
+    error_data.setdefault("errmsg", "")
+    replay = httpx.Response(response.status_code, json=error_data, request=response.request)
+    _raise_yapi_api_error(replay, YApiErrorResponse(**error_data))
+
+
+def check_import_options(data_type: str, merge: str) -> None:
+    """Validate the data type and merge mode of /api/open/import_data.
+
+    Raises:
+        ValueError: Unknown data_type or merge mode
+    """
+    if data_type not in IMPORT_DATA_TYPES:
+        msg = f'data_type "{data_type}" 无效。支持的值为：{"、".join(IMPORT_DATA_TYPES)}。'
+        raise ValueError(msg)
+    if merge not in IMPORT_MERGE_MODES:
+        msg = f'merge "{merge}" 无效。支持的值为：{"、".join(IMPORT_MERGE_MODES)}。'
+        raise ValueError(msg)
+
+
+def _full_update(payload: dict[str, Any]) -> dict[str, Any]:
+    """update_interface arguments that reset every field a spec leaves out."""
+    return {
+        "markdown": "",
+        "req_body": "",
+        "req_body_form": [],
+        "req_query": [],
+        "req_headers": [],
+        "req_params": [],
+        "res_body": "",
+        **payload,
+    }
+
+
+# 分类树响应中分类节点所在路径：list_menu 包在 data 下，导出数据为顶层数组
+_MENU_CATEGORY_PATH: JSONPath = ("data", "*")
+_EXPORT_CATEGORY_PATH: JSONPath = ("*",)
+
+# list_menu 记录中用于检索的字段，其余字段在解析后立即丢弃
+_MENU_INDEX_FIELDS = (
+    "_id",
+    "catid",
+    "title",
+    "path",
+    "method",
+    "status",
+    "tag",
+    "up_time",
+    "desc",
+    "markdown",
+)
+
+
+async def _iter_parser_events(
+    response: httpx.Response, parser: JSONStreamParser
+) -> AsyncIterator[tuple[str, JSONPath, Any]]:
+    async for chunk in response.aiter_bytes():
+        for event in parser.feed(chunk):
+            yield event
+    for event in parser.close():
+        yield event
+
+
+@dataclass(slots=True)
+class ProjectSearchHit:
+    """One search hit with project attribution and rank score."""
+
+    project_id: int
+    summary: dict[str, Any]
+    score: int
+
+
+@dataclass(slots=True)
+class ProjectSearchResult:
+    """Merged outcome of a search fanned out over several projects."""
+
+    hits: list[ProjectSearchHit] = field(default_factory=list)
+    errors: dict[int, Exception] = field(default_factory=dict)
+    timed_out: list[int] = field(default_factory=list)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.errors or self.timed_out)
+
+
+@dataclass(slots=True)
+class _UpdateTarget:
+    """What update_interface needs to know about the interface being updated."""
+
+    project_id: int
+    catid: int
+    method: str
+    path: str
+
+
+@dataclass(slots=True)
+class DetailedSearchResult:
+    """Best search hits of a project with their complete definitions."""
+
+    total: int
+    interfaces: list[YApiInterface] = field(default_factory=list)
+
+
+# /project/list 单次返回的项目上限（YApi 分组内项目数远小于该值）
+_PROJECT_LIST_LIMIT = 1000
+
+
 class YApiClient:
     """Async HTTP client for YApi API with cookie-based authentication."""
 
-    def __init__(self, base_url: str, cookies: dict[str, str], timeout: float = 10.0) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        cookies: dict[str, str],
+        timeout: float = 10.0,
+        *,
+        cache: YApiCache | None = None,
+        strict_validation: bool = False,
+    ) -> None:
         """Initialize YApi client.
 
         Args:
             base_url: YApi server base URL (e.g., "https://yapi.example.com")
             cookies: Authentication cookies dict with _yapi_token, _yapi_uid, ZYBIPSCAS
             timeout: Request timeout in seconds (default: 10.0)
+            cache: Optional shared cache for interface definitions
+            strict_validation: Validate response models field by field instead of
+                constructing them directly from already-checked responses
         """
         self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.strict_validation = strict_validation
         self.client = httpx.AsyncClient(
             base_url=f"{self.base_url}/api",
             cookies=cookies,
@@ -84,6 +312,17 @@ class YApiClient:
         data = response.json()
         return data.get("data", {})
 
+    def _make_interface(self, data: dict[str, Any]) -> YApiInterface:
+        # 响应已通过 _check_response / errcode 校验，默认跳过逐字段验证
+        if self.strict_validation:
+            return YApiInterface(**data)
+        return YApiInterface.model_construct(**data)
+
+    def _make_summary(self, data: dict[str, Any]) -> YApiInterfaceSummary:
+        if self.strict_validation:
+            return YApiInterfaceSummary(**data)
+        return YApiInterfaceSummary.model_construct(**data)
+
     def _check_response(self, response: httpx.Response) -> None:
         """Check YApi API response for errors and raise appropriate exceptions.
 
@@ -108,63 +347,499 @@ class YApiClient:
             # Not a JSON response or doesn't have errcode - proceed normally
             pass
 
+    async def _stream_category_items(
+        self,
+        url: str,
+        params: dict[str, Any],
+        category_path: JSONPath,
+    ) -> AsyncIterator[tuple[dict[str, Any], dict[str, Any] | None]]:
+        """Stream (category, interface) pairs from a category-tree response.
+
+        响应体通过 JSONStreamParser 增量解析，任一时刻只保留单个接口条目。
+        category 仅包含分类头部的标量字段（_id、name）。
+        每个分类结束时额外产出一次 (category, None)，便于记录空分类。
+
+        Raises:
+            httpx.HTTPStatusError: For HTTP errors or YApi errcode != 0
+        """
+        item_path = (*category_path, "list", "*")
+        parser = JSONStreamParser(
+            item_paths=[item_path],
+            scalar_paths=[
+                ("errcode",),
+                ("errmsg",),
+                (*category_path, "_id"),
+                (*category_path, "name"),
+            ],
+            end_paths=[category_path],
+        )
+
+        async with self.client.stream("GET", url, params=params) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+
+            error_data: dict[str, Any] = {}
+            category: dict[str, Any] = {}
+            # 分类名出现在 list 之后时暂存该分类的接口（YApi 实际输出中 list 位于末尾）
+            pending: list[dict[str, Any]] = []
+
+            async for kind, path, value in _iter_parser_events(response, parser):
+                if kind == EVENT_END:
+                    for item in pending:
+                        yield category, item
+                    pending.clear()
+                    if not error_data.get("errcode"):
+                        yield category, None
+                    category = {}
+                elif path == item_path:
+                    if error_data.get("errcode"):
+                        continue
+                    if "name" in category:
+                        yield category, value
+                    else:
+                        pending.append(value)
+                elif len(path) == 1:
+                    error_data[path[0]] = value
+                else:
+                    category[path[-1]] = value
+
+            if error_data.get("errcode"):
+                _raise_streamed_api_error(response, error_data)
+
+    async def iter_list_menu(self, project_id: int) -> AsyncIterator[dict[str, Any]]:
+        """Stream flattened interface records of a project from /api/interface/list_menu.
+
+        Each record keeps only the fields needed for searching plus ``_cat_name``.
+
+        Args:
+            project_id: YApi project ID
+
+        Yields:
+            Interface records (dicts with _id, catid, title, path, method, ...)
+
+        Raises:
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        # 使用 list_menu 接口获取全量接口（无分页限制）
+        async for category, item in self._stream_category_items(
+            "/interface/list_menu",
+            {"project_id": project_id},
+            _MENU_CATEGORY_PATH,
+        ):
+            if item is None:
+                continue
+            record = {field: item[field] for field in _MENU_INDEX_FIELDS if field in item}
+            record.setdefault("catid", category.get("_id"))
+            record["_cat_name"] = category.get("name", "")
+            yield record
+
+    async def get_project_snapshot(
+        self, project_id: int, *, refresh: bool = False
+    ) -> ProjectSnapshot:
+        """Get the columnar interface snapshot of a project.
+
+        Served from the shared cache when fresh; otherwise list_menu is streamed
+        straight into a new ProjectSnapshot which is then cached (while holding
+        the cache's refresh lease, so worker processes sharing a cache backend
+        do not fetch the same project at once).
+
+        Args:
+            project_id: YApi project ID
+            refresh: Ignore any cached snapshot and fetch a new one
+
+        Returns:
+            Project snapshot
+
+        Raises:
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        if self.cache is not None and not refresh:
+            cached = self.cache.get_snapshot(project_id)
+            if cached is not None:
+                return cached
+            # 多进程共享缓存时同一项目只由一个进程请求 list_menu，其余进程等待其结果
+            async with self.cache.refresh_lease(project_id) as stored:
+                if stored is not None:
+                    return stored
+                return await self._fetch_snapshot(project_id)
+        return await self._fetch_snapshot(project_id)
+
+    async def _fetch_snapshot(self, project_id: int) -> ProjectSnapshot:
+        """Stream list_menu into a new snapshot and cache it."""
+        snapshot = ProjectSnapshot(project_id)
+        async for category, item in self._stream_category_items(
+            "/interface/list_menu",
+            {"project_id": project_id},
+            _MENU_CATEGORY_PATH,
+        ):
+            if item is None:
+                if "_id" in category:
+                    snapshot.add_category(int(category["_id"]), category.get("name", ""))
+                continue
+            record = {field: item[field] for field in _MENU_INDEX_FIELDS if field in item}
+            record.setdefault("catid", category.get("_id"))
+            snapshot.append(record)
+        snapshot.freeze()
+
+        if self.cache is not None:
+            # 内容未变时沿用已缓存的快照，其版本与基于它的结果缓存、索引保持有效
+            return self.cache.put_snapshot(snapshot)
+        return snapshot
+
+    async def list_categories(
+        self, project_id: int, name: str | None = None
+    ) -> list[dict[str, Any]]:
+        """List the interface categories of a project with interface counts.
+
+        Built from the same list_menu snapshot as searching, so listing
+        categories right after a search needs no request.
+
+        Args:
+            project_id: YApi project ID
+            name: Only categories with this name (case-insensitive; falls back to
+                names containing it)
+
+        Returns:
+            Category dicts (_id, name, interface_count) in list_menu order
+
+        Raises:
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        snapshot = await self.get_project_snapshot(project_id)
+        counts = snapshot.category_counts()
+        catids = list(counts) if name is None else snapshot.category_ids(name)
+        return [
+            {
+                "_id": catid,
+                "name": snapshot.categories.get(catid, ""),
+                "interface_count": counts.get(catid, 0),
+            }
+            for catid in catids
+        ]
+
+    async def add_category(self, project_id: int, name: str, desc: str = "") -> int:
+        """Create an interface category via /api/interface/add_cat.
+
+        Args:
+            project_id: YApi project ID
+            name: Category name
+            desc: Category description
+
+        Returns:
+            ID of the new category
+
+        Raises:
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        response = await self.client.post(
+            "/interface/add_cat", json={"project_id": project_id, "name": name, "desc": desc}
+        )
+        self._check_response(response)
+        catid = int(response.json()["data"]["_id"])
+        if self.cache is not None:
+            self.cache.invalidate_project(project_id)
+            metadata = self.cache.get_metadata(project_id)
+            if metadata is not None:
+                metadata.categories[catid] = name
+        return catid
+
     async def search_interfaces(
-        self, project_id: int, keyword: str
+        self, project_id: int, keyword: str, *, fuzzy: bool = False
     ) -> list[YApiInterfaceSummary]:
         """Search interfaces in a YApi project.
 
         使用 list_menu 接口获取项目下全量接口，突破 50 条限制。
-        支持按接口标题、路径、描述、分类名进行搜索。
+        支持按接口标题、路径、描述、分类名进行搜索，
+        以及 method:/path:/tag:/status:/cat: 字段条件（见 query.SearchQuery）。
+        项目快照会写入共享缓存，缓存有效期内的搜索不再请求 YApi。
 
         Args:
             project_id: YApi project ID
-            keyword: Search keyword (matches title, path, description, category name)
+            keyword: Search keyword or field-scoped query
+            fuzzy: Match keywords typo-tolerantly, best match first
 
         Returns:
             List of matching interface summaries
 
+        Raises:
+            QuerySyntaxError: If the query cannot be parsed
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        query = SearchQuery.parse(keyword)
+        snapshot = await self.get_project_snapshot(project_id)
+        return self._search_snapshot(snapshot, query, fuzzy=fuzzy)
+
+    def _search_snapshot(
+        self, snapshot: ProjectSnapshot, query: SearchQuery, *, fuzzy: bool
+    ) -> list[YApiInterfaceSummary]:
+        summaries = self._cached_result(
+            snapshot,
+            ("summaries", query, fuzzy),
+            lambda: tuple(
+                self._make_summary(snapshot.summary(row))
+                for row in query.evaluate(snapshot, fuzzy=fuzzy)
+            ),
+        )
+        return list(summaries)
+
+    def search_local(
+        self, project_id: int, keyword: str, *, fuzzy: bool = False
+    ) -> tuple[list[YApiInterfaceSummary], float]:
+        """Search the last cached snapshot of a project without contacting YApi.
+
+        Used while YApi is unreachable: the snapshot may be older than the
+        cache TTL.
+
+        Args:
+            project_id: YApi project ID
+            keyword: Search keyword or field-scoped query
+            fuzzy: Match keywords typo-tolerantly, best match first
+
+        Returns:
+            Matching interface summaries and the wall-clock time the snapshot was fetched
+
+        Raises:
+            QuerySyntaxError: If the query cannot be parsed
+            OfflineError: If the project has never been fetched in this process
+        """
+        query = SearchQuery.parse(keyword)
+        snapshot = self.local_snapshot(project_id)
+        return self._search_snapshot(snapshot, query, fuzzy=fuzzy), snapshot.fetched_at
+
+    def local_snapshot(self, project_id: int) -> ProjectSnapshot:
+        """Return the last cached snapshot of a project without contacting YApi.
+
+        Raises:
+            OfflineError: If the project has never been fetched in this process
+        """
+        snapshot = self.cache.peek_snapshot(project_id) if self.cache is not None else None
+        if snapshot is None:
+            msg = f"YApi 不可达，且本地没有项目 {project_id} 的接口列表缓存"
+            raise OfflineError(msg)
+        return snapshot
+
+    def _cached_result(
+        self, snapshot: ProjectSnapshot, key: Hashable, compute: Callable[[], _T]
+    ) -> _T:
+        """Return a search result from the shared result cache, computing it on a miss."""
+        if self.cache is None:
+            return compute()
+        cached = self.cache.results.get(snapshot, key)
+        if cached is None:
+            cached = compute()
+            self.cache.results.put(snapshot, key, cached)
+        return cached
+
+    def _ranked_rows(
+        self, snapshot: ProjectSnapshot, query: SearchQuery, *, fuzzy: bool
+    ) -> tuple[int, ...]:
+        """Matching rows, best first (score for exact search, similarity for fuzzy)."""
+
+        def rank() -> tuple[int, ...]:
+            rows = query.evaluate(snapshot, fuzzy=fuzzy)
+            if not fuzzy:
+                # sort 是稳定排序，同分时保持 list_menu 顺序
+                rows.sort(key=lambda row: snapshot.score(row, query.rank_keyword), reverse=True)
+            return tuple(rows)
+
+        return self._cached_result(snapshot, ("ranked", query, fuzzy), rank)
+
+    async def search_with_details(
+        self,
+        project_id: int,
+        keyword: str,
+        *,
+        top: int = 3,
+        fuzzy: bool = False,
+        concurrency: int = 8,
+    ) -> DetailedSearchResult:
+        """Search a project and fetch the complete definitions of the best hits.
+
+        命中结果按匹配度排序（模糊搜索按相似度），取前 top 个并发获取完整定义，
+        已缓存的定义不再请求 YApi。
+
+        Args:
+            project_id: YApi project ID
+            keyword: Search keyword or query (same rules as search_interfaces)
+            top: Number of hits to fetch
+            fuzzy: Match keywords typo-tolerantly
+            concurrency: Maximum number of concurrent /interface/get requests
+
+        Returns:
+            Total number of hits and the definitions of the best ``top`` ones
+
+        Raises:
+            QuerySyntaxError: If the query cannot be parsed
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        query = SearchQuery.parse(keyword)
+        snapshot = await self.get_project_snapshot(project_id)
+        rows = self._ranked_rows(snapshot, query, fuzzy=fuzzy)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(row: int) -> YApiInterface:
+            async with semaphore:
+                return await self.get_interface(snapshot.ids[row])
+
+        interfaces = await asyncio.gather(*(fetch(row) for row in rows[:top]))
+        return DetailedSearchResult(len(rows), list(interfaces))
+
+    async def list_group_projects(self, group_id: int) -> list[dict[str, Any]]:
+        """List projects of a YApi group via /api/project/list.
+
+        Args:
+            group_id: YApi group ID
+
+        Returns:
+            Project dicts (with _id, name, basepath, ...)
+
         Raises:
             httpx.HTTPStatusError: For authentication, permission, or server errors
         """
-        # 使用 list_menu 接口获取全量接口（无分页限制）
         response = await self.client.get(
-            "/interface/list_menu",
-            params={"project_id": project_id},
+            "/project/list",
+            params={"group_id": group_id, "page": 1, "limit": _PROJECT_LIST_LIMIT},
         )
         self._check_response(response)
 
-        data = response.json()
-        categories = data.get("data", [])
-
-        # 展开树形结构为扁平列表，同时记录分类名
-        interfaces: list[dict] = []
-        for cat in categories:
-            cat_name = cat.get("name", "")
-            for iface in cat.get("list", []):
-                # 将分类名注入到接口数据中，用于搜索
-                iface["_cat_name"] = cat_name
-                interfaces.append(iface)
-
-        # 客户端关键词过滤（支持分类名搜索，同时匹配 desc 和 markdown）
-        if keyword:
-            keyword_lower = keyword.lower()
-            interfaces = [
-                iface
-                for iface in interfaces
-                if keyword_lower in iface.get("title", "").lower()
-                or keyword_lower in iface.get("path", "").lower()
-                or keyword_lower in iface.get("desc", "").lower()
-                or keyword_lower in iface.get("markdown", "").lower()
-                or keyword_lower in iface.get("_cat_name", "").lower()
-            ]
-
-        return [YApiInterfaceSummary(**iface) for iface in interfaces]
-
-    async def get_interface(self, interface_id: int) -> YApiInterface:
+        data = response.json().get("data") or {}
+        return data.get("list", []) if isinstance(data, dict) else data
+
+    async def get_project(self, project_id: int) -> dict[str, Any]:
+        """Get project information via /api/project/get.
+
+        Args:
+            project_id: YApi project ID
+
+        Returns:
+            Project dict (with _id, name, basepath, ...)
+
+        Raises:
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        response = await self.client.get("/project/get", params={"id": project_id})
+        self._check_response(response)
+        return response.json().get("data") or {}
+
+    async def _preflight_metadata(self, project_id: int) -> ProjectMetadata | None:
+        """Cached metadata for checking a write, or None when nothing is cached.
+
+        Only metadata already derived from a cached snapshot is used, so a write
+        never pays for a list_menu request; the basepath is fetched once.
+        """
+        if self.cache is None:
+            return None
+        metadata = self.cache.get_metadata(project_id)
+        if metadata is not None and metadata.basepath is None:
+            project = await self.get_project(project_id)
+            metadata.basepath = str(project.get("basepath") or "")
+        return metadata
+
+    async def _preflight(
+        self,
+        project_id: int,
+        *,
+        catid: int | None,
+        method: str | None,
+        path: str | None,
+        interface_id: int | None = None,
+    ) -> ProjectMetadata | None:
+        """Check a write against cached project metadata (see metadata.ProjectMetadata).
+
+        Raises:
+            PreflightError: The write conflicts with the project metadata
+        """
+        metadata = await self._preflight_metadata(project_id)
+        if metadata is None:
+            return None
+        try:
+            metadata.check_write(catid=catid, method=method, path=path, interface_id=interface_id)
+        except UnknownCategoryError:
+            # 分类可能刚在 YApi 页面上新建：刷新一次项目快照后再下结论
+            await self.get_project_snapshot(project_id, refresh=True)
+            metadata = await self._preflight_metadata(project_id)
+            if metadata is None:
+                return None
+            metadata.check_write(catid=catid, method=method, path=path, interface_id=interface_id)
+        return metadata
+
+    async def search_projects(
+        self,
+        project_ids: Sequence[int],
+        keyword: str,
+        *,
+        concurrency: int = 8,
+        timeout: float | None = None,
+    ) -> ProjectSearchResult:
+        """Search several projects concurrently and merge ranked hits.
+
+        每个项目的快照按 get_project_snapshot 获取（命中缓存时不发请求），
+        同时进行的 list_menu 请求不超过 concurrency 个。
+        单个项目失败或超时不影响其他项目，结果中单独列出。
+
+        Args:
+            project_ids: YApi project IDs (duplicates are ignored)
+            keyword: Search keyword or query (same rules as search_interfaces)
+            concurrency: Maximum number of concurrent list_menu requests
+            timeout: Overall deadline in seconds (None waits for all projects)
+
+        Returns:
+            Hits sorted by score (desc), then by project order and list_menu order
+
+        Raises:
+            QuerySyntaxError: If the query cannot be parsed (before any request)
+        """
+        query = SearchQuery.parse(keyword)
+        rank_keyword = query.rank_keyword
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def search_one(project_id: int) -> tuple[ProjectSearchHit, ...]:
+            async with semaphore:
+                snapshot = await self.get_project_snapshot(project_id)
+            return self._cached_result(
+                snapshot,
+                ("hits", query),
+                lambda: tuple(
+                    ProjectSearchHit(
+                        project_id, snapshot.summary(row), snapshot.score(row, rank_keyword)
+                    )
+                    for row in query.evaluate(snapshot)
+                ),
+            )
+
+        tasks = {
+            project_id: asyncio.create_task(search_one(project_id))
+            for project_id in dict.fromkeys(project_ids)
+        }
+        result = ProjectSearchResult()
+        if not tasks:
+            return result
+
+        _done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        for project_id, task in tasks.items():
+            if task in pending:
+                result.timed_out.append(project_id)
+            elif task.exception() is not None:
+                result.errors[project_id] = task.exception()  # type: ignore[assignment]
+            else:
+                result.hits.extend(task.result())
+
+        # sort 是稳定排序，同分时保持项目顺序与 list_menu 顺序
+        result.hits.sort(key=lambda hit: hit.score, reverse=True)
+        return result
+
+    async def get_interface(self, interface_id: int, *, refresh: bool = False) -> YApiInterface:
         """Get complete interface definition by ID.
 
         Args:
             interface_id: YApi interface ID
+            refresh: Ignore any cached definition and fetch a new one
 
         Returns:
             Complete interface definition
@@ -172,11 +847,103 @@ class YApiClient:
         Raises:
             httpx.HTTPStatusError: For authentication, not found, or server errors
         """
+        if self.cache is not None and not refresh:
+            cached = self.cache.get_interface(interface_id)
+            if cached is not None:
+                return cached
+        return await self._fetch_interface(interface_id)
+
+    def get_local_interface(self, interface_id: int) -> tuple[YApiInterface, float]:
+        """Return the last cached definition of an interface without contacting YApi.
+
+        Args:
+            interface_id: YApi interface ID
+
+        Returns:
+            Interface definition (possibly older than the cache TTL) and the
+            wall-clock time it was fetched
+
+        Raises:
+            OfflineError: If the interface has never been fetched in this process
+        """
+        if self.cache is not None:
+            interface = self.cache.peek_interface(interface_id)
+            fetched_at = self.cache.interface_fetched_at(interface_id)
+            if interface is not None and fetched_at is not None:
+                return interface, fetched_at
+        msg = f"YApi 不可达，且本地没有接口 {interface_id} 的定义缓存"
+        raise OfflineError(msg)
+
+    async def _fetch_interface(self, interface_id: int) -> YApiInterface:
+        """Fetch an interface definition from YApi, bypassing the cache, and cache it."""
         response = await self.client.get("/interface/get", params={"id": interface_id})
         self._check_response(response)
 
         data = response.json()
-        return YApiInterface(**data["data"])
+        interface = self._make_interface(data["data"])
+        if self.cache is not None:
+            self.cache.put_interface(interface)
+        return interface
+
+    async def iter_export_project(self, project_id: int) -> AsyncIterator[YApiInterface]:
+        """Yield every interface definition of a project from one export request.
+
+        使用 /api/plugin/export (type=json) 一次性导出项目下全部接口定义，
+        避免逐个调用 /interface/get。导出数据会剔除 _id/catid 等字段，
+        此时按 (method, path) 与 list_menu 结果关联补全（仅在需要时多发一次请求）。
+        每条定义都会写入详情缓存。
+
+        Args:
+            project_id: YApi project ID
+
+        Yields:
+            Complete interface definitions
+
+        Raises:
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        # (METHOD, path) -> (_id, catid)，首次遇到缺少 _id 的记录时才加载 list_menu
+        menu_index: dict[tuple[str, str], tuple[int, int]] | None = None
+
+        async for _category, record in self._stream_category_items(
+            "/plugin/export",
+            {"type": "json", "pid": project_id, "status": "all", "isWiki": "false"},
+            _EXPORT_CATEGORY_PATH,
+        ):
+            if record is None:
+                continue
+            if "_id" not in record or "catid" not in record:
+                if menu_index is None:
+                    menu_index = {
+                        (str(item.get("method", "")).upper(), item.get("path", "")): (
+                            item["_id"],
+                            item["catid"],
+                        )
+                        async for item in self.iter_list_menu(project_id)
+                    }
+                key = (str(record.get("method", "")).upper(), record.get("path", ""))
+                ids = menu_index.get(key)
+                if ids is None:
+                    # 导出与 list_menu 之间接口被删除或修改，无法确定 ID
+                    continue
+                record["_id"], record["catid"] = ids
+            record.setdefault("project_id", project_id)
+
+            interface = self._make_interface(record)
+            if self.cache is not None:
+                self.cache.put_interface(interface)
+            yield interface
+
+    async def export_project(self, project_id: int) -> list[YApiInterface]:
+        """Get all interface definitions of a project (see iter_export_project).
+
+        Args:
+            project_id: YApi project ID
+
+        Returns:
+            Complete interface definitions of every interface in the project
+        """
+        return [interface async for interface in self.iter_export_project(project_id)]
 
     async def create_interface(
         self,
@@ -189,17 +956,18 @@ class YApiClient:
         req_body: str = "",
         req_body_type: str | None = None,
         req_body_is_json_schema: bool | None = None,
-        req_body_form: str = "",
+        req_body_form: JSONArrayArg | None = "",
         res_body: str = "",
         res_body_type: str | None = None,
         res_body_is_json_schema: bool | None = None,
-        req_query: str = "",
-        req_headers: str = "",
-        req_params: str = "",
+        req_query: JSONArrayArg | None = "",
+        req_headers: JSONArrayArg | None = "",
+        req_params: JSONArrayArg | None = "",
         markdown: str = "",
         status: str | None = None,
-        tag: str = "",
+        tag: JSONArrayArg | None = "",
         api_opened: bool | None = None,
+        idempotency_key: str | None = None,
     ) -> dict[str, Any]:
         """Create a new interface.
 
@@ -223,55 +991,139 @@ class YApiClient:
             status: Interface status (undone/done)
             tag: Tags (JSON array: ["tag1", "tag2"])
             api_opened: Whether API is publicly accessible
+            idempotency_key: Key identifying this create across retries
+                (default: derived from the request payload)
+
+        JSON array arguments may also be passed pre-parsed as lists
+        (see models.ParsedInterfaceArrays).
 
         Returns:
-            dict with keys: action ("created"), interface_id (int)
+            dict with keys: action ("created"), interface_id (int), and
+            replayed (True) when an earlier attempt with the same key had
+            already created the interface
+
+        Raises:
+            PreflightError: catid, method + path or basepath conflict with the
+                cached project metadata; nothing is sent to YApi
+            IdempotencyKeyReuseError: idempotency_key was used for another route
         """
-        payload: dict[str, Any] = {
-            "project_id": project_id,
-            "catid": catid,
-            "title": title,
-            "path": path,
-            "method": method.upper(),
-        }
+        payload = _create_payload(
+            project_id,
+            catid,
+            title,
+            path,
+            method,
+            req_body=req_body,
+            req_body_type=req_body_type,
+            req_body_is_json_schema=req_body_is_json_schema,
+            req_body_form=req_body_form,
+            res_body=res_body,
+            res_body_type=res_body_type,
+            res_body_is_json_schema=res_body_is_json_schema,
+            req_query=req_query,
+            req_headers=req_headers,
+            req_params=req_params,
+            markdown=markdown,
+            status=status,
+            tag=tag,
+            api_opened=api_opened,
+        )
+        key = idempotency_key or create_key(payload)
+        replayed = await self._replay_create(
+            key, project_id, method, path, confirm=idempotency_key is None
+        )
+        if replayed is not None:
+            return {"action": "created", "interface_id": replayed, "replayed": True}
 
-        if req_body:
-            payload["req_body_other"] = req_body
-            payload["req_body_type"] = req_body_type or "json"
-            payload["req_body_is_json_schema"] = (
-                req_body_is_json_schema if req_body_is_json_schema is not None else True
-            )
-        if req_body_form:
-            payload["req_body_form"] = json.loads(req_body_form)
-            if not req_body_type:
-                payload["req_body_type"] = "form"
-        if res_body:
-            payload["res_body"] = res_body
-            payload["res_body_type"] = res_body_type or "json"
-            payload["res_body_is_json_schema"] = (
-                res_body_is_json_schema if res_body_is_json_schema is not None else True
-            )
-        if req_query:
-            payload["req_query"] = json.loads(req_query)
-        if req_headers:
-            payload["req_headers"] = json.loads(req_headers)
-        if req_params:
-            payload["req_params"] = json.loads(req_params)
-        if markdown:
-            payload["markdown"] = markdown
-            payload["desc"] = _markdown_to_html(markdown)
-        if status is not None:
-            payload["status"] = status
-        if tag:
-            payload["tag"] = json.loads(tag)
-        if api_opened is not None:
-            payload["api_opened"] = api_opened
-
-        response = await self.client.post("/interface/add", json=payload)
-        self._check_response(response)
+        metadata = await self._preflight(project_id, catid=catid, method=method, path=path)
+        if self.cache is not None:
+            self.cache.creates.begin(key, project_id, method, path)
+        try:
+            response = await self.client.post("/interface/add", json=payload)
+            self._check_response(response)
+        except BaseException as exc:
+            # 结果不确定时保留待定记录，下次重试先查项目列表
+            if self.cache is not None and not maybe_applied(exc):
+                self.cache.creates.discard(key)
+            raise
+        if self.cache is not None:
+            self.cache.invalidate_project(project_id)
 
         data = response.json()
-        return {"action": "created", "interface_id": int(data["data"]["_id"])}
+        interface_id = int(data["data"]["_id"])
+        if self.cache is not None:
+            self.cache.creates.complete(key, interface_id)
+        if metadata is not None:
+            metadata.add_route(method, path, interface_id, catid)
+        return {"action": "created", "interface_id": interface_id}
+
+    async def _replay_create(
+        self, key: str, project_id: int, method: str, path: str, *, confirm: bool
+    ) -> int | None:
+        """Interface already created under an idempotency key, or None to create it.
+
+        A completed record under an explicit key is trusted unless cached
+        metadata shows the route is gone. A pending record (earlier attempt
+        failed ambiguously), or a completed one under a key derived from the
+        payload (``confirm``), is resolved by looking the route up in a freshly
+        fetched project snapshot: repeating an identical create may be a genuine
+        re-create of an interface deleted since.
+        """
+        if self.cache is None:
+            return None
+        record = self.cache.creates.lookup(key, project_id, method, path)
+        if record is None:
+            return None
+        interface_id = record.interface_id
+        if interface_id is not None and not confirm:
+            metadata = self.cache.get_metadata(project_id)
+            if metadata is None or metadata.route_of(interface_id) == (record.method, path):
+                return interface_id
+            self.cache.creates.discard(key)
+            return None
+
+        snapshot = await self.get_project_snapshot(project_id, refresh=True)
+        for row in range(len(snapshot)):
+            if snapshot.method(row) == record.method and snapshot.path(row) == path:
+                found = snapshot.ids[row]
+                if interface_id is not None and found != interface_id:
+                    # 路由已被另一个接口占用，交由预检报告重复
+                    break
+                self.cache.creates.complete(key, found)
+                return found
+        self.cache.creates.discard(key)
+        return None
+
+    async def _resolve_update_target(
+        self, interface_id: int, catid: int | None, expected_up_time: int | None
+    ) -> _UpdateTarget:
+        """Find project, category and route of an interface about to be updated.
+
+        With ``expected_up_time`` the definition is always re-read from YApi and
+        compared. Otherwise the read is skipped when the detail is cached or
+        when catid is supplied and a cached project snapshot knows the interface.
+
+        Raises:
+            UpdateConflictError: The upstream up_time differs from expected_up_time
+        """
+        if expected_up_time is None and catid is not None and self.cache is not None:
+            metadata = self.cache.locate_interface(interface_id)
+            route = metadata.route_of(interface_id) if metadata is not None else None
+            if metadata is not None and route is not None:
+                return _UpdateTarget(metadata.project_id, catid, *route)
+
+        if expected_up_time is None:
+            existing = await self.get_interface(interface_id)
+        else:
+            existing = await self._fetch_interface(interface_id)
+            if existing.up_time != expected_up_time:
+                raise UpdateConflictError(interface_id, expected_up_time, existing.up_time)
+        return _UpdateTarget(
+            existing.project_id,
+            catid if catid is not None else existing.catid,
+            existing.method,
+            existing.path,
+        )
 
     async def update_interface(
         self,
@@ -284,25 +1136,33 @@ class YApiClient:
         req_body: str | None = None,
         req_body_type: str | None = None,
         req_body_is_json_schema: bool | None = None,
-        req_body_form: str | None = None,
+        req_body_form: JSONArrayArg | None = None,
         res_body: str | None = None,
         res_body_type: str | None = None,
         res_body_is_json_schema: bool | None = None,
-        req_query: str | None = None,
-        req_headers: str | None = None,
-        req_params: str | None = None,
+        req_query: JSONArrayArg | None = None,
+        req_headers: JSONArrayArg | None = None,
+        req_params: JSONArrayArg | None = None,
         markdown: str | None = None,
         status: str | None = None,
-        tag: str | None = None,
+        tag: JSONArrayArg | None = None,
         api_opened: bool | None = None,
         switch_notice: bool | None = None,
         message: str | None = None,
+        expected_up_time: int | None = None,
+        check_conflict: bool = False,
     ) -> dict[str, Any]:
         """Update an existing interface (read-before-write).
 
         Automatically fetches existing data and merges user-provided fields.
         Only fields explicitly passed will be updated; others keep their current values.
 
+        Optimistic concurrency: with ``expected_up_time`` (or ``check_conflict``,
+        which takes it from the last definition this client cached) the current
+        definition is re-read and the update is refused if its up_time moved.
+        YApi has no conditional update, so a write landing between that read and
+        ``/interface/up`` can still be overwritten.
+
         Args:
             interface_id: Interface ID to update
             catid: Category ID (auto-fetched if not provided)
@@ -325,16 +1185,42 @@ class YApiClient:
             api_opened: Whether API is publicly accessible
             switch_notice: Whether to notify team members
             message: Change description
+            expected_up_time: up_time the caller last saw
+            check_conflict: Use the up_time of the cached definition (even an
+                expired one) when expected_up_time is not given
+
+        JSON array arguments may also be passed pre-parsed as lists
+        (see models.ParsedInterfaceArrays).
 
         Returns:
             dict with keys: action ("updated"), interface_id (int)
+
+        Raises:
+            PreflightError: The new catid, method + path or path conflict with the
+                cached project metadata; nothing is sent to YApi
+            UpdateConflictError: The interface changed upstream since expected_up_time
         """
-        # 先读后写：获取现有接口数据
-        existing = await self.get_interface(interface_id)
+        if expected_up_time is None and check_conflict and self.cache is not None:
+            seen = self.cache.peek_interface(interface_id)
+            expected_up_time = seen.up_time if seen is not None else None
+
+        # 先读后写：获取现有接口数据（缓存命中或已知分类时可省去读取）
+        target = await self._resolve_update_target(interface_id, catid, expected_up_time)
+        new_method = method or target.method
+        new_path = path or target.path
+        route_changed = method is not None or path is not None
+        metadata = await self._preflight(
+            target.project_id,
+            catid=catid,
+            method=new_method if route_changed else None,
+            # 仅修改 method 时也要按原 path 检查路由是否与其他接口重复
+            path=new_path if route_changed else path,
+            interface_id=interface_id,
+        )
 
         payload: dict[str, Any] = {
             "id": interface_id,
-            "catid": catid if catid is not None else existing.catid,
+            "catid": target.catid,
         }
 
         _set_if_not_none(payload, "title", title)
@@ -372,5 +1258,190 @@ class YApiClient:
 
         response = await self.client.post("/interface/up", json=payload)
         self._check_response(response)
+        if self.cache is not None:
+            self.cache.invalidate_interface(interface_id)
+            self.cache.invalidate_project(target.project_id)
+        if metadata is not None:
+            metadata.add_route(new_method, new_path, interface_id, target.catid)
 
         return {"action": "updated", "interface_id": interface_id}
+
+    async def plan_import(
+        self,
+        project_id: int,
+        operations: Sequence[SpecOperation],
+        *,
+        default_catid: int | None = None,
+        concurrency: int = 8,
+    ) -> ImportPlan:
+        """Compare spec operations with a project and plan the writes to sync it.
+
+        Operations are matched to interfaces by method + path in the project
+        snapshot and go to the category named by their first tag. An existing
+        interface is only read when its cached fingerprint (see
+        ``YApiCache.fingerprints``) is missing, stale or differs from the spec.
+
+        Args:
+            project_id: YApi project ID
+            operations: Converted spec operations (see openapi.operations_from_spec)
+            default_catid: Category of untagged operations (default: the
+                project's "公共分类")
+            concurrency: Maximum number of concurrent interface reads
+
+        Returns:
+            Creates, updates (with changed fields) and new categories; nothing is written
+
+        Raises:
+            httpx.HTTPStatusError: For authentication, permission, or server errors
+        """
+        snapshot = await self.get_project_snapshot(project_id)
+        catid_of = {name: catid for catid, name in snapshot.categories.items()}
+        if default_catid is None:
+            default_catid = catid_of.get(DEFAULT_CATEGORY_NAME)
+        rows = {(snapshot.method(row), snapshot.path(row)): row for row in range(len(snapshot))}
+
+        plan = ImportPlan(project_id)
+        compares: list[tuple[PlannedWrite, int]] = []
+        for operation in operations:
+            if operation.category is None:
+                catid = default_catid
+                if catid is None:
+                    plan.errors.append(
+                        (operation, "未打 tag，且未指定 catid、项目中也没有公共分类")
+                    )
+                    continue
+            else:
+                catid = catid_of.get(operation.category)
+                if catid is None and operation.category not in plan.new_categories:
+                    plan.new_categories.append(operation.category)
+            row = rows.get((operation.method, operation.path))
+            if row is None:
+                plan.writes.append(PlannedWrite(operation, catid))
+            else:
+                compares.append((PlannedWrite(operation, catid, snapshot.ids[row]), row))
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def compare(write: PlannedWrite, row: int) -> bool:
+            wanted = spec_fields(write.operation, write.catid)
+            interface_id = snapshot.ids[row]
+            known = self.cache.fingerprints.get(interface_id) if self.cache else None
+            if known == (snapshot.up_times[row], fingerprint(wanted)):
+                return False
+            async with semaphore:
+                existing = await self.get_interface(interface_id)
+            current = interface_fields(existing)
+            if self.cache is not None and existing.up_time is not None:
+                self.cache.fingerprints[interface_id] = (existing.up_time, fingerprint(current))
+            write.changed = changed_fields(current, wanted)
+            return bool(write.changed)
+
+        differs = await asyncio.gather(*(compare(write, row) for write, row in compares))
+        for (write, _row), changed in zip(compares, differs, strict=True):
+            if changed:
+                plan.writes.append(write)
+            else:
+                plan.unchanged += 1
+        return plan
+
+    async def apply_import(self, plan: ImportPlan, *, concurrency: int = 8) -> list[dict[str, Any]]:
+        """Send the writes of an import plan, creating its new categories first.
+
+        Updates set every compared field (fields absent from the spec are
+        cleared) without notifying the team. One failing write does not stop
+        the others.
+
+        Args:
+            plan: Plan from plan_import
+            concurrency: Maximum number of concurrent writes
+
+        Returns:
+            One dict per planned write, in plan order: action ("created",
+            "updated" or "failed"), method, path, interface_id and, for
+            failures, error
+
+        Raises:
+            httpx.HTTPStatusError: Creating a new category failed
+        """
+        for name in plan.new_categories:
+            catid = await self.add_category(plan.project_id, name)
+            for write in plan.writes:
+                if write.catid is None and write.operation.category == name:
+                    write.catid = catid
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(write: PlannedWrite) -> dict[str, Any]:
+            operation = write.operation
+            outcome: dict[str, Any] = {
+                "method": operation.method,
+                "path": operation.path,
+                "interface_id": write.interface_id,
+            }
+            catid = write.catid
+            if catid is None:
+                return {**outcome, "action": "failed", "error": "分类未创建"}
+            try:
+                async with semaphore:
+                    if write.interface_id is None:
+                        result = await self.create_interface(
+                            plan.project_id, catid, **operation.payload
+                        )
+                    else:
+                        result = await self.update_interface(
+                            write.interface_id,
+                            catid=catid,
+                            **_full_update(operation.payload),
+                            switch_notice=False,
+                            message=IMPORT_CHANGE_MESSAGE,
+                        )
+            except Exception as exc:
+                return {**outcome, "action": "failed", "error": str(exc)}
+            return {**outcome, "action": result["action"], "interface_id": result["interface_id"]}
+
+        return list(await asyncio.gather(*(send(write) for write in plan.writes)))
+
+    async def import_data(
+        self,
+        project_id: int,
+        token: str,
+        data: str,
+        *,
+        data_type: str = "swagger",
+        merge: str = "normal",
+    ) -> dict[str, Any]:
+        """Import a whole document in one request via /api/open/import_data.
+
+        YApi parses and merges the document server-side, authenticated by the
+        project token rather than the user cookies.
+
+        Args:
+            project_id: Project the token belongs to (used for cache invalidation)
+            token: Project token (project settings -> token)
+            data: Swagger / OpenAPI JSON, or a YApi JSON export, as a string
+            data_type: "swagger" or "json" (YApi export format)
+            merge: "normal" (skip existing interfaces), "good" (merge, keeping
+                existing changes) or "mergin" (overwrite existing interfaces)
+
+        Returns:
+            dict with keys: action ("imported"), project_id, merge, message
+            (YApi's import summary)
+
+        Raises:
+            ValueError: Unknown data_type or merge mode
+            httpx.HTTPStatusError: For invalid tokens, malformed data or server errors
+        """
+        check_import_options(data_type, merge)
+        response = await self.client.post(
+            "/open/import_data",
+            json={"type": data_type, "merge": merge, "token": token, "json": data},
+            timeout=IMPORT_DATA_TIMEOUT,
+        )
+        self._check_response(response)
+        if self.cache is not None:
+            self.cache.drop_project(project_id)
+        return {
+            "action": "imported",
+            "project_id": project_id,
+            "merge": merge,
+            "message": response.json().get("errmsg", ""),
+        }
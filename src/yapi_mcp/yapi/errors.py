@@ -16,6 +16,8 @@ ERROR_TYPE_VALIDATION_FAILED = "VALIDATION_FAILED"
 ERROR_TYPE_SERVER_ERROR = "SERVER_ERROR"
 ERROR_TYPE_NETWORK_ERROR = "NETWORK_ERROR"
 ERROR_TYPE_CONFIG_ERROR = "CONFIG_ERROR"
+ERROR_TYPE_CONFLICT = "CONFLICT"
+ERROR_TYPE_OFFLINE = "OFFLINE"
 
 
 class ToolErrorDetails(TypedDict, total=False):
@@ -44,6 +46,7 @@ HTTP_STATUS_BAD_REQUEST = 400
 MCP_CODE_AUTH_FAILED = -32001
 MCP_CODE_NOT_FOUND = -32002
 MCP_CODE_FORBIDDEN = -32003
+MCP_CODE_CONFLICT = -32004
 MCP_CODE_SERVER_ERROR = -32000
 MCP_CODE_INVALID_PARAMS = -32602
 
@@ -85,6 +88,15 @@ ERROR_SUGGESTIONS: dict[str, list[str]] = {
         "检查防火墙或代理设置",
         "稍后重试",
     ],
+    ERROR_TYPE_CONFLICT: [
+        "接口已被他人修改，先调用 yapi_get_interface 获取最新定义",
+        "基于最新定义重新组织修改内容，并以新的 up_time 作为 expected_up_time 重试",
+    ],
+    ERROR_TYPE_OFFLINE: [
+        "YApi 当前不可达，写操作已暂停以免结果不确定",
+        "读操作（搜索、获取接口）会使用本地缓存并标注 stale",
+        "检查网络连接与 YAPI_SERVER_URL，稍后重试",
+    ],
     ERROR_TYPE_CONFIG_ERROR: [
         "检查环境变量配置是否完整",
         "确认 YAPI_SERVER_URL、YAPI_TOKEN、YAPI_UID 已设置",
@@ -126,6 +138,25 @@ def format_tool_error(
     return json.dumps(response, ensure_ascii=False, indent=2)
 
 
+class UpdateConflictError(RuntimeError):
+    """Raised when an interface changed upstream after the up_time the caller saw."""
+
+    def __init__(
+        self, interface_id: int, expected_up_time: int, current_up_time: int | None
+    ) -> None:
+        super().__init__(
+            f"接口 {interface_id} 已被修改：期望 up_time 为 {expected_up_time}，"
+            f"YApi 当前为 {current_up_time}。为避免覆盖他人的修改，本次更新未提交。"
+        )
+        self.interface_id = interface_id
+        self.expected_up_time = expected_up_time
+        self.current_up_time = current_up_time
+
+
+class OfflineError(RuntimeError):
+    """Raised when YApi is unreachable and the request cannot be served locally."""
+
+
 class MCPError(Exception):
     """MCP protocol error with error code and optional data."""
 
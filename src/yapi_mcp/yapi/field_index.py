@@ -0,0 +1,306 @@
+"""Field-name index over cached interface definitions.
+
+Answers "which interfaces take a ``merchant_id`` query param" or "which responses
+contain ``refund_amount``" without fetching every definition: ``FieldIndex`` maps
+lowercased field names to the interfaces and locations they appear in, and
+``FieldIndexer`` keeps it in step with the detail cache in the background.
+"""
+
+import asyncio
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from .cache import YApiCache
+from .models import YApiInterface
+
+# 字段所在位置：对应 YApiInterface 的 req_query / req_params / req_headers /
+# req_body_form / req_body_other / res_body
+FIELD_LOCATIONS = ("query", "params", "headers", "form", "req_body", "res_body")
+
+# 每批索引的接口数，批与批之间让出事件循环
+INDEX_BATCH_SIZE = 200
+
+# JSON Schema 嵌套深度上限，防止异常数据导致递归过深
+_MAX_SCHEMA_DEPTH = 32
+_SCHEMA_COMBINATORS = ("allOf", "anyOf", "oneOf")
+
+_PARAM_LOCATIONS = (
+    ("query", "req_query"),
+    ("params", "req_params"),
+    ("headers", "req_headers"),
+    ("form", "req_body_form"),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FieldHit:
+    """One occurrence of a field in an interface definition."""
+
+    location: str
+    field: str
+
+
+@dataclass(frozen=True, slots=True)
+class _IndexedInterface:
+    source: YApiInterface
+    hits: tuple[FieldHit, ...]
+    names: frozenset[str]
+
+
+@dataclass(slots=True)
+class FieldMatch:
+    """An interface together with the matching fields it contains."""
+
+    interface: YApiInterface
+    hits: list[FieldHit]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "_id": self.interface.id,
+            "project_id": self.interface.project_id,
+            "title": self.interface.title,
+            "path": self.interface.path,
+            "method": self.interface.method,
+            "fields": [{"location": hit.location, "field": hit.field} for hit in self.hits],
+        }
+
+
+def _leaf_name(field: str) -> str:
+    return field.rsplit(".", 1)[-1].removesuffix("[]").lower()
+
+
+def _walk_schema(node: object, prefix: str, depth: int) -> Iterator[str]:
+    """Yield dotted field paths declared by a JSON Schema."""
+    if depth > _MAX_SCHEMA_DEPTH or not isinstance(node, dict):
+        return
+    properties = node.get("properties")
+    if isinstance(properties, dict):
+        for name, child in properties.items():
+            field = f"{prefix}.{name}" if prefix else str(name)
+            yield field
+            yield from _walk_schema(child, field, depth + 1)
+    items = node.get("items")
+    if items is not None:
+        yield from _walk_schema(items, f"{prefix}[]" if prefix else prefix, depth + 1)
+    for combinator in _SCHEMA_COMBINATORS:
+        for branch in node.get(combinator) or ():
+            yield from _walk_schema(branch, prefix, depth + 1)
+
+
+def _walk_example(node: object, prefix: str, depth: int) -> Iterator[str]:
+    """Yield dotted field paths of a plain JSON example body."""
+    if depth > _MAX_SCHEMA_DEPTH:
+        return
+    if isinstance(node, dict):
+        for name, child in node.items():
+            field = f"{prefix}.{name}" if prefix else str(name)
+            yield field
+            yield from _walk_example(child, field, depth + 1)
+    elif isinstance(node, list):
+        for child in node:
+            yield from _walk_example(child, f"{prefix}[]" if prefix else prefix, depth + 1)
+
+
+def _body_fields(body: str | None, is_json_schema: bool | None) -> Iterator[str]:
+    if not body:
+        return
+    try:
+        document = json.loads(body)
+    except ValueError:
+        # raw/JSON5 等无法解析的请求体不参与字段索引
+        return
+    looks_like_schema = isinstance(document, dict) and (
+        "properties" in document or document.get("type") in {"object", "array"}
+    )
+    if is_json_schema or (is_json_schema is None and looks_like_schema):
+        fields = _walk_schema(document, "", 0)
+    else:
+        fields = _walk_example(document, "", 0)
+    # 组合关键字与数组示例会重复产出同一路径
+    yield from dict.fromkeys(fields)
+
+
+def extract_fields(interface: YApiInterface) -> list[FieldHit]:
+    """List every field declared by an interface definition."""
+    hits: list[FieldHit] = []
+    for location, attribute in _PARAM_LOCATIONS:
+        for param in getattr(interface, attribute) or ():
+            name = param.get("name") if isinstance(param, dict) else None
+            if name:
+                hits.append(FieldHit(location, str(name)))
+    hits.extend(
+        FieldHit("req_body", field)
+        for field in _body_fields(interface.req_body_other, interface.req_body_is_json_schema)
+    )
+    hits.extend(
+        FieldHit("res_body", field)
+        for field in _body_fields(interface.res_body, interface.res_body_is_json_schema)
+    )
+    return hits
+
+
+class FieldIndex:
+    """Inverted index from lowercased field name to interface IDs."""
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._interfaces: dict[int, _IndexedInterface] = {}
+        self._postings: dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._interfaces)
+
+    def __contains__(self, interface_id: object) -> bool:
+        return interface_id in self._interfaces
+
+    def add(self, interface: YApiInterface) -> None:
+        """Index (or re-index) one interface definition."""
+        current = self._interfaces.get(interface.id)
+        if current is not None and current.source is interface:
+            return
+        self.remove(interface.id)
+        hits = tuple(extract_fields(interface))
+        names = frozenset(_leaf_name(hit.field) for hit in hits)
+        self._interfaces[interface.id] = _IndexedInterface(interface, hits, names)
+        for name in names:
+            self._postings.setdefault(name, set()).add(interface.id)
+
+    def remove(self, interface_id: int) -> None:
+        """Drop an interface from the index."""
+        indexed = self._interfaces.pop(interface_id, None)
+        if indexed is None:
+            return
+        for name in indexed.names:
+            ids = self._postings.get(name)
+            if ids is not None:
+                ids.discard(interface_id)
+                if not ids:
+                    del self._postings[name]
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self._interfaces.clear()
+        self._postings.clear()
+
+    def project_size(self, project_id: int) -> int:
+        """Number of indexed interfaces of a project."""
+        return sum(
+            1 for indexed in self._interfaces.values() if indexed.source.project_id == project_id
+        )
+
+    def search(
+        self,
+        name: str,
+        *,
+        location: str | None = None,
+        project_id: int | None = None,
+        partial: bool = False,
+    ) -> list[FieldMatch]:
+        """Find interfaces containing a field.
+
+        Args:
+            name: Field name, matched case-insensitively against the last path segment
+            location: Restrict to one of FIELD_LOCATIONS
+            project_id: Restrict to one project
+            partial: Match field names containing ``name`` instead of equal to it
+
+        Returns:
+            Matches ordered by interface ID
+        """
+        needle = name.strip().lower()
+        if partial:
+            names = [candidate for candidate in self._postings if needle in candidate]
+        else:
+            names = [needle] if needle in self._postings else []
+
+        interface_ids: set[int] = set()
+        for candidate in names:
+            interface_ids |= self._postings[candidate]
+
+        wanted = set(names)
+        matches: list[FieldMatch] = []
+        for interface_id in sorted(interface_ids):
+            indexed = self._interfaces[interface_id]
+            if project_id is not None and indexed.source.project_id != project_id:
+                continue
+            hits = [
+                hit
+                for hit in indexed.hits
+                if _leaf_name(hit.field) in wanted
+                and (location is None or hit.location == location)
+            ]
+            if hits:
+                matches.append(FieldMatch(indexed.source, hits))
+        return matches
+
+
+class FieldIndexer:
+    """Keeps a FieldIndex in step with the interface details of a YApiCache.
+
+    Detail writes are queued and indexed by a background task in batches of
+    ``INDEX_BATCH_SIZE``, yielding to the event loop between batches. ``flush``
+    indexes whatever is still queued, so searches never miss a cached detail.
+    """
+
+    def __init__(self, cache: YApiCache, index: FieldIndex | None = None) -> None:
+        """Attach to a cache and queue the details it already holds.
+
+        Args:
+            cache: Detail cache to follow
+            index: Index to maintain (default: a new empty FieldIndex)
+        """
+        self.index = index if index is not None else FieldIndex()
+        self._pending: dict[int, YApiInterface] = {
+            interface.id: interface for interface in cache.interfaces()
+        }
+        self._task: asyncio.Task[None] | None = None
+        self._cache = cache
+        cache.subscribe(self._on_detail_change)
+
+    @property
+    def pending(self) -> int:
+        """Number of queued definitions not yet indexed."""
+        return len(self._pending)
+
+    def _on_detail_change(self, interface_id: int, interface: YApiInterface | None) -> None:
+        if interface is None:
+            self._pending.pop(interface_id, None)
+            self.index.remove(interface_id)
+            return
+        self._pending[interface_id] = interface
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 没有事件循环时留待下一次 flush 处理
+            return
+        self._task = loop.create_task(self._drain())
+
+    def _index_batch(self) -> None:
+        for _ in range(min(INDEX_BATCH_SIZE, len(self._pending))):
+            interface_id = next(iter(self._pending))
+            self.index.add(self._pending.pop(interface_id))
+
+    async def _drain(self) -> None:
+        while self._pending:
+            self._index_batch()
+            await asyncio.sleep(0)
+
+    def flush(self) -> FieldIndex:
+        """Index all queued definitions now and return the index."""
+        while self._pending:
+            self._index_batch()
+        return self.index
+
+    def close(self) -> None:
+        """Stop following the cache, e.g. when the login owning it is closed."""
+        self._cache.unsubscribe(self._on_detail_change)
+        self._pending.clear()
+        if self._task is not None:
+            self._task.cancel()
@@ -0,0 +1,191 @@
+"""Typo-tolerant matching of interface titles and paths.
+
+Plain search is a case-insensitive substring test, so "reciept" or "/usr/profle"
+finds nothing. ``TrigramIndex`` keeps, per project snapshot, an inverted index
+from word trigrams to rows. A fuzzy query first collects the rows sharing the
+most trigrams with it (counted for all rows at once over bitsets), and only
+those candidates are ranked by edit distance, so a project with tens of thousands of
+interfaces never gets a distance computed against every row.
+"""
+
+import math
+import re
+from array import array
+from collections.abc import Callable
+
+from .bitmap import bitmap_from_rows, rows_from_bitmap
+
+# 候选行至少需要共享查询三元组的比例
+MIN_SIMILARITY = 0.3
+# 进入编辑距离排序的候选行上限
+MAX_CANDIDATES = 100
+
+_WORD = re.compile(r"\w+")
+
+
+def _word_trigrams(word: str) -> list[str]:
+    padded = f"  {word} "
+    return [padded[index : index + 3] for index in range(len(padded) - 2)]
+
+
+def trigrams(text: str) -> set[str]:
+    """Return the padded word trigrams of text (case-insensitive)."""
+    grams: set[str] = set()
+    for word in _WORD.findall(text.lower()):
+        grams.update(_word_trigrams(word))
+    return grams
+
+
+def substring_distance(needle: str, text: str) -> int:
+    """Edit distance between needle and its best-matching substring of text.
+
+    Uses Myers' bit-parallel algorithm: one pass over text with a handful of
+    integer operations per character, whatever the length of needle.
+    """
+    length = len(needle)
+    if not length:
+        return 0
+    peq: dict[str, int] = {}
+    for index, char in enumerate(needle):
+        peq[char] = peq.get(char, 0) | 1 << index
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+    positive, negative = full, 0
+    score = best = length
+    for char in text:
+        equal = peq.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        h_positive = negative | (~(horizontal | positive) & full)
+        h_negative = positive & horizontal
+        if h_positive & high:
+            score += 1
+        elif h_negative & high:
+            score -= 1
+            best = min(best, score)
+        # 子串匹配：文本起点不计代价，因此移位时不补 1
+        h_positive = (h_positive << 1) & full
+        h_negative = (h_negative << 1) & full
+        positive = h_negative | (~(vertical | h_positive) & full)
+        negative = h_positive & vertical
+    return best
+
+
+def max_distance(query: str) -> int:
+    """Largest edit distance still accepted as a typo of query."""
+    return max(1, len(query) // 3)
+
+
+def _bit_sliced_sum(bitmaps: list[int]) -> list[int]:
+    """Add row bitsets as binary counters: bit r of planes[i] is bit i of row r's count."""
+    planes: list[int] = []
+    for bitmap in bitmaps:
+        carry = bitmap
+        for index, plane in enumerate(planes):
+            if not carry:
+                break
+            planes[index], carry = plane ^ carry, plane & carry
+        if carry:
+            planes.append(carry)
+    return planes
+
+
+def _at_least(planes: list[int], count: int, universe: int) -> int:
+    """Rows of universe whose bit-sliced counter is >= count."""
+    if count >> len(planes):
+        return 0
+    greater, equal = 0, universe
+    for index in reversed(range(len(planes))):
+        plane = planes[index]
+        if count >> index & 1:
+            equal &= plane
+        else:
+            greater |= equal & plane
+            equal &= ~plane
+    return greater | equal
+
+
+class TrigramIndex:
+    """Inverted trigram index over the title and path of each row.
+
+    Each posting is stored as whichever is smaller: an ``array`` of row numbers
+    or an int bitset. Counting shared trigrams for every row at once is then a
+    bit-sliced addition of the query's posting bitsets.
+    """
+
+    __slots__ = ("_fields", "_postings", "_size")
+
+    def __init__(self, size: int, fields: Callable[[int], tuple[str, str]]) -> None:
+        """Build the index.
+
+        Args:
+            size: Number of rows
+            fields: Returns the lowercased ``(title, path)`` of a row; kept to
+                re-read candidates instead of copying every text into the index
+        """
+        self._size = size
+        self._fields = fields
+        # 先按词聚合行号：接口标题与路径中的词大量重复，每个词只切分一次三元组
+        word_rows: dict[str, list[int]] = {}
+        for row in range(size):
+            title, path = fields(row)
+            for word in set(_WORD.findall(f"{title} {path}")):
+                word_rows.setdefault(word, []).append(row)
+
+        merged: dict[str, list[int]] = {}
+        for word, rows in word_rows.items():
+            for gram in _word_trigrams(word):
+                merged.setdefault(gram, []).extend(rows)
+
+        self._postings: dict[str, array | int] = {}
+        for gram, rows in merged.items():
+            unique = sorted(set(rows))
+            # 行数超过 size/32 时位图（size/8 字节）比 4 字节行号数组更省内存
+            self._postings[gram] = (
+                bitmap_from_rows(unique) if len(unique) * 32 > size else array("I", unique)
+            )
+
+    def _bitmap(self, gram: str) -> int:
+        posting = self._postings[gram]
+        return posting if isinstance(posting, int) else bitmap_from_rows(posting)
+
+    def search(self, query: str, mask: int | None = None) -> list[int]:
+        """Return rows fuzzily matching query, best match first.
+
+        Args:
+            query: Free text, typically a misspelled title or path
+            mask: Int bitset restricting matches (e.g. from field filters)
+
+        Returns:
+            Rows whose title or path is within ``max_distance(query)`` edits of
+            query, ordered by edit distance, then trigram overlap, then row
+        """
+        needle = query.strip().lower()
+        grams = [gram for gram in trigrams(needle) if gram in self._postings]
+        needed = max(1, math.ceil(len(trigrams(needle)) * MIN_SIMILARITY))
+        if len(grams) < needed:
+            return []
+
+        planes = _bit_sliced_sum([self._bitmap(gram) for gram in grams])
+        remaining = (1 << self._size) - 1 if mask is None else mask
+        # 按共享三元组数从高到低取候选，凑够 MAX_CANDIDATES 即停
+        shortlist: list[tuple[int, int]] = []
+        for shared in range(len(grams), needed - 1, -1):
+            level = _at_least(planes, shared, remaining)
+            if not level:
+                continue
+            remaining &= ~level
+            rows = rows_from_bitmap(level, MAX_CANDIDATES - len(shortlist))
+            shortlist.extend((shared, row) for row in rows)
+            if len(shortlist) >= MAX_CANDIDATES:
+                break
+
+        limit = max_distance(needle)
+        ranked = []
+        for shared, row in shortlist[:MAX_CANDIDATES]:
+            title, path = self._fields(row)
+            distance = min(substring_distance(needle, title), substring_distance(needle, path))
+            if distance <= limit:
+                ranked.append((distance, -shared, row))
+        ranked.sort()
+        return [row for _distance, _shared, row in ranked]
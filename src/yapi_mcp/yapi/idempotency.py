@@ -0,0 +1,148 @@
+"""Idempotency ledger for interface creation.
+
+A timeout on ``/interface/add`` leaves it unknown whether the interface was
+created, and a blind retry may add it twice. Every create is keyed (by default
+on its payload: project, method, path and definition, see ``create_key``) and
+``CreateLedger`` remembers its outcome: retrying a completed create returns the
+recorded interface (once a fresh project snapshot confirms it still exists when
+the key was derived), and retrying after an ambiguous failure first looks for
+the route in a fresh project snapshot before posting again.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+# 幂等记录的保留时长（秒）与条数上限
+DEFAULT_LEDGER_TTL = 600.0
+DEFAULT_LEDGER_SIZE = 1024
+# 派生幂等键保留的十六进制位数
+KEY_LENGTH = 32
+
+
+class IdempotencyKeyReuseError(ValueError):
+    """Raised when an idempotency key is reused for a different interface."""
+
+    def __init__(self, key: str, method: str, path: str) -> None:
+        super().__init__(f"幂等键 {key} 已用于创建 {method} {path}，不能用于其他接口")
+
+
+def create_key(payload: dict[str, Any]) -> str:
+    """Derive the default idempotency key of a create from its ``/interface/add`` payload.
+
+    Retries send the same payload and share the key; a different definition
+    for the same route gets its own key and meets the duplicate-route check.
+    """
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:KEY_LENGTH]
+
+
+def maybe_applied(exc: BaseException) -> bool:
+    """Whether a failed write request may still have been applied by YApi.
+
+    Connection failures never reached the server and 4xx / business errors
+    (``errcode != 0``) are explicit rejections; timeouts after connecting,
+    dropped connections, 5xx responses and cancellation are ambiguous.
+    """
+    if isinstance(exc, httpx.ConnectError | httpx.ConnectTimeout):
+        return False
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= httpx.codes.INTERNAL_SERVER_ERROR
+    return isinstance(exc, httpx.TransportError | asyncio.CancelledError)
+
+
+@dataclass(slots=True)
+class CreateRecord:
+    """Outcome of one keyed create.
+
+    Attributes:
+        project_id: Project the interface was created in
+        method: Upper-case HTTP method
+        path: Interface path
+        interface_id: Created interface, None while the outcome is unknown
+        recorded_at: Clock time of the last change
+    """
+
+    project_id: int
+    method: str
+    path: str
+    interface_id: int | None
+    recorded_at: float
+
+    @property
+    def pending(self) -> bool:
+        """True when the request was sent but its outcome is unknown."""
+        return self.interface_id is None
+
+
+class CreateLedger:
+    """Bounded, expiring map of idempotency key -> create outcome."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_LEDGER_TTL,
+        maxsize: int = DEFAULT_LEDGER_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize ledger.
+
+        Args:
+            ttl: Seconds a record is kept (default: 600)
+            maxsize: Maximum number of records, oldest dropped first
+            clock: Monotonic time source, injectable for tests
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._records: OrderedDict[str, CreateRecord] = OrderedDict()
+
+    def lookup(self, key: str, project_id: int, method: str, path: str) -> CreateRecord | None:
+        """Return the live record of key, or None.
+
+        Raises:
+            IdempotencyKeyReuseError: key was recorded for another route
+        """
+        record = self._records.get(key)
+        if record is None:
+            return None
+        if self._clock() - record.recorded_at >= self.ttl:
+            del self._records[key]
+            return None
+        if (record.project_id, record.method, record.path) != (project_id, method.upper(), path):
+            raise IdempotencyKeyReuseError(key, record.method, record.path)
+        return record
+
+    def begin(self, key: str, project_id: int, method: str, path: str) -> None:
+        """Record that a create request is about to be sent."""
+        self._store(key, CreateRecord(project_id, method.upper(), path, None, self._clock()))
+
+    def complete(self, key: str, interface_id: int) -> None:
+        """Record the interface a keyed create produced."""
+        record = self._records.get(key)
+        if record is not None:
+            record.interface_id = interface_id
+            record.recorded_at = self._clock()
+
+    def discard(self, key: str) -> None:
+        """Forget a key (the create definitely did not happen, or is stale)."""
+        self._records.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every record."""
+        self._records.clear()
+
+    def _store(self, key: str, record: CreateRecord) -> None:
+        self._records[key] = record
+        self._records.move_to_end(key)
+        while len(self._records) > self.maxsize:
+            self._records.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,166 @@
+"""Per-project metadata for checking interface writes before sending them.
+
+``yapi_create_interface`` used to learn only from a YApi business error that a
+``catid`` does not exist or that the method and path are already taken.
+``ProjectMetadata`` keeps what those checks need: category IDs and names, the
+``(method, path)`` of every interface and the project basepath. It is derived
+from the cached list_menu snapshot and updated in place by local writes, so
+obvious conflicts are rejected without a round trip.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .snapshot import ProjectSnapshot
+
+# 分类不存在时提示中最多列出的分类数
+MAX_CATEGORY_HINTS = 5
+
+
+class PreflightError(ValueError):
+    """Raised when a write conflicts with the cached project metadata."""
+
+
+class UnknownCategoryError(PreflightError):
+    """Raised when catid is not a category of the project."""
+
+    def __init__(self, project_id: int, catid: int, hint: str) -> None:
+        super().__init__(f"分类 catid {catid} 不存在于项目 {project_id}。{hint}")
+
+
+class DuplicateRouteError(PreflightError):
+    """Raised when another interface already uses the method and path."""
+
+    def __init__(self, project_id: int, method: str, path: str, interface_id: int) -> None:
+        super().__init__(
+            f"项目 {project_id} 中已存在接口 {method} {path}（接口 ID {interface_id}）。"
+            "如需修改该接口请使用 yapi_update_interface，或更换 path/method。"
+        )
+
+
+class BasepathInPathError(PreflightError):
+    """Raised when path repeats the project basepath."""
+
+    def __init__(self, basepath: str, path: str) -> None:
+        relative = path.removeprefix(basepath) or "/"
+        super().__init__(
+            f'path "{path}" 不应包含项目 basepath "{basepath}"：'
+            f"YApi 会自动拼接 basepath，请改为 {relative}。"
+        )
+
+
+@dataclass(slots=True)
+class _Route:
+    interface_id: int
+    catid: int
+
+
+def _segments(path: str) -> list[str]:
+    return [segment for segment in path.split("/") if segment]
+
+
+@dataclass(slots=True)
+class ProjectMetadata:
+    """Categories, routes and basepath of one project.
+
+    Attributes:
+        project_id: YApi project ID
+        categories: Category ID -> name
+        routes: ``(METHOD, path)`` -> interface using it
+        basepath: Project basepath, None until fetched
+        snapshot_version: Version of the snapshot this was derived from
+    """
+
+    project_id: int
+    categories: dict[int, str] = field(default_factory=dict)
+    routes: dict[tuple[str, str], _Route] = field(default_factory=dict)
+    basepath: str | None = None
+    snapshot_version: int = 0
+    _route_of: dict[int, tuple[str, str]] = field(default_factory=dict, init=False, repr=False)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: ProjectSnapshot) -> "ProjectMetadata":
+        """Derive metadata from a project snapshot."""
+        metadata = cls(
+            snapshot.project_id,
+            dict(snapshot.categories),
+            snapshot_version=snapshot.version,
+        )
+        for row in range(len(snapshot)):
+            metadata.add_route(
+                snapshot.method(row), snapshot.path(row), snapshot.ids[row], snapshot.catids[row]
+            )
+        return metadata
+
+    def add_route(self, method: str, path: str, interface_id: int, catid: int) -> None:
+        """Record (or move) the route of an interface."""
+        self.remove_route(interface_id)
+        key = (method.upper(), path)
+        self.routes[key] = _Route(interface_id, catid)
+        self._route_of[interface_id] = key
+
+    def route_of(self, interface_id: int) -> tuple[str, str] | None:
+        """Return the ``(METHOD, path)`` of an interface, or None if unknown."""
+        return self._route_of.get(interface_id)
+
+    def remove_route(self, interface_id: int) -> None:
+        """Forget the route of an interface."""
+        key = self._route_of.pop(interface_id, None)
+        if key is not None and self.routes.get(key, _Route(-1, 0)).interface_id == interface_id:
+            del self.routes[key]
+
+    def category_hint(self, path: str | None) -> str:
+        """Suggest categories for path: where its sibling paths live, else the first few."""
+        if path:
+            wanted = _segments(path)
+            best, votes = 0, Counter[int]()
+            for (_method, route_path), route in self.routes.items():
+                shared = 0
+                for left, right in zip(wanted, _segments(route_path), strict=False):
+                    if left != right:
+                        break
+                    shared += 1
+                if shared > best:
+                    best, votes = shared, Counter()
+                if shared == best and shared:
+                    votes[route.catid] += 1
+            if votes:
+                catid = votes.most_common(1)[0][0]
+                if catid in self.categories:
+                    return f"是否应为 catid {catid}（{self.categories[catid]}）？"
+        if not self.categories:
+            return "该项目还没有分类，请先在 YApi 中创建分类。"
+        shown = list(self.categories.items())[:MAX_CATEGORY_HINTS]
+        listed = "、".join(f"{catid}（{name}）" for catid, name in shown)
+        return f"项目现有分类：{listed}。"
+
+    def check_write(
+        self,
+        *,
+        catid: int | None = None,
+        method: str | None = None,
+        path: str | None = None,
+        interface_id: int | None = None,
+    ) -> None:
+        """Check a create (interface_id None) or update against this metadata.
+
+        Args:
+            catid: Target category, checked when given
+            method: Target method; the route is checked when method and path are given
+            path: Target path, also checked against the basepath
+            interface_id: Interface being updated, which may keep its own route
+
+        Raises:
+            UnknownCategoryError: catid is not a category of the project
+            DuplicateRouteError: Another interface already uses method and path
+            BasepathInPathError: path starts with the project basepath
+        """
+        if catid is not None and catid not in self.categories:
+            raise UnknownCategoryError(self.project_id, catid, self.category_hint(path))
+        if method and path:
+            route = self.routes.get((method.upper(), path))
+            if route is not None and route.interface_id != interface_id:
+                raise DuplicateRouteError(self.project_id, method.upper(), path, route.interface_id)
+        basepath = (self.basepath or "").rstrip("/")
+        if basepath and path and (path == basepath or path.startswith(f"{basepath}/")):
+            raise BasepathInPathError(basepath, path)
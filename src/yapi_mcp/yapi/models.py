@@ -1,8 +1,9 @@
 """Pydantic models for YApi API data structures."""
 
+from dataclasses import dataclass
 from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class YApiInterface(BaseModel):
@@ -24,9 +25,7 @@ class YApiInterface(BaseModel):
 
     desc: str | None = Field(None, description="Interface description (HTML)")
     markdown: str | None = Field(None, description="Interface description (Markdown)")
-    req_body_other: str | None = Field(
-        None, description="Request body definition (JSON string)"
-    )
+    req_body_other: str | None = Field(None, description="Request body definition (JSON string)")
     req_body_type: str | None = Field(None, description="Request body type (form/json/raw/file)")
     req_body_is_json_schema: bool | None = Field(
         None, description="Whether req_body is JSON Schema"
@@ -72,3 +71,23 @@ class YApiErrorResponse(BaseModel):
 
     errcode: int = Field(..., description="Error code (non-zero indicates error)")
     errmsg: str = Field(..., description="Error message")
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedInterfaceArrays:
+    """JSON-array arguments of a create/update request, decoded once during validation.
+
+    None means the argument was not provided. YApiClient.create_interface and
+    update_interface take these lists as-is instead of decoding the strings again.
+    """
+
+    req_body_form: list[Any] | None = None
+    req_query: list[Any] | None = None
+    req_headers: list[Any] | None = None
+    req_params: list[Any] | None = None
+    tag: list[Any] | None = None
+
+
+# 预编译的列表序列化器：直接由 pydantic-core 输出 JSON，避免 model_dump + json.dumps 两次遍历
+INTERFACE_LIST_ADAPTER = TypeAdapter(list[YApiInterface])
+SUMMARY_LIST_ADAPTER = TypeAdapter(list[YApiInterfaceSummary])
@@ -0,0 +1,66 @@
+"""Reachability tracking for the degraded (offline) read mode.
+
+When YApi is down every tool call used to wait for a connect timeout and then
+fail. ``Connectivity`` remembers that the server was unreachable: for
+``retry_interval`` seconds after a network failure reads are served from the
+local cache without trying YApi first (marked stale), and writes fail fast
+instead of queueing up timeouts whose outcome is unknown. The first successful
+request, or the end of the interval, ends offline mode.
+"""
+
+import time
+from collections.abc import Callable
+
+from .errors import OfflineError
+
+# 网络失败后，在这么多秒内直接走本地缓存，不再先请求 YApi
+DEFAULT_RETRY_INTERVAL = 30.0
+
+
+class Connectivity:
+    """Whether YApi was recently found unreachable."""
+
+    def __init__(
+        self,
+        retry_interval: float = DEFAULT_RETRY_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize tracker.
+
+        Args:
+            retry_interval: Seconds to stay offline after a network failure
+                (0 never skips YApi; reads still fall back after a failure)
+            clock: Monotonic time source, injectable for tests
+        """
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._down_at: float | None = None
+
+    @property
+    def offline(self) -> bool:
+        """True while within ``retry_interval`` of the last network failure."""
+        return self._down_at is not None and self._clock() - self._down_at < self.retry_interval
+
+    def mark_down(self) -> None:
+        """Record a network failure talking to YApi."""
+        self._down_at = self._clock()
+
+    def mark_up(self) -> None:
+        """Record a successful request to YApi."""
+        self._down_at = None
+
+    def check_writable(self) -> None:
+        """Fail fast when a write would go to an unreachable YApi.
+
+        Raises:
+            OfflineError: YApi failed within the last ``retry_interval`` seconds
+        """
+        if self._down_at is None or not self.offline:
+            return
+        elapsed = self._clock() - self._down_at
+        remaining = max(1, round(self.retry_interval - elapsed))
+        msg = (
+            f"YApi 在 {int(elapsed)} 秒前不可达，当前处于离线模式，写操作未提交。"
+            f"约 {remaining} 秒后会重新尝试连接 YApi，届时请重试。"
+        )
+        raise OfflineError(msg)
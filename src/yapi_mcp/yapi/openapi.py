@@ -0,0 +1,433 @@
+"""Convert OpenAPI 3 / Swagger 2 documents into YApi interface payloads.
+
+``operations_from_spec`` turns every operation of a spec into the keyword
+arguments of ``YApiClient.create_interface``: parameters become
+``req_query`` / ``req_headers`` / ``req_params``, JSON request and response
+bodies become JSON Schema strings with local ``$ref`` s inlined, and form bodies
+become ``req_body_form``. The first tag names the target category.
+
+To sync only what changed, both sides are reduced to the same comparable fields
+(``spec_fields`` / ``interface_fields``) and hashed with ``fingerprint``.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from .models import YApiInterface
+
+HTTP_METHODS = ("get", "post", "put", "delete", "patch", "head", "options")
+# 按顺序挑选响应体的状态码，其余 2xx 次之，最后是 default
+_PREFERRED_RESPONSES = ("200", "201")
+_FORM_MEDIA_TYPES = ("application/x-www-form-urlencoded", "multipart/form-data")
+# 展开 $ref 时重复出现的引用（循环引用）以此占位
+_CYCLE_PLACEHOLDER: dict[str, Any] = {"type": "object"}
+
+# 参与比较的数组字段及各自保留的键
+_ARRAY_KEYS: dict[str, tuple[str, ...]] = {
+    "req_query": ("name", "required", "desc", "example"),
+    "req_headers": ("name", "value", "required", "desc"),
+    "req_params": ("name", "desc", "example"),
+    "req_body_form": ("name", "type", "required", "desc", "example"),
+}
+_JSON_FIELDS = ("req_body", "res_body")
+COMPARED_FIELDS = (
+    "catid",
+    "title",
+    "markdown",
+    "req_body_type",
+    "req_body",
+    "res_body_type",
+    "res_body",
+    *_ARRAY_KEYS,
+)
+
+
+@dataclass(slots=True)
+class SpecOperation:
+    """One spec operation converted to ``create_interface`` arguments.
+
+    Attributes:
+        method: Upper-case HTTP method
+        path: Operation path as written in the spec
+        category: Name of the target category (first tag), None when untagged
+        payload: ``create_interface`` keyword arguments (arrays as lists)
+    """
+
+    method: str
+    path: str
+    category: str | None
+    payload: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class PlannedWrite:
+    """A create (interface_id None) or update an import will send.
+
+    Attributes:
+        operation: Spec operation to write
+        catid: Target category, None until its new category is created
+        interface_id: Existing interface to update, None to create one
+        changed: Differing fields of an update (see COMPARED_FIELDS)
+    """
+
+    operation: SpecOperation
+    catid: int | None
+    interface_id: int | None = None
+    changed: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ImportPlan:
+    """What importing a spec into a project would change.
+
+    Attributes:
+        project_id: Target project
+        writes: Creates, then updates, to send
+        unchanged: Number of operations identical to their interface
+        new_categories: Tag names without a matching category, to be created
+        errors: Operations that cannot be imported, with the reason
+    """
+
+    project_id: int
+    writes: list[PlannedWrite] = field(default_factory=list)
+    unchanged: int = 0
+    new_categories: list[str] = field(default_factory=list)
+    errors: list[tuple[SpecOperation, str]] = field(default_factory=list)
+
+
+def load_spec(text: str) -> dict[str, Any]:
+    """Parse an OpenAPI 3 or Swagger 2 document from JSON or YAML text.
+
+    Raises:
+        ValueError: The text is not a JSON/YAML OpenAPI or Swagger document
+    """
+    if text.lstrip().startswith("{"):
+        document = json.loads(text)
+    else:
+        try:
+            import yaml  # noqa: PLC0415
+        except ImportError as exc:
+            msg = "解析 YAML 格式的规范需要安装 PyYAML，或改用 JSON 格式"
+            raise ValueError(msg) from exc
+        try:
+            document = yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            msg = f"无法解析 YAML: {exc}"
+            raise ValueError(msg) from exc
+    if not isinstance(document, dict) or not ("openapi" in document or "swagger" in document):
+        msg = "不是 OpenAPI 3 / Swagger 2 文档（缺少 openapi 或 swagger 字段）"
+        raise ValueError(msg)
+    return document
+
+
+class _RefResolver:
+    """Inline local ``$ref`` s (``#/...``) of a spec document."""
+
+    def __init__(self, document: dict[str, Any]) -> None:
+        self.document = document
+
+    def lookup(self, ref: str) -> Any:  # noqa: ANN401
+        if not ref.startswith("#/"):
+            msg = f"不支持外部引用: {ref}"
+            raise ValueError(msg)
+        node: Any = self.document
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")  # noqa: PLW2901
+            if not isinstance(node, dict) or part not in node:
+                msg = f"引用不存在: {ref}"
+                raise ValueError(msg)
+            node = node[part]
+        return node
+
+    def deref(self, node: Any) -> Any:  # noqa: ANN401
+        """Follow a top-level ``$ref`` chain without inlining nested ones."""
+        seen: set[str] = set()
+        while isinstance(node, dict) and "$ref" in node and node["$ref"] not in seen:
+            seen.add(node["$ref"])
+            node = self.lookup(node["$ref"])
+        return node
+
+    def inline(self, node: Any, active: tuple[str, ...] = ()) -> Any:  # noqa: ANN401
+        """Copy node with every nested ``$ref`` replaced by its target."""
+        if isinstance(node, list):
+            return [self.inline(item, active) for item in node]
+        if not isinstance(node, dict):
+            return node
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            if ref in active:
+                return dict(_CYCLE_PLACEHOLDER)
+            return self.inline(self.lookup(ref), (*active, ref))
+        return {key: self.inline(value, active) for key, value in node.items()}
+
+
+def _text(value: Any) -> str:  # noqa: ANN401
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, dict | list):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _param_example(param: dict[str, Any]) -> str:
+    schema = param.get("schema") or {}
+    for value in (param.get("example"), schema.get("example"), param.get("default")):
+        if value is not None:
+            return _text(value)
+    return ""
+
+
+def _parameters(
+    resolver: _RefResolver, path_item: dict[str, Any], operation: dict[str, Any]
+) -> list[dict[str, Any]]:
+    # 操作级参数按 (name, in) 覆盖路径级参数
+    merged: dict[tuple[str, str], dict[str, Any]] = {}
+    for raw in (*path_item.get("parameters", ()), *operation.get("parameters", ())):
+        param = resolver.deref(raw)
+        if isinstance(param, dict) and "name" in param:
+            merged[(param["name"], param.get("in", ""))] = param
+    return list(merged.values())
+
+
+def _schema_text(resolver: _RefResolver, schema: Any) -> str:  # noqa: ANN401
+    if not schema:
+        return ""
+    return json.dumps(resolver.inline(schema), ensure_ascii=False, indent=2)
+
+
+def _media_base(media_type: str) -> str:
+    return media_type.partition(";")[0].strip().lower()
+
+
+def _is_json_media(media_type: str) -> bool:
+    base = _media_base(media_type)
+    return base in ("application/json", "*/*") or base.endswith("+json")
+
+
+def _form_fields(resolver: _RefResolver, schema: Any) -> list[dict[str, Any]]:  # noqa: ANN401
+    schema = resolver.deref(schema) or {}
+    required = set(schema.get("required", ()))
+    fields = []
+    for name, prop in (schema.get("properties") or {}).items():
+        prop = resolver.deref(prop) or {}  # noqa: PLW2901
+        is_file = prop.get("format") == "binary" or prop.get("type") == "file"
+        fields.append(
+            {
+                "name": name,
+                "type": "file" if is_file else "text",
+                "required": "1" if name in required else "0",
+                "desc": prop.get("description", ""),
+                "example": _text(prop.get("example")),
+            }
+        )
+    return fields
+
+
+def _request_body(
+    resolver: _RefResolver, operation: dict[str, Any], params: list[dict[str, Any]]
+) -> dict[str, Any]:
+    # Swagger 2：in=body / in=formData 参数
+    for param in params:
+        if param.get("in") == "body":
+            return {
+                "req_body_type": "json",
+                "req_body": _schema_text(resolver, param.get("schema")),
+            }
+    form = [
+        {
+            "name": param["name"],
+            "type": "file" if param.get("type") == "file" else "text",
+            "required": "1" if param.get("required") else "0",
+            "desc": param.get("description", ""),
+            "example": _param_example(param),
+        }
+        for param in params
+        if param.get("in") == "formData"
+    ]
+    if form:
+        return {"req_body_type": "form", "req_body_form": form}
+
+    # OpenAPI 3：requestBody.content
+    content = (resolver.deref(operation.get("requestBody")) or {}).get("content") or {}
+    for media_type, media in content.items():
+        if _is_json_media(media_type):
+            return {
+                "req_body_type": "json",
+                "req_body": _schema_text(resolver, media.get("schema")),
+            }
+    for media_type, media in content.items():
+        if _media_base(media_type) in _FORM_MEDIA_TYPES:
+            return {
+                "req_body_type": "form",
+                "req_body_form": _form_fields(resolver, media.get("schema")),
+            }
+    if content:
+        return {"req_body_type": "raw"}
+    return {}
+
+
+def _response_body(resolver: _RefResolver, operation: dict[str, Any]) -> dict[str, Any]:
+    # YAML 会把状态码解析为整数
+    responses = {str(code): value for code, value in (operation.get("responses") or {}).items()}
+    codes = [code for code in _PREFERRED_RESPONSES if code in responses]
+    codes += sorted(code for code in responses if code.startswith("2") and code not in codes)
+    codes += ["default"] if "default" in responses else []
+    for code in codes:
+        response = resolver.deref(responses[code]) or {}
+        if "schema" in response:
+            schema = response["schema"]
+        else:
+            content = response.get("content") or {}
+            schema = next(
+                (media.get("schema") for name, media in content.items() if _is_json_media(name)),
+                None,
+            )
+        if schema:
+            return {"res_body_type": "json", "res_body": _schema_text(resolver, schema)}
+    return {}
+
+
+def _convert(
+    resolver: _RefResolver,
+    method: str,
+    path: str,
+    path_item: dict[str, Any],
+    operation: dict[str, Any],
+) -> SpecOperation:
+    params = _parameters(resolver, path_item, operation)
+    payload: dict[str, Any] = {
+        "title": operation.get("summary") or operation.get("operationId") or f"{method} {path}",
+        "path": path,
+        "method": method,
+    }
+    description = operation.get("description")
+    if description:
+        payload["markdown"] = description
+
+    query, headers, path_params = [], [], []
+    for param in params:
+        required = "1" if param.get("required") else "0"
+        desc = param.get("description", "")
+        location = param.get("in")
+        if location == "query":
+            query.append(
+                {
+                    "name": param["name"],
+                    "required": required,
+                    "desc": desc,
+                    "example": _param_example(param),
+                }
+            )
+        elif location == "header":
+            headers.append(
+                {
+                    "name": param["name"],
+                    "value": _param_example(param),
+                    "required": required,
+                    "desc": desc,
+                }
+            )
+        elif location == "path":
+            path_params.append(
+                {"name": param["name"], "desc": desc, "example": _param_example(param)}
+            )
+    arrays = {"req_query": query, "req_headers": headers, "req_params": path_params}
+    payload.update({name: values for name, values in arrays.items() if values})
+
+    payload.update(_request_body(resolver, operation, params))
+    payload.update(_response_body(resolver, operation))
+    if payload.get("req_body"):
+        payload["req_body_is_json_schema"] = True
+    if payload.get("res_body"):
+        payload["res_body_is_json_schema"] = True
+
+    tags = operation.get("tags") or path_item.get("tags") or ()
+    return SpecOperation(method, path, str(tags[0]) if tags else None, payload)
+
+
+def operations_from_spec(document: dict[str, Any]) -> list[SpecOperation]:
+    """Convert every operation of a spec, in document order.
+
+    Raises:
+        ValueError: A ``$ref`` is external or points nowhere
+    """
+    resolver = _RefResolver(document)
+    operations = []
+    for path, raw_item in (document.get("paths") or {}).items():
+        path_item = resolver.deref(raw_item) or {}
+        for method in HTTP_METHODS:
+            operation = path_item.get(method)
+            if isinstance(operation, dict):
+                operations.append(
+                    _convert(resolver, method.upper(), str(path), path_item, operation)
+                )
+    return operations
+
+
+def _normalized_json(text: str | None) -> str:
+    if not text:
+        return ""
+    try:
+        return json.dumps(json.loads(text), sort_keys=True, ensure_ascii=False)
+    except ValueError:
+        return text.strip()
+
+
+def _normalized(fields: dict[str, Any]) -> dict[str, Any]:
+    normalized: dict[str, Any] = {
+        "catid": fields.get("catid"),
+        "title": fields.get("title") or "",
+        "markdown": (fields.get("markdown") or "").strip(),
+    }
+    for name in _JSON_FIELDS:
+        normalized[name] = _normalized_json(fields.get(name))
+    for name, keys in _ARRAY_KEYS.items():
+        normalized[name] = [
+            [_text(item.get(key)) for key in keys] for item in fields.get(name) or ()
+        ]
+    # YApi 总会给 body 类型一个默认值，仅在有请求/响应体时比较类型
+    has_req_body = normalized["req_body"] or normalized["req_body_form"]
+    normalized["req_body_type"] = (fields.get("req_body_type") or "") if has_req_body else ""
+    normalized["res_body_type"] = (
+        (fields.get("res_body_type") or "") if normalized["res_body"] else ""
+    )
+    return normalized
+
+
+def spec_fields(operation: SpecOperation, catid: int | None) -> dict[str, Any]:
+    """Comparable fields of a spec operation placed in category catid."""
+    return _normalized({**operation.payload, "catid": catid})
+
+
+def interface_fields(interface: YApiInterface) -> dict[str, Any]:
+    """Comparable fields of an interface stored in YApi."""
+    return _normalized(
+        {
+            "catid": interface.catid,
+            "title": interface.title,
+            "markdown": interface.markdown,
+            "req_body": interface.req_body_other,
+            "req_body_type": interface.req_body_type,
+            "req_body_form": interface.req_body_form,
+            "req_query": interface.req_query,
+            "req_headers": interface.req_headers,
+            "req_params": interface.req_params,
+            "res_body": interface.res_body,
+            "res_body_type": interface.res_body_type,
+        }
+    )
+
+
+def fingerprint(fields: dict[str, Any]) -> str:
+    """Content hash of comparable fields (see spec_fields / interface_fields)."""
+    raw = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def changed_fields(old: dict[str, Any], new: dict[str, Any]) -> list[str]:
+    """Names of comparable fields that differ, in ``COMPARED_FIELDS`` order."""
+    return [name for name in COMPARED_FIELDS if old.get(name) != new.get(name)]
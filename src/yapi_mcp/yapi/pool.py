@@ -0,0 +1,141 @@
+"""Per-login YApi clients for serving several users from one process.
+
+A shared HTTP deployment talks to YApi on behalf of whoever is calling, so the
+YApi login (``_yapi_token``/``_yapi_uid`` and the optional CAS cookie) travels
+with each request as ``Credentials``. ``ClientPool`` keeps one client per
+server and login, e.g. a ``YApiClient`` together with the caches filled through
+it, and closes clients that have not been used for ``idle_timeout`` seconds so
+departed users do not hold connections and memory forever.
+
+Data fetched with one login is never served to another: everything cached
+belongs to exactly one pooled client (except the projects a ``YApiCache``
+shares explicitly).
+"""
+
+import hashlib
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Generic, Protocol, TypeVar
+
+# 客户端闲置超过该秒数后关闭
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+@dataclass(frozen=True, slots=True)
+class Credentials:
+    """A YApi login: the server and the cookies identifying one user."""
+
+    server_url: str
+    token: str
+    uid: str
+    cas: str | None = None
+
+    @property
+    def cookies(self) -> dict[str, str]:
+        """Authentication cookies for YApiClient."""
+        cookies = {"_yapi_token": self.token, "_yapi_uid": self.uid}
+        if self.cas:
+            cookies["ZYBIPSCAS"] = self.cas
+        return cookies
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of the login, naming its partition of a shared cache backend."""
+        login = "\x00".join((self.server_url, self.token, self.uid, self.cas or ""))
+        return hashlib.sha256(login.encode()).hexdigest()
+
+
+class Closeable(Protocol):
+    """What ClientPool manages: anything holding resources released by ``close``."""
+
+    async def close(self) -> None: ...
+
+
+_C = TypeVar("_C", bound=Closeable)
+
+
+@dataclass(slots=True)
+class _PooledClient(Generic[_C]):
+    client: _C
+    last_used: float
+    in_use: int = 0
+
+
+class ClientPool(Generic[_C]):
+    """Clients reused per login and closed once idle."""
+
+    def __init__(
+        self,
+        factory: Callable[[Credentials], _C],
+        *,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        busy: Callable[[_C], bool] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a pool.
+
+        Args:
+            factory: Creates the client of a login
+            idle_timeout: Seconds an unused client stays open (0 closes it at the next acquire)
+            busy: Whether a client still has background work (e.g. queued writes)
+                and must be kept even though no call is using it
+            clock: Monotonic time source, injectable for tests
+        """
+        self._factory = factory
+        self.idle_timeout = idle_timeout
+        self._busy = busy
+        self._clock = clock
+        self._entries: dict[Credentials, _PooledClient[_C]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, credentials: Credentials) -> _C:
+        """Return the client of a login, creating it on first use."""
+        now = self._clock()
+        entry = self._entries.get(credentials)
+        if entry is None:
+            entry = self._entries[credentials] = _PooledClient(self._factory(credentials), now)
+        entry.last_used = now
+        return entry.client
+
+    @asynccontextmanager
+    async def acquire(self, credentials: Credentials) -> AsyncIterator[_C]:
+        """Yield the client of a login, keeping it open until the block exits."""
+        await self.evict_idle()
+        self.get(credentials)
+        entry = self._entries[credentials]
+        entry.in_use += 1
+        try:
+            yield entry.client
+        finally:
+            entry.in_use -= 1
+            entry.last_used = self._clock()
+
+    def _idle(self, entry: _PooledClient[_C], now: float) -> bool:
+        if entry.in_use or now - entry.last_used < self.idle_timeout:
+            return False
+        return self._busy is None or not self._busy(entry.client)
+
+    async def evict_idle(self) -> int:
+        """Close clients unused for ``idle_timeout`` seconds.
+
+        Returns:
+            Number of clients closed
+        """
+        now = self._clock()
+        idle = [
+            credentials for credentials, entry in self._entries.items() if self._idle(entry, now)
+        ]
+        for credentials in idle:
+            await self._entries.pop(credentials).client.close()
+        return len(idle)
+
+    async def close(self) -> None:
+        """Close every client (e.g. on shutdown)."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            await entry.client.close()
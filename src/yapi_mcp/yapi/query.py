@@ -0,0 +1,217 @@
+"""Field-scoped search query language for interface search.
+
+Syntax (terms are ANDed; comma-separated values inside one term are ORed)::
+
+    method:POST,PUT path:/order/* tag:payment status:undone cat:订单 退款
+
+- ``method:`` HTTP method (case-insensitive)
+- ``path:``   path glob when it contains ``*``/``?``, otherwise substring
+- ``tag:``    exact tag
+- ``status:`` ``undone`` or ``done``
+- ``cat:``    substring of the category name
+- anything else is a keyword matched like a plain search (title/path/category/desc)
+
+Values may be double-quoted to include spaces (``cat:"用户 管理"``). A query
+without any field term is treated as one plain keyword, exactly as before,
+quotes and apostrophes included.
+
+Queries are compiled once; field terms are evaluated as AND/OR over the
+per-snapshot bitmaps from ``ProjectSnapshot.bitmap``, so compound filters only
+touch the rows that survive them.
+
+Parsed queries are normalized (case-folded, value sets unordered) and hashable,
+so equivalent query strings share one entry in the search-result cache.
+"""
+
+import re
+import shlex
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .bitmap import bitmap_from_rows, rows_from_bitmap
+from .snapshot import METHODS, STATUSES, ProjectSnapshot
+
+QUERY_FIELDS = ("method", "path", "tag", "status", "cat")
+
+_FIELD_TERM = re.compile(rf"^({'|'.join(QUERY_FIELDS)}):(.*)$", re.IGNORECASE | re.DOTALL)
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a search query cannot be parsed."""
+
+
+@dataclass(frozen=True, slots=True)
+class SearchQuery:
+    """Compiled search query; build with ``SearchQuery.parse``."""
+
+    keywords: tuple[str, ...] = ()
+    methods: frozenset[str] = frozenset()
+    statuses: frozenset[str] = frozenset()
+    tags: frozenset[str] = frozenset()
+    categories: tuple[str, ...] = ()
+    path_patterns: tuple[re.Pattern[str], ...] = ()
+
+    @classmethod
+    def parse(cls, text: str) -> "SearchQuery":
+        """Parse and compile a query string.
+
+        Raises:
+            QuerySyntaxError: On unbalanced quotes, empty or invalid field values
+        """
+        if not any(_FIELD_TERM.match(token) for token in text.split()):
+            # 不含字段条件时保持原有语义：整个输入（含引号、撇号）作为一个关键词
+            return cls(keywords=(text.lower(),) if text else ())
+
+        try:
+            tokens = _split(text)
+        except ValueError as exc:
+            msg = f"搜索语句解析失败: {exc}。请检查双引号是否成对出现。"
+            raise QuerySyntaxError(msg) from exc
+
+        keywords: list[str] = []
+        methods: set[str] = set()
+        statuses: set[str] = set()
+        tags: set[str] = set()
+        categories: list[str] = []
+        path_patterns: list[re.Pattern[str]] = []
+
+        for token in tokens:
+            match = _FIELD_TERM.match(token)
+            if match is None:
+                keywords.append(token.lower())
+                continue
+            name = match.group(1).lower()
+            values = [value for value in match.group(2).split(",") if value]
+            if not values:
+                msg = f"搜索条件 {name}: 缺少取值，例如 {name}:{_FIELD_EXAMPLES[name]}"
+                raise QuerySyntaxError(msg)
+
+            if name == "method":
+                upper = {value.upper() for value in values}
+                invalid = upper - set(METHODS)
+                if invalid:
+                    msg = (
+                        f"搜索条件 method:{','.join(sorted(invalid))} 无效。"
+                        f"支持的 HTTP 方法为：{'、'.join(METHODS)}。"
+                    )
+                    raise QuerySyntaxError(msg)
+                methods |= upper
+            elif name == "status":
+                lower = {value.lower() for value in values}
+                invalid = lower - set(STATUSES)
+                if invalid:
+                    msg = (
+                        f"搜索条件 status:{','.join(sorted(invalid))} 无效。"
+                        "支持的值为：undone（未完成）、done（已完成）。"
+                    )
+                    raise QuerySyntaxError(msg)
+                statuses |= lower
+            elif name == "tag":
+                tags.update(value.lower() for value in values)
+            elif name == "cat":
+                categories.append(",".join(values).lower())
+            else:
+                path_patterns.append(_compile_path_values(values))
+
+        return cls(
+            keywords=tuple(keywords),
+            methods=frozenset(methods),
+            statuses=frozenset(statuses),
+            tags=frozenset(tags),
+            categories=tuple(categories),
+            path_patterns=tuple(path_patterns),
+        )
+
+    @property
+    def rank_keyword(self) -> str:
+        """Keyword used to rank hits (see ProjectSnapshot.score)."""
+        return self.keywords[0] if self.keywords else ""
+
+    def evaluate(self, snapshot: ProjectSnapshot, *, fuzzy: bool = False) -> list[int]:
+        """Return matching rows of a snapshot.
+
+        Rows come in list_menu order. With ``fuzzy`` the keywords are matched
+        typo-tolerantly against titles and paths (see fuzzy.TrigramIndex) and
+        rows come best match first; field terms still filter exactly.
+        """
+        mask = self._field_mask(snapshot)
+        if fuzzy and self.keywords:
+            if not mask:
+                return []
+            restrict = None if mask == (1 << len(snapshot)) - 1 else mask
+            return snapshot.trigram_index().search(" ".join(self.keywords), restrict)
+
+        for keyword in self.keywords:
+            if not mask:
+                break
+            if snapshot.count_occurrences(keyword) > mask.bit_count():
+                # 关键词命中行多于剩余候选行：逐行检查候选比全量扫描更快
+                mask = bitmap_from_rows(snapshot.search(keyword, rows_from_bitmap(mask)))
+            else:
+                mask &= bitmap_from_rows(snapshot.search(keyword))
+
+        return rows_from_bitmap(mask)
+
+    def _field_mask(self, snapshot: ProjectSnapshot) -> int:
+        mask = (1 << len(snapshot)) - 1
+        if self.methods:
+            mask &= _union(snapshot.bitmap("method", method) for method in self.methods)
+        if self.statuses:
+            mask &= _union(snapshot.bitmap("status", status) for status in self.statuses)
+        if self.tags:
+            mask &= _union(snapshot.bitmap("tag", tag) for tag in self.tags)
+        for pattern in self.path_patterns:
+            mask &= bitmap_from_rows(snapshot.search_paths(pattern))
+        for category in self.categories:
+            catids = [
+                catid for catid, name in snapshot.categories.items() if category in name.lower()
+            ]
+            mask &= _union(snapshot.bitmap("catid", catid) for catid in catids)
+        return mask
+
+
+_FIELD_EXAMPLES = {
+    "method": "POST",
+    "path": "/order/*",
+    "tag": "payment",
+    "status": "undone",
+    "cat": "订单",
+}
+
+
+def _split(text: str) -> list[str]:
+    """Split a query on whitespace; only double quotes group (``don't`` stays one word)."""
+    lexer = shlex.shlex(text, posix=True)
+    lexer.whitespace_split = True
+    lexer.quotes = '"'
+    lexer.commenters = ""
+    return list(lexer)
+
+
+def _compile_path_values(values: list[str]) -> re.Pattern[str]:
+    """Compile ORed path values into one regex over ProjectSnapshot path text.
+
+    Globs (``*``/``?``) must match the whole path; plain values match anywhere.
+    The path text is lowercased with every path framed by newlines (see
+    ``ProjectSnapshot.search_paths``); anchoring on a literal ``\\n`` rather than
+    ``^``/``$`` lets the regex engine jump straight to a literal glob prefix.
+    """
+    alternatives = []
+    for value in values:
+        lower = value.lower()
+        if "*" in lower or "?" in lower:
+            body = "".join(
+                "[^\\n]*" if char == "*" else "[^\\n]" if char == "?" else re.escape(char)
+                for char in lower
+            )
+            alternatives.append(f"\\n{body}(?=\\n)")
+        else:
+            alternatives.append(re.escape(lower))
+    return re.compile("|".join(alternatives))
+
+
+def _union(bitmaps: Iterable[int]) -> int:
+    result = 0
+    for bitmap in bitmaps:
+        result |= bitmap
+    return result
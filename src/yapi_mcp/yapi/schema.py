@@ -0,0 +1,55 @@
+"""Local JSON Schema checks for interface request/response bodies.
+
+YApi stores ``req_body_other`` / ``res_body`` as opaque strings, so a schema
+with a misspelled ``type`` or a non-object ``properties`` is accepted on write
+and only breaks later in the YApi UI and mock server. ``schema_errors`` checks
+such a string against its draft's meta-schema before it is sent.
+
+Meta-schema validators are compiled once per draft, and results are cached per
+schema text, so validating a batch that repeats the same schemas stays cheap.
+"""
+
+import json
+from functools import cache, lru_cache
+
+from jsonschema import Draft4Validator
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+
+# 按 schema 文本缓存的校验结果数
+SCHEMA_CACHE_SIZE = 1024
+# 每个 schema 最多报告的错误数
+MAX_SCHEMA_ERRORS = 5
+
+
+@cache
+def _meta_validator(cls: type[Validator]) -> Validator:
+    """Compiled validator of a draft's meta-schema (built once per draft)."""
+    meta_cls = validator_for(cls.META_SCHEMA, default=cls)
+    return meta_cls(cls.META_SCHEMA)
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def schema_errors(text: str) -> tuple[str, ...]:
+    """Check a JSON Schema string against its meta-schema.
+
+    The draft is taken from ``$schema``; YApi's schema editor writes draft-04,
+    which is also the default.
+
+    Args:
+        text: JSON Schema document as stored by YApi
+
+    Returns:
+        Up to ``MAX_SCHEMA_ERRORS`` problems as ``"<json path>: <message>"``,
+        empty when the schema is valid
+    """
+    try:
+        document = json.loads(text)
+    except ValueError as exc:
+        return (f"无法解析为 JSON: {exc}",)
+    if not isinstance(document, dict):
+        return ("JSON Schema 必须是 JSON 对象",)
+
+    cls = validator_for(document, default=Draft4Validator)
+    errors = sorted(_meta_validator(cls).iter_errors(document), key=lambda e: e.json_path)
+    return tuple(f"{error.json_path}: {error.message}" for error in errors[:MAX_SCHEMA_ERRORS])
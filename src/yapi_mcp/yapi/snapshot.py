@@ -0,0 +1,425 @@
+"""Compact columnar snapshot of a project's interface list.
+
+A project with tens of thousands of interfaces is cached for searching. Holding
+the list_menu dicts (or one pydantic model per interface) costs roughly a
+kilobyte per interface; ``ProjectSnapshot`` stores the same data as parallel
+arrays plus a single string table, which is an order of magnitude smaller and
+lets keyword search run as ``str.find`` over one lowercased buffer.
+"""
+
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from .bitmap import bitmap_from_rows
+from .fuzzy import TrigramIndex
+
+METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS")
+STATUSES = ("undone", "done")
+
+# 匹配得分：标题/路径完全一致 > 标题前缀 > 标题包含 > 路径后缀 > 路径包含 > 分类/描述
+SCORE_EXACT = 100
+SCORE_TITLE_PREFIX = 80
+SCORE_TITLE = 60
+SCORE_PATH_SUFFIX = 50
+SCORE_PATH = 40
+SCORE_OTHER = 10
+
+# 小写检索文本中的分隔符：行与行之间、标题与路径之间
+_ROW_SEP = "\x00"
+_FIELD_SEP = "\x01"
+
+BITMAP_COLUMNS = ("method", "status", "catid", "tag")
+
+
+class _CodeTable:
+    """Maps a small set of repeated strings (methods, statuses) to byte codes."""
+
+    __slots__ = ("_codes", "values")
+
+    def __init__(self, initial: Iterable[str]) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+        for value in initial:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int | None:
+        return self._codes.get(value)
+
+
+class ProjectSnapshot:
+    """Columnar view of all interfaces of one project.
+
+    Row ``r`` describes one interface: ``ids[r]``, ``catids[r]``, ``up_times[r]``,
+    ``method(r)``, ``status(r)``, ``title(r)``, ``path(r)`` and ``tags(r)``.
+    Heavy text fields (desc/markdown), when list_menu returns them at all, are
+    kept in a separate cold table that is only consulted by keyword search.
+
+    Snapshots are filled with ``append``/``add_category`` and then ``freeze``-d;
+    a frozen snapshot is treated as immutable and shared between tool calls.
+    """
+
+    __slots__ = (
+        "_bitmaps",
+        "_category_names",
+        "_cold_text",
+        "_lower",
+        "_lower_offsets",
+        "_lower_parts",
+        "_methods",
+        "_offsets",
+        "_parts",
+        "_path_index",
+        "_statuses",
+        "_tags",
+        "_text",
+        "_trigrams",
+        "categories",
+        "catids",
+        "fetched_at",
+        "ids",
+        "method_codes",
+        "project_id",
+        "status_codes",
+        "up_times",
+        "version",
+    )
+
+    def __init__(self, project_id: int) -> None:
+        """Create an empty snapshot for a project."""
+        self.project_id = project_id
+        self.version = 0
+        self.fetched_at = time.time()
+        self.categories: dict[int, str] = {}
+        self.ids = array("q")
+        self.catids = array("q")
+        self.up_times = array("q")
+        self.method_codes = bytearray()
+        self.status_codes = bytearray()
+        self._methods = _CodeTable(METHODS)
+        self._statuses = _CodeTable(("", *STATUSES))
+        # 字符串表：第 r 行标题为 _text[_offsets[2r]:_offsets[2r+1]]，路径紧随其后
+        self._text = ""
+        self._offsets = array("I", [0])
+        self._lower = ""
+        self._lower_offsets = array("I")
+        self._tags: dict[int, tuple[str, ...]] = {}
+        self._cold_text: dict[int, str] = {}
+        # 按需构建的派生索引：列取值 -> 行位图，小写路径文本（每行一个路径）
+        self._bitmaps: dict[str, dict[Any, int]] = {}
+        self._path_index: tuple[str, array] | None = None
+        self._category_names: dict[str, list[int]] | None = None
+        self._trigrams: TrigramIndex | None = None
+        # 构建期暂存的字符串片段，freeze 后释放
+        self._parts: list[str] = []
+        self._lower_parts: list[str] = []
+
+    def add_category(self, catid: int, name: str) -> None:
+        """Register a category (including categories without interfaces)."""
+        self.categories[catid] = name
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Append one flattened list_menu record (see YApiClient.iter_list_menu)."""
+        row = len(self.ids)
+        title = record.get("title") or ""
+        path = record.get("path") or ""
+        catid = int(record.get("catid") or 0)
+
+        self.ids.append(int(record["_id"]))
+        self.catids.append(catid)
+        self.up_times.append(int(record.get("up_time") or 0))
+        self.method_codes.append(self._methods.code(str(record.get("method", "")).upper()))
+        self.status_codes.append(self._statuses.code(record.get("status") or ""))
+        if catid not in self.categories and record.get("_cat_name"):
+            self.categories[catid] = record["_cat_name"]
+
+        self._parts.append(title)
+        self._parts.append(path)
+        text_end = self._offsets[-1]
+        self._offsets.append(text_end + len(title))
+        self._offsets.append(text_end + len(title) + len(path))
+
+        lower = f"{title.lower()}{_FIELD_SEP}{path.lower()}{_ROW_SEP}"
+        self._lower_offsets.append(
+            self._lower_offsets[-1] + len(self._lower_parts[-1]) if self._lower_parts else 0
+        )
+        self._lower_parts.append(lower)
+
+        tags = record.get("tag")
+        if tags:
+            self._tags[row] = tuple(sys.intern(str(tag)) for tag in tags)
+
+        cold = " ".join(text for text in (record.get("desc"), record.get("markdown")) if text)
+        if cold:
+            self._cold_text[row] = cold.lower()
+
+    def extend(self, records: Iterable[dict[str, Any]]) -> "ProjectSnapshot":
+        """Append several records; returns self for chaining."""
+        for record in records:
+            self.append(record)
+        return self
+
+    def freeze(self) -> "ProjectSnapshot":
+        """Join the string tables and release build buffers; returns self."""
+        self._text = "".join(self._parts)
+        self._lower = "".join(self._lower_parts)
+        self._parts = []
+        self._lower_parts = []
+        self.fetched_at = time.time()
+        return self
+
+    def export(self) -> dict[str, Any]:
+        """Return the categories and rows as plain JSON-compatible data (see ``restore``)."""
+        records = []
+        for row in range(len(self)):
+            record = self.record(row)
+            if row in self._cold_text:
+                record["desc"] = self._cold_text[row]
+            records.append(record)
+        return {"categories": list(self.categories.items()), "records": records}
+
+    @classmethod
+    def restore(cls, project_id: int, data: dict[str, Any], fetched_at: float) -> "ProjectSnapshot":
+        """Rebuild a frozen snapshot from ``export`` data fetched at ``fetched_at``."""
+        snapshot = cls(project_id)
+        for catid, name in data["categories"]:
+            snapshot.add_category(int(catid), name)
+        snapshot.extend(data["records"]).freeze()
+        snapshot.fetched_at = fetched_at
+        return snapshot
+
+    def same_rows(self, other: "ProjectSnapshot") -> bool:
+        """Whether other lists the same categories and interfaces, e.g. an unchanged re-fetch.
+
+        Rows are compared by their columns; YApi bumps ``up_time`` on every edit of
+        an interface, so titles, paths and tags need not be compared one by one.
+        """
+        return (
+            self.ids == other.ids
+            and self.up_times == other.up_times
+            and self.catids == other.catids
+            and self.method_codes == other.method_codes
+            and self.status_codes == other.status_codes
+            and self.categories == other.categories
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def title(self, row: int) -> str:
+        return self._text[self._offsets[2 * row] : self._offsets[2 * row + 1]]
+
+    def path(self, row: int) -> str:
+        return self._text[self._offsets[2 * row + 1] : self._offsets[2 * row + 2]]
+
+    def method(self, row: int) -> str:
+        return self._methods.values[self.method_codes[row]]
+
+    def status(self, row: int) -> str:
+        return self._statuses.values[self.status_codes[row]]
+
+    def tags(self, row: int) -> tuple[str, ...]:
+        return self._tags.get(row, ())
+
+    def summary(self, row: int) -> dict[str, Any]:
+        """Return the search-result fields of a row, keyed like the YApi API."""
+        return {
+            "_id": self.ids[row],
+            "title": self.title(row),
+            "path": self.path(row),
+            "method": self.method(row),
+        }
+
+    def record(self, row: int) -> dict[str, Any]:
+        """Return every column of a row: the summary fields plus catid, status, tag and up_time."""
+        return {
+            **self.summary(row),
+            "catid": self.catids[row],
+            "status": self.status(row),
+            "tag": list(self.tags(row)),
+            "up_time": self.up_times[row],
+        }
+
+    def search(self, keyword: str, candidates: Sequence[int] | None = None) -> list[int]:
+        """Return rows whose title, path, category name or description contain keyword.
+
+        Matching is case-insensitive; rows are returned in list_menu order. When
+        ``candidates`` is given only those rows are checked, one by one, instead
+        of scanning the whole project.
+        """
+        if not keyword:
+            return list(range(len(self))) if candidates is None else list(candidates)
+
+        needle = keyword.lower()
+        matched_catids = {
+            catid for catid, name in self.categories.items() if needle in name.lower()
+        }
+        text = self._lower
+        offsets = self._lower_offsets
+
+        if candidates is not None:
+            return [
+                row
+                for row in candidates
+                if needle in text[offsets[row] : self._lower_end(row)]
+                or self.catids[row] in matched_catids
+                or needle in self._cold_text.get(row, "")
+            ]
+
+        rows: set[int] = set()
+        position = text.find(needle)
+        while position != -1:
+            row = bisect_right(offsets, position) - 1
+            rows.add(row)
+            next_row = row + 1
+            if next_row >= len(offsets):
+                break
+            position = text.find(needle, offsets[next_row])
+
+        if matched_catids:
+            rows.update(row for row, catid in enumerate(self.catids) if catid in matched_catids)
+
+        rows.update(row for row, cold in self._cold_text.items() if needle in cold)
+        return sorted(rows)
+
+    def count_occurrences(self, keyword: str) -> int:
+        """Cheap upper-bound estimate of title/path hits for keyword (C-level count)."""
+        return self._lower.count(keyword.lower()) if keyword else len(self)
+
+    def _lower_end(self, row: int) -> int:
+        next_row = row + 1
+        return (
+            self._lower_offsets[next_row]
+            if next_row < len(self._lower_offsets)
+            else len(self._lower)
+        )
+
+    def score(self, row: int, keyword: str) -> int:
+        """Rank how well a row returned by ``search(keyword)`` matches keyword."""
+        needle = keyword.lower()
+        if not needle:
+            return 0
+        title = self.title(row).lower()
+        path = self.path(row).lower()
+        if needle in (title, path):
+            return SCORE_EXACT
+        if needle in title:
+            return SCORE_TITLE_PREFIX if title.startswith(needle) else SCORE_TITLE
+        if needle in path:
+            return SCORE_PATH_SUFFIX if path.endswith(needle) else SCORE_PATH
+        return SCORE_OTHER
+
+    def bitmap(self, column: str, value: object) -> int:
+        """Return the int bitset of rows whose ``column`` equals ``value``.
+
+        Columns: "method" (upper case), "status", "catid" and "tag" (lower case).
+        Bitmaps for a column are built in one pass on first use and memoized.
+        """
+        bitmaps = self._bitmaps.get(column)
+        if bitmaps is None:
+            bitmaps = self._bitmaps[column] = self._build_bitmaps(column)
+        return bitmaps.get(value, 0)
+
+    def _build_bitmaps(self, column: str) -> dict[Any, int]:
+        rows: dict[Any, list[int]] = {}
+        if column == "method":
+            for row, code in enumerate(self.method_codes):
+                rows.setdefault(self._methods.values[code], []).append(row)
+        elif column == "status":
+            for row, code in enumerate(self.status_codes):
+                rows.setdefault(self._statuses.values[code], []).append(row)
+        elif column == "catid":
+            for row, catid in enumerate(self.catids):
+                rows.setdefault(catid, []).append(row)
+        elif column == "tag":
+            for row, tags in self._tags.items():
+                for tag in tags:
+                    rows.setdefault(tag.lower(), []).append(row)
+        else:
+            msg = f"Unknown bitmap column: {column}"
+            raise KeyError(msg)
+        return {value: bitmap_from_rows(value_rows) for value, value_rows in rows.items()}
+
+    def category_counts(self) -> dict[int, int]:
+        """Return interface counts per category, empty categories included.
+
+        Categories appear in list_menu order; counts come from the memoized
+        "catid" bitmaps, so repeated calls cost one popcount per category.
+        """
+        self.bitmap("catid", 0)
+        counts = dict.fromkeys(self.categories, 0)
+        for catid, bitmap in self._bitmaps["catid"].items():
+            counts[catid] = bitmap.bit_count()
+        return counts
+
+    def category_ids(self, name: str) -> list[int]:
+        """Return IDs of categories named ``name`` (case-insensitive).
+
+        Falls back to categories whose name contains ``name`` when none is
+        named exactly that. The name index is built on first use.
+        """
+        if self._category_names is None:
+            self._category_names = {}
+            for catid, category_name in self.categories.items():
+                self._category_names.setdefault(category_name.strip().lower(), []).append(catid)
+        needle = name.strip().lower()
+        exact = self._category_names.get(needle)
+        if exact:
+            return list(exact)
+        return [
+            catid
+            for category_name, catids in self._category_names.items()
+            if needle in category_name
+            for catid in catids
+        ]
+
+    def trigram_index(self) -> TrigramIndex:
+        """Return the trigram index over titles and paths, built on first use."""
+        if self._trigrams is None:
+            self._trigrams = TrigramIndex(len(self), self._lower_fields)
+        return self._trigrams
+
+    def _lower_fields(self, row: int) -> tuple[str, str]:
+        # 去掉行尾的 _ROW_SEP 后按 _FIELD_SEP 拆分
+        text = self._lower[self._lower_offsets[row] : self._lower_end(row) - 1]
+        title, _sep, path = text.partition(_FIELD_SEP)
+        return title, path
+
+    def search_paths(self, pattern: re.Pattern[str]) -> list[int]:
+        """Return rows whose lowercased path matches ``pattern``.
+
+        The searched text is ``"\\n" + "\\n".join(paths) + "\\n"``: every path is
+        framed by newlines, which the pattern may use as anchors.
+        """
+        if not len(self):
+            return []
+        if self._path_index is None:
+            offsets = array("I")
+            parts = []
+            position = 0
+            for row in range(len(self)):
+                path = self.path(row).lower()
+                offsets.append(position)
+                parts.append(path)
+                position += len(path) + 1
+            self._path_index = ("\n" + "\n".join(parts) + "\n", offsets)
+
+        text, offsets = self._path_index
+        rows: list[int] = []
+        for match in pattern.finditer(text):
+            row = bisect_right(offsets, match.start()) - 1
+            if not rows or rows[-1] != row:
+                rows.append(row)
+        return rows
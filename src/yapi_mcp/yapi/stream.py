@@ -0,0 +1,252 @@
+"""Incremental JSON scanning for large YApi responses.
+
+YApi returns whole projects in a single JSON document (list_menu, export). Decoding
+such a body with ``response.json()`` keeps the raw bytes, the full dict tree and any
+derived objects alive at the same time. ``JSONStreamParser`` instead consumes the
+body chunk by chunk and emits only the values the caller asked for, so peak memory
+is bounded by the largest single item rather than by the whole project.
+"""
+
+import json
+import re
+from collections.abc import Collection
+from typing import Any
+
+# Path patterns are tuples of object keys, with "*" standing for any array index.
+# e.g. ("data", "*", "list", "*") matches every interface of a list_menu response.
+JSONPath = tuple[str, ...]
+
+EVENT_VALUE = "value"
+EVENT_END = "end"
+
+Event = tuple[str, JSONPath, Any]
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+_LITERAL = re.compile(rb'[^ \t\r\n{}\[\],:"]+')
+# 捕获模式下一次跳过所有非括号内容（含完整字符串），停在下一个括号或未闭合的引号处
+_CAPTURE_SKIP = re.compile(rb'(?:[^"{}\[\]]++|"(?:[^"\\]++|\\.)*+")*+', re.DOTALL)
+
+_OPEN = frozenset(b"{[")
+_CLOSE = frozenset(b"}]")
+_QUOTE = ord('"')
+_COMMA = ord(",")
+_COLON = ord(":")
+_LBRACE = ord("{")
+
+
+class JSONStreamError(Exception):
+    """Base of the errors raised for a malformed YApi response.
+
+    Deliberately not a ValueError: callers treat those as invalid user input,
+    while a broken response body is a server-side failure.
+    """
+
+
+class IncompleteJSONError(JSONStreamError):
+    """Raised when a stream ends before the JSON document is complete."""
+
+    def __init__(self) -> None:
+        super().__init__("JSON 响应不完整: 数据流在文档结束前中断")
+
+
+class MalformedJSONError(JSONStreamError):
+    """Raised when a stream contains something that is not valid JSON."""
+
+
+class _Frame:
+    __slots__ = ("expect_key", "is_object", "key")
+
+    def __init__(self, *, is_object: bool) -> None:
+        self.is_object = is_object
+        self.key = "*"
+        self.expect_key = is_object
+
+
+class JSONStreamParser:
+    """Push parser that extracts selected values from a JSON byte stream.
+
+    - Containers whose path matches ``item_paths`` are decoded as a whole and
+      emitted as ``("value", path, obj)``; their contents are not scanned further.
+    - Scalars whose path matches ``scalar_paths`` are emitted as ``("value", path, v)``.
+    - Containers whose path matches ``end_paths`` emit ``("end", path, None)``
+      when they close.
+
+    Everything else is skipped without being materialised.
+    """
+
+    def __init__(
+        self,
+        item_paths: Collection[JSONPath],
+        scalar_paths: Collection[JSONPath] = (),
+        end_paths: Collection[JSONPath] = (),
+    ) -> None:
+        """Initialize parser.
+
+        Args:
+            item_paths: Paths of containers to decode and emit whole
+            scalar_paths: Paths of scalar values to emit
+            end_paths: Paths of containers whose end should be reported
+        """
+        self._item_paths = frozenset(item_paths)
+        self._scalar_paths = frozenset(scalar_paths)
+        self._end_paths = frozenset(end_paths)
+        self._buf = bytearray()
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._done = False
+        # 捕获模式：当前正在收集的整体 item 的起始偏移与嵌套深度
+        self._capture_start = -1
+        self._capture_depth = 0
+        self._capture_path: JSONPath = ()
+
+    def feed(self, chunk: bytes) -> list[Event]:
+        """Consume a chunk of bytes and return the events it completed.
+
+        Raises:
+            MalformedJSONError: If the bytes so far are not valid JSON
+        """
+        self._buf += chunk
+        events: list[Event] = []
+        self._checked_scan(events, final=False)
+        return events
+
+    def close(self) -> list[Event]:
+        """Signal end of stream and return any remaining events.
+
+        Raises:
+            IncompleteJSONError: If the document was truncated
+            MalformedJSONError: If the remaining bytes are not valid JSON
+        """
+        events: list[Event] = []
+        self._checked_scan(events, final=True)
+        if not self._done:
+            raise IncompleteJSONError
+        return events
+
+    def _value_path(self) -> JSONPath:
+        return tuple(frame.key for frame in self._stack)
+
+    def _compact(self) -> None:
+        keep_from = self._capture_start if self._capture_start >= 0 else self._pos
+        if keep_from:
+            del self._buf[:keep_from]
+            self._pos -= keep_from
+            self._capture_start = min(self._capture_start, 0)
+
+    def _checked_scan(self, events: list[Event], *, final: bool) -> None:
+        try:
+            self._scan(events, final=final)
+        except json.JSONDecodeError as exc:
+            msg = f"JSON 响应格式错误: {exc}"
+            raise MalformedJSONError(msg) from exc
+
+    def _scan(self, events: list[Event], *, final: bool) -> None:
+        buf = self._buf
+        while True:
+            if self._capture_start >= 0:
+                if not self._scan_capture(events):
+                    break
+                continue
+
+            self._pos = _WHITESPACE.match(buf, self._pos).end()
+            if self._pos >= len(buf):
+                break
+            if self._done:
+                # 文档结束后的多余内容直接忽略
+                self._pos = len(buf)
+                break
+
+            char = buf[self._pos]
+            if char in _OPEN:
+                self._open_container(char)
+            elif char in _CLOSE:
+                self._close_container(events)
+            elif char in (_COMMA, _COLON):
+                self._read_separator(char)
+            elif char == _QUOTE:
+                if not self._read_string(events):
+                    break
+            elif not self._read_literal(events, final=final):
+                break
+        self._compact()
+
+    def _open_container(self, char: int) -> None:
+        path = self._value_path()
+        if path in self._item_paths:
+            self._capture_start = self._pos
+            self._capture_depth = 0
+            self._capture_path = path
+            return
+        self._pos += 1
+        self._stack.append(_Frame(is_object=char == _LBRACE))
+
+    def _close_container(self, events: list[Event]) -> None:
+        self._pos += 1
+        path = self._value_path()
+        self._stack.pop()
+        if path[:-1] in self._end_paths:
+            events.append((EVENT_END, path[:-1], None))
+        if not self._stack:
+            self._done = True
+
+    def _read_separator(self, char: int) -> None:
+        self._pos += 1
+        if self._stack:
+            # 对象中逗号之后是键，冒号之后是值
+            frame = self._stack[-1]
+            frame.expect_key = char == _COMMA and frame.is_object
+
+    def _read_string(self, events: list[Event]) -> bool:
+        match = _STRING_TAIL.match(self._buf, self._pos + 1)
+        if match is None:
+            return False
+        raw = bytes(self._buf[self._pos : match.end()])
+        self._pos = match.end()
+        frame = self._stack[-1] if self._stack else None
+        if frame is not None and frame.is_object and frame.expect_key:
+            frame.key = json.loads(raw)
+            return True
+        self._emit_scalar(raw, events)
+        return True
+
+    def _read_literal(self, events: list[Event], *, final: bool) -> bool:
+        match = _LITERAL.match(self._buf, self._pos)
+        if match is None:
+            msg = f"JSON 响应格式错误: 位置 {self._pos} 处出现意外字符"
+            raise MalformedJSONError(msg)
+        if match.end() == len(self._buf) and not final:
+            # 数字可能被切分在两个 chunk 之间，等待更多数据
+            return False
+        raw = bytes(self._buf[self._pos : match.end()])
+        self._pos = match.end()
+        self._emit_scalar(raw, events)
+        return True
+
+    def _emit_scalar(self, raw: bytes, events: list[Event]) -> None:
+        if not self._stack:
+            self._done = True
+        path = self._value_path()
+        if path in self._scalar_paths:
+            events.append((EVENT_VALUE, path, json.loads(raw)))
+
+    def _scan_capture(self, events: list[Event]) -> bool:
+        buf = self._buf
+        while True:
+            self._pos = _CAPTURE_SKIP.match(buf, self._pos).end()
+            if self._pos >= len(buf) or buf[self._pos] == _QUOTE:
+                # 数据不足或字符串未闭合，等待下一个 chunk
+                return False
+            char = buf[self._pos]
+            self._pos += 1
+            if char in _OPEN:
+                self._capture_depth += 1
+                continue
+            self._capture_depth -= 1
+            if self._capture_depth == 0:
+                value = json.loads(bytes(buf[self._capture_start : self._pos]))
+                events.append((EVENT_VALUE, self._capture_path, value))
+                self._capture_start = -1
+                if not self._stack:
+                    self._done = True
+                return True
@@ -0,0 +1,204 @@
+"""Adaptive polling of project interface lists for change notifications.
+
+YApi has no push channel, so a client holding an interface definition only
+learns that it changed by reading it again. ``ProjectWatcher`` polls the
+list_menu snapshot of every watched project and compares each interface's
+``up_time`` with the previous snapshot (two integer columns, no detail
+requests). Changes are reported to a callback, which refreshes the caches and
+notifies subscribers.
+
+The poll interval adapts per project: it drops to ``min_interval`` after a
+change and doubles after every quiet (or failed) poll up to ``max_interval``.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+
+from .snapshot import ProjectSnapshot
+
+DEFAULT_MIN_INTERVAL = 10.0
+DEFAULT_MAX_INTERVAL = 300.0
+# 每次无变化的轮询后间隔乘以该系数
+BACKOFF_FACTOR = 2.0
+
+
+@dataclass(slots=True)
+class SnapshotChanges:
+    """Interfaces that differ between two snapshots of a project.
+
+    Attributes:
+        added: IDs only in the new snapshot
+        removed: IDs only in the old snapshot
+        modified: IDs in both whose ``up_time`` changed
+    """
+
+    added: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+    modified: list[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    @property
+    def interface_ids(self) -> list[int]:
+        """Every changed interface ID."""
+        return [*self.added, *self.removed, *self.modified]
+
+
+def diff_snapshots(old: ProjectSnapshot, new: ProjectSnapshot) -> SnapshotChanges:
+    """Compare two snapshots of a project by interface ID and ``up_time``."""
+    before = dict(zip(old.ids, old.up_times, strict=True))
+    changes = SnapshotChanges()
+    for interface_id, up_time in zip(new.ids, new.up_times, strict=True):
+        previous = before.pop(interface_id, None)
+        if previous is None:
+            changes.added.append(interface_id)
+        elif previous != up_time:
+            changes.modified.append(interface_id)
+    changes.removed.extend(before)
+    return changes
+
+
+FetchFunc = Callable[[int], Awaitable[ProjectSnapshot]]
+ChangeFunc = Callable[[int, SnapshotChanges, frozenset[Hashable]], Awaitable[None]]
+ErrorFunc = Callable[[int, Exception], None]
+
+
+@dataclass(slots=True)
+class _WatchedProject:
+    interval: float
+    due: float
+    subscribers: set[Hashable] = field(default_factory=set)
+    snapshot: ProjectSnapshot | None = None
+
+
+class ProjectWatcher:
+    """Polls watched projects on adaptive intervals and reports changes."""
+
+    def __init__(
+        self,
+        fetch: FetchFunc,
+        on_change: ChangeFunc,
+        *,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        initial: Callable[[int], ProjectSnapshot | None] | None = None,
+        on_error: ErrorFunc | None = None,
+    ) -> None:
+        """Create a watcher.
+
+        Args:
+            fetch: Fetches a fresh snapshot, e.g. ``get_project_snapshot(refresh=True)``
+            on_change: Called with the project ID, its changes and its subscribers
+            min_interval: Poll interval (seconds) right after a change
+            max_interval: Longest poll interval for an idle project
+            initial: Returns an already cached snapshot to diff the first poll against
+            on_error: Called when a background poll fails (the project stays watched)
+        """
+        self._fetch = fetch
+        self._on_change = on_change
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self._initial = initial
+        self._on_error = on_error
+        self._projects: dict[int, _WatchedProject] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def projects(self) -> list[int]:
+        """IDs of the projects being watched."""
+        return list(self._projects)
+
+    def interval(self, project_id: int) -> float | None:
+        """Current poll interval of a project, None when not watched."""
+        watched = self._projects.get(project_id)
+        return watched.interval if watched is not None else None
+
+    def watch(self, project_id: int, subscriber: Hashable) -> None:
+        """Start watching a project for subscriber (starting the poll loop if needed)."""
+        watched = self._projects.get(project_id)
+        if watched is None:
+            snapshot = self._initial(project_id) if self._initial is not None else None
+            # 没有可比较的快照时立即轮询一次作为基线
+            due = asyncio.get_running_loop().time()
+            if snapshot is not None:
+                due += self.min_interval
+            watched = _WatchedProject(self.min_interval, due, snapshot=snapshot)
+            self._projects[project_id] = watched
+            self._wakeup.set()
+        watched.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def unwatch(self, project_id: int, subscriber: Hashable) -> None:
+        """Stop watching a project for subscriber; the project is dropped with its last one."""
+        watched = self._projects.get(project_id)
+        if watched is None:
+            return
+        watched.subscribers.discard(subscriber)
+        if not watched.subscribers:
+            del self._projects[project_id]
+
+    def forget(self, subscriber: Hashable) -> None:
+        """Drop a subscriber from every project (e.g. when its session closed)."""
+        for project_id in list(self._projects):
+            self.unwatch(project_id, subscriber)
+
+    async def poll(self, project_id: int) -> SnapshotChanges:
+        """Poll one project now, report any changes and adapt its interval.
+
+        Returns:
+            Changes since the previous poll (empty on the first one without a
+            cached snapshot to compare against)
+        """
+        watched = self._projects.get(project_id)
+        if watched is None:
+            return SnapshotChanges()
+        loop = asyncio.get_running_loop()
+        try:
+            snapshot = await self._fetch(project_id)
+        except Exception:
+            watched.interval = min(watched.interval * BACKOFF_FACTOR, self.max_interval)
+            watched.due = loop.time() + watched.interval
+            raise
+
+        previous, watched.snapshot = watched.snapshot, snapshot
+        changes = diff_snapshots(previous, snapshot) if previous is not None else SnapshotChanges()
+        if changes:
+            watched.interval = self.min_interval
+        else:
+            watched.interval = min(watched.interval * BACKOFF_FACTOR, self.max_interval)
+        watched.due = loop.time() + watched.interval
+        if changes:
+            await self._on_change(project_id, changes, frozenset(watched.subscribers))
+        return changes
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._projects:
+            now = loop.time()
+            due = [pid for pid, watched in self._projects.items() if watched.due <= now]
+            for project_id in due:
+                try:
+                    await self.poll(project_id)
+                except Exception as exc:
+                    if self._on_error is not None:
+                        self._on_error(project_id, exc)
+            if not self._projects:
+                break
+            delay = min(watched.due for watched in self._projects.values()) - loop.time()
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), max(delay, 0))
+
+    async def stop(self) -> None:
+        """Stop polling and forget every watched project."""
+        self._projects.clear()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
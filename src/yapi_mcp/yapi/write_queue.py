@@ -0,0 +1,138 @@
+"""Coalescing write-behind queue for interface updates.
+
+Agents iterating on a definition often send several updates to the same
+interface within seconds; each one is a read-before-write plus
+``/interface/up`` and may notify the whole team. ``UpdateCoalescer`` holds
+updates for a short debounce window, merges the patches queued for an interface
+(last writer wins per field) and sends one upstream update whose result is
+delivered to every caller that contributed to it.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+# 连续提交时窗口会顺延，但从首个补丁起最多等待 delay 的这么多倍
+MAX_DELAY_FACTOR = 5
+
+# 冲突检查以最早一次调用看到的版本为准，不被后来的补丁覆盖
+_FIRST_WINS = frozenset({"expected_up_time"})
+
+UpdateFunc = Callable[[int, dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+@dataclass(slots=True)
+class _PendingUpdate:
+    first_at: float
+    patch: dict[str, Any] = field(default_factory=dict)
+    waiters: list[asyncio.Future[dict[str, Any]]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class UpdateCoalescer:
+    """Debounces and merges updates per interface before sending them.
+
+    Batches of the same interface are sent strictly in order: a batch starts
+    only after the previous one for that interface has finished.
+    """
+
+    def __init__(self, update: UpdateFunc, delay: float) -> None:
+        """Create a queue.
+
+        Args:
+            update: Sends one merged patch, e.g. ``YApiClient.update_interface``
+            delay: Debounce window in seconds
+        """
+        self._update = update
+        self.delay = delay
+        self._pending: dict[int, _PendingUpdate] = {}
+        self._inflight: dict[int, asyncio.Task[None]] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of interfaces with queued, unsent updates."""
+        return len(self._pending)
+
+    @property
+    def inflight(self) -> int:
+        """Number of interfaces whose merged update is being sent."""
+        return len(self._inflight)
+
+    def submit(self, interface_id: int, patch: dict[str, Any]) -> asyncio.Future[dict[str, Any]]:
+        """Queue a patch and return a future for the merged update's result.
+
+        Args:
+            interface_id: Interface to update
+            patch: ``update_interface`` keyword arguments; None values are ignored
+
+        Returns:
+            Future resolved with the update result plus ``merged_updates`` (the
+            number of patches sent together), or with the update's exception
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        pending = self._pending.get(interface_id)
+        if pending is None:
+            pending = self._pending[interface_id] = _PendingUpdate(now)
+        elif pending.timer is not None:
+            pending.timer.cancel()
+
+        for key, value in patch.items():
+            if value is None or (key in _FIRST_WINS and key in pending.patch):
+                continue
+            pending.patch[key] = value
+
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
+        pending.waiters.append(future)
+        deadline = min(now + self.delay, pending.first_at + self.delay * MAX_DELAY_FACTOR)
+        pending.timer = loop.call_at(deadline, self._start, interface_id)
+        return future
+
+    def _start(self, interface_id: int) -> asyncio.Task[None] | None:
+        pending = self._pending.pop(interface_id, None)
+        if pending is None:
+            return self._inflight.get(interface_id)
+        if pending.timer is not None:
+            pending.timer.cancel()
+        previous = self._inflight.get(interface_id)
+        task = asyncio.get_running_loop().create_task(self._send(interface_id, pending, previous))
+        self._inflight[interface_id] = task
+        task.add_done_callback(lambda done: self._forget(interface_id, done))
+        return task
+
+    def _forget(self, interface_id: int, task: asyncio.Task[None]) -> None:
+        if self._inflight.get(interface_id) is task:
+            del self._inflight[interface_id]
+
+    async def _send(
+        self, interface_id: int, pending: _PendingUpdate, previous: asyncio.Task[None] | None
+    ) -> None:
+        if previous is not None:
+            # 上一批的异常已交给它自己的调用方
+            with contextlib.suppress(Exception):
+                await previous
+        try:
+            result = await self._update(interface_id, pending.patch)
+        except Exception as exc:
+            for waiter in pending.waiters:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            return
+        merged = {**result, "merged_updates": len(pending.waiters)}
+        for waiter in pending.waiters:
+            if not waiter.done():
+                waiter.set_result(merged)
+
+    async def flush(self, interface_id: int | None = None) -> None:
+        """Send queued updates now and wait until they finish.
+
+        Args:
+            interface_id: Only flush this interface (default: all, e.g. on shutdown)
+        """
+        ids = list(self._pending) if interface_id is None else [interface_id]
+        tasks = [task for task in map(self._start, ids) if task is not None]
+        if interface_id is None:
+            tasks.extend(self._inflight.values())
+        await asyncio.gather(*tasks, return_exceptions=True)
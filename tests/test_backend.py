@@ -0,0 +1,132 @@
+"""Tests for the cache backend shared by worker processes."""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+from conftest import make_cookies
+
+from yapi_mcp.yapi.backend import SQLiteCacheBackend
+from yapi_mcp.yapi.cache import YApiCache
+from yapi_mcp.yapi.client import YApiClient
+from yapi_mcp.yapi.models import YApiInterface
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+
+BASE_URL = "https://yapi.example.com"
+PROJECT_ID = 1
+INTERFACE_ID = 101
+LEASE_TTL = 30.0
+WORKERS = 3
+
+
+def _interface(title: str = "用户登录") -> YApiInterface:
+    return YApiInterface(
+        _id=INTERFACE_ID,
+        catid=10,
+        title=title,
+        path="/api/login",
+        method="POST",
+        project_id=PROJECT_ID,
+    )
+
+
+def _worker(path: Path) -> YApiCache:
+    """A cache as a separate worker process would open it: its own connection."""
+    return YApiCache(backend=SQLiteCacheBackend(path), scope="login")
+
+
+def test_entries_written_by_one_worker_are_read_by_another(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    first, second = _worker(path), _worker(path)
+    other_login = YApiCache(backend=SQLiteCacheBackend(path), scope="other")
+
+    first.put_interface(_interface())
+    snapshot = ProjectSnapshot(PROJECT_ID)
+    snapshot.add_category(10, "用户管理")
+    snapshot.append({"_id": INTERFACE_ID, "catid": 10, "title": "用户登录", "path": "/api/login"})
+    first.put_snapshot(snapshot.freeze())
+
+    interface = second.get_interface(INTERFACE_ID)
+    assert interface is not None
+    assert interface.title == "用户登录"
+    restored = second.get_snapshot(PROJECT_ID)
+    assert restored is not None
+    assert restored.ids.tolist() == [INTERFACE_ID]
+    assert restored.categories == {10: "用户管理"}
+    # 其他登录的分区读不到
+    assert other_login.get_interface(INTERFACE_ID) is None
+    assert other_login.get_snapshot(PROJECT_ID) is None
+
+
+def test_invalidations_reach_other_workers(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    first, second = _worker(path), _worker(path)
+    first.put_interface(_interface())
+    assert second.get_interface(INTERFACE_ID) is not None
+    seen: list[tuple[int, YApiInterface | None]] = []
+    second.subscribe(lambda interface_id, interface: seen.append((interface_id, interface)))
+
+    first.invalidate_interface(INTERFACE_ID)
+
+    assert second.get_interface(INTERFACE_ID) is None
+    assert seen == [(INTERFACE_ID, None)]
+
+    second.put_interface(_interface("新标题"))
+    first.drop_project(PROJECT_ID)
+    assert second.peek_interface(INTERFACE_ID) is None
+
+
+def test_refresh_lease_is_exclusive_until_released_or_expired(tmp_path: Path) -> None:
+    now = [0.0]
+    backend = SQLiteCacheBackend(tmp_path / "cache.db", clock=lambda: now[0])
+    other = SQLiteCacheBackend(tmp_path / "cache.db", clock=lambda: now[0])
+
+    assert backend.acquire_lease("p1", "a", LEASE_TTL)
+    assert not other.acquire_lease("p1", "b", LEASE_TTL)
+    assert other.acquire_lease("p2", "b", LEASE_TTL)
+
+    backend.release_lease("p1", "a")
+    assert other.acquire_lease("p1", "b", LEASE_TTL)
+
+    # 持有者未释放（如进程退出）时，租约到期后可被接管
+    now[0] = LEASE_TTL
+    assert backend.acquire_lease("p1", "a", LEASE_TTL)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_only_one_worker_fetches_an_expired_project(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+
+    async def slow_list_menu(_request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": [
+                    {
+                        "_id": 10,
+                        "name": "用户管理",
+                        "list": [{"_id": INTERFACE_ID, "title": "用户登录", "path": "/a"}],
+                    }
+                ],
+            },
+        )
+
+    list_menu = respx.get(f"{BASE_URL}/api/interface/list_menu").mock(side_effect=slow_list_menu)
+    clients = [
+        YApiClient(BASE_URL, make_cookies("token"), cache=_worker(path)) for _ in range(WORKERS)
+    ]
+    try:
+        snapshots = await asyncio.gather(
+            *(client.get_project_snapshot(PROJECT_ID) for client in clients)
+        )
+    finally:
+        for client in clients:
+            await client.close()
+
+    assert list_menu.call_count == 1
+    assert all(snapshot.ids.tolist() == [INTERFACE_ID] for snapshot in snapshots)
@@ -0,0 +1,196 @@
+"""Unit tests for the in-process YApi cache."""
+
+from yapi_mcp.yapi.cache import DEFAULT_QUERY_CACHE_SIZE, YApiCache
+from yapi_mcp.yapi.models import YApiInterface
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+
+CACHE_TTL = 10.0
+FIRST_UP_TIME = 1_700_000_000
+SECOND_UP_TIME = 1_700_000_100
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_interface(interface_id: int = 1) -> YApiInterface:
+    return YApiInterface(
+        _id=interface_id,
+        catid=10,
+        title="用户登录",
+        path="/api/login",
+        method="POST",
+        project_id=1,
+    )
+
+
+def test_put_and_get_interface() -> None:
+    cache = YApiCache(ttl=CACHE_TTL, clock=FakeClock())
+    interface = _make_interface()
+
+    cache.put_interface(interface)
+
+    assert cache.get_interface(1) is interface
+    assert cache.get_interface(2) is None
+
+
+def test_interface_expires_after_ttl() -> None:
+    clock = FakeClock()
+    cache = YApiCache(ttl=CACHE_TTL, clock=clock)
+    cache.put_interface(_make_interface())
+
+    clock.now = CACHE_TTL
+    assert cache.get_interface(1) is None
+
+
+def test_zero_ttl_disables_reads() -> None:
+    cache = YApiCache(ttl=0, clock=FakeClock())
+    cache.put_interface(_make_interface())
+
+    assert cache.get_interface(1) is None
+    assert len(cache) == 1
+
+
+def test_invalidate_interface() -> None:
+    cache = YApiCache(ttl=CACHE_TTL, clock=FakeClock())
+    cache.put_interface(_make_interface())
+
+    cache.invalidate_interface(1)
+    cache.invalidate_interface(999)  # 不存在的 ID 不应报错
+
+    assert cache.get_interface(1) is None
+
+
+def _make_snapshot(project_id: int = 1, up_time: int = FIRST_UP_TIME) -> ProjectSnapshot:
+    snapshot = ProjectSnapshot(project_id)
+    snapshot.append({"_id": 1, "catid": 10, "title": "用户登录", "up_time": up_time})
+    return snapshot.freeze()
+
+
+def test_snapshot_versions_increase_and_invalidate() -> None:
+    cache = YApiCache(ttl=CACHE_TTL, clock=FakeClock())
+    first = _make_snapshot()
+    second = _make_snapshot(up_time=SECOND_UP_TIME)
+
+    cache.put_snapshot(first)
+    cache.put_snapshot(second)
+
+    assert cache.get_snapshot(1) is second
+    assert second.version > first.version
+
+    cache.invalidate_project(1)
+    assert cache.get_snapshot(1) is None
+
+
+def test_unchanged_snapshot_keeps_its_version_and_results() -> None:
+    clock = FakeClock()
+    cache = YApiCache(ttl=CACHE_TTL, clock=clock)
+    first = _make_snapshot()
+    cache.put_snapshot(first)
+    cache.results.put(first, "login", ("a",))
+
+    clock.now = CACHE_TTL / 2
+    refetched = _make_snapshot()
+    assert cache.put_snapshot(refetched) is first
+    assert first.fetched_at == refetched.fetched_at
+
+    # 重新获取的内容未变：TTL 从此刻重新计算，版本与结果缓存保持不变
+    clock.now = CACHE_TTL
+    assert cache.get_snapshot(1) is first
+    assert cache.results.get(first, "login") == ("a",)
+
+
+def _snapshot(project_id: int, cache: YApiCache, up_time: int = FIRST_UP_TIME) -> ProjectSnapshot:
+    return cache.put_snapshot(_make_snapshot(project_id, up_time))
+
+
+def test_query_results_are_tied_to_snapshot_version() -> None:
+    cache = YApiCache(ttl=CACHE_TTL, clock=FakeClock())
+    snapshot = _snapshot(1, cache)
+    cache.results.put(snapshot, "login", ("a",))
+
+    assert cache.results.get(snapshot, "login") == ("a",)
+    assert cache.results.get(snapshot, "logout") is None
+
+    refreshed = _snapshot(1, cache, SECOND_UP_TIME)
+    assert cache.results.get(refreshed, "login") is None
+    assert len(cache.results) == 0
+    assert cache.results.stats() == {
+        "size": 0,
+        "maxsize": DEFAULT_QUERY_CACHE_SIZE,
+        "hits": 1,
+        "misses": 2,
+        "hit_rate": round(1 / 3, 4),
+    }
+
+
+def test_query_results_lru_eviction_and_project_invalidation() -> None:
+    cache = YApiCache(ttl=CACHE_TTL, clock=FakeClock(), query_cache_size=2)
+    first, second = _snapshot(1, cache), _snapshot(2, cache)
+    cache.results.put(first, "a", 1)
+    cache.results.put(second, "b", 2)
+    assert cache.results.get(first, "a") == 1
+    cache.results.put(first, "c", 3)
+
+    # "b" 最久未使用，被淘汰
+    assert cache.results.get(second, "b") is None
+    assert cache.results.get(first, "a") == 1
+
+    cache.invalidate_project(1)
+    assert len(cache.results) == 0
+
+
+def test_query_result_cache_can_be_disabled() -> None:
+    cache = YApiCache(query_cache_size=0)
+    snapshot = _snapshot(1, cache)
+    cache.results.put(snapshot, "a", 1)
+    assert cache.results.get(snapshot, "a") is None
+
+
+def test_shared_projects_are_shared_across_scoped_caches() -> None:
+    clock = FakeClock()
+    shared = YApiCache(ttl=CACHE_TTL, clock=clock)
+    alice = YApiCache(ttl=CACHE_TTL, clock=clock, shared=shared, shared_projects={1})
+    bob = YApiCache(ttl=CACHE_TTL, clock=clock, shared=shared, shared_projects={1})
+    seen: list[tuple[int, YApiInterface | None]] = []
+    bob.subscribe(lambda interface_id, interface: seen.append((interface_id, interface)))
+
+    public = _make_interface()
+    private = _make_interface(2).model_copy(update={"project_id": 2})
+    alice.put_interface(public)
+    alice.put_interface(private)
+    snapshot = _snapshot(1, alice)
+    _snapshot(2, alice)
+
+    # 共享项目的数据对其他用户可见，私有项目的数据只属于写入它的用户
+    assert bob.get_interface(1) is public
+    assert bob.get_snapshot(1) is snapshot
+    assert bob.get_interface(2) is None
+    assert bob.get_snapshot(2) is None
+    assert seen == [(1, public)]
+
+    bob.invalidate_interface(1)
+    bob.invalidate_project(1)
+    assert alice.get_interface(1) is None
+    assert alice.get_snapshot(1) is None
+    assert alice.get_interface(2) is private
+
+
+def test_unsubscribe_detaches_from_the_shared_cache() -> None:
+    shared = YApiCache()
+    cache = YApiCache(shared=shared, shared_projects={1})
+    seen: list[tuple[int, YApiInterface | None]] = []
+
+    def listener(interface_id: int, interface: YApiInterface | None) -> None:
+        seen.append((interface_id, interface))
+
+    cache.subscribe(listener)
+    cache.unsubscribe(listener)
+    shared.put_interface(_make_interface())
+    cache.put_interface(_make_interface(2).model_copy(update={"project_id": 2}))
+
+    assert seen == []
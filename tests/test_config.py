@@ -10,14 +10,26 @@ from yapi_mcp.config import (
     EnvFileConfigurationError,
     ServerConfig,
     load_server_config,
+    load_transport_config,
     resolve_env_file_path,
 )
 
+HTTP_PORT = 9000
+
 
 @pytest.fixture(autouse=True)
 def clear_yapi_env(monkeypatch: pytest.MonkeyPatch) -> None:
     """Prevent local shell or CI environment from affecting config tests."""
-    for key in ("YAPI_SERVER_URL", "YAPI_TOKEN", "YAPI_UID", "YAPI_CAS", ENV_FILE_ENV_VAR):
+    for key in (
+        "YAPI_SERVER_URL",
+        "YAPI_TOKEN",
+        "YAPI_UID",
+        "YAPI_CAS",
+        "YAPI_MCP_TRANSPORT",
+        "YAPI_MCP_HOST",
+        "YAPI_MCP_PORT",
+        ENV_FILE_ENV_VAR,
+    ):
         monkeypatch.delenv(key, raising=False)
 
 
@@ -221,3 +233,42 @@ def test_load_server_config_from_explicit_env_file(
     assert config.yapi_token == "dummy-token"  # noqa: S105
     assert config.yapi_uid == "dummy-uid"
     assert config.yapi_cas is None
+
+
+def test_project_tokens_parsed_from_json_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test YAPI_PROJECT_TOKENS maps project IDs to tokens."""
+    monkeypatch.setenv("YAPI_PROJECT_TOKENS", '{"11": "token-a", "12": "token-b"}')
+    config = ServerConfig(
+        yapi_server_url="https://yapi.example.com",
+        yapi_token="dummy-token",  # noqa: S106
+        yapi_uid="dummy-uid",
+        _env_file=None,
+    )
+
+    assert config.yapi_project_tokens == {11: "token-a", 12: "token-b"}
+
+
+def test_transport_config_loads_without_yapi_settings(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test transport settings load from YAPI_ENV_FILE without YApi settings."""
+    dotenv_path = tmp_path / "yapi.env"
+    dotenv_path.write_text(
+        f"YAPI_MCP_TRANSPORT=http\nYAPI_MCP_PORT={HTTP_PORT}\n", encoding="utf-8"
+    )
+    monkeypatch.setenv(ENV_FILE_ENV_VAR, str(dotenv_path))
+
+    transport = load_transport_config()
+
+    assert transport.yapi_mcp_transport == "http"
+    assert transport.yapi_mcp_host == "127.0.0.1"
+    assert transport.yapi_mcp_port == HTTP_PORT
+
+
+def test_transport_config_rejects_unknown_transport(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test only stdio, http and sse transports are accepted."""
+    monkeypatch.setenv("YAPI_MCP_TRANSPORT", "websocket")
+
+    with pytest.raises(ValidationError):
+        load_transport_config()
@@ -0,0 +1,199 @@
+"""Unit tests for the field-name index over cached interface details."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+import respx
+from conftest import make_cookies
+
+from yapi_mcp import server
+from yapi_mcp.config import ServerConfig
+from yapi_mcp.yapi.cache import YApiCache
+from yapi_mcp.yapi.client import YApiClient
+from yapi_mcp.yapi.field_index import (
+    INDEX_BATCH_SIZE,
+    FieldHit,
+    FieldIndex,
+    FieldIndexer,
+    extract_fields,
+)
+from yapi_mcp.yapi.models import YApiInterface
+
+PROJECT_ID = 1
+OTHER_PROJECT_ID = 2
+PROJECT_INTERFACES = 2
+BASE_URL = "https://yapi.example.com"
+
+REFUND_SCHEMA = json.dumps(
+    {
+        "type": "object",
+        "properties": {
+            "code": {"type": "integer"},
+            "data": {
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {"Refund_Amount": {"type": "number"}},
+                        },
+                    }
+                },
+                "allOf": [{"properties": {"merchant_id": {"type": "string"}}}],
+            },
+        },
+    }
+)
+
+
+def _interface(interface_id: int, project_id: int = PROJECT_ID, **fields: object) -> YApiInterface:
+    return YApiInterface.model_validate(
+        {
+            "_id": interface_id,
+            "catid": 1,
+            "title": f"接口{interface_id}",
+            "path": f"/api/{interface_id}",
+            "method": "GET",
+            "project_id": project_id,
+            **fields,
+        }
+    )
+
+
+def test_extract_fields_covers_params_and_bodies() -> None:
+    interface = _interface(
+        1,
+        req_query=[{"name": "merchant_id"}, {"desc": "无名参数"}],
+        req_params=[{"name": "id"}],
+        req_headers=[{"name": "Authorization"}],
+        req_body_form=[{"name": "file"}],
+        req_body_other='{"order": {"lines": [{"sku": "A1"}, {"sku": "B2"}]}}',
+        req_body_is_json_schema=False,
+        res_body=REFUND_SCHEMA,
+        res_body_is_json_schema=True,
+    )
+
+    assert extract_fields(interface) == [
+        FieldHit("query", "merchant_id"),
+        FieldHit("params", "id"),
+        FieldHit("headers", "Authorization"),
+        FieldHit("form", "file"),
+        FieldHit("req_body", "order"),
+        FieldHit("req_body", "order.lines"),
+        FieldHit("req_body", "order.lines[].sku"),
+        FieldHit("res_body", "code"),
+        FieldHit("res_body", "data"),
+        FieldHit("res_body", "data.items"),
+        FieldHit("res_body", "data.items[].Refund_Amount"),
+        FieldHit("res_body", "data.merchant_id"),
+    ]
+
+
+def test_extract_fields_skips_unparseable_bodies() -> None:
+    interface = _interface(1, req_body_other="{a: 1, // json5}", res_body="plain text")
+    assert extract_fields(interface) == []
+
+
+def test_search_by_name_location_project_and_partial() -> None:
+    index = FieldIndex()
+    index.add(_interface(1, req_query=[{"name": "merchant_id"}]))
+    index.add(_interface(2, res_body=REFUND_SCHEMA))
+    index.add(_interface(3, OTHER_PROJECT_ID, req_query=[{"name": "Merchant_ID"}]))
+
+    assert [match.interface.id for match in index.search("MERCHANT_ID")] == [1, 2, 3]
+    assert [m.interface.id for m in index.search("merchant_id", location="query")] == [1, 3]
+    assert [m.interface.id for m in index.search("merchant_id", project_id=OTHER_PROJECT_ID)] == [3]
+    assert index.search("refund_amount")[0].hits == [
+        FieldHit("res_body", "data.items[].Refund_Amount")
+    ]
+    assert index.search("refund") == []
+    assert [m.interface.id for m in index.search("refund", partial=True)] == [2]
+    assert index.project_size(PROJECT_ID) == PROJECT_INTERFACES
+
+
+def test_reindex_replaces_old_fields() -> None:
+    index = FieldIndex()
+    index.add(_interface(1, req_query=[{"name": "old_name"}]))
+    index.add(_interface(1, req_query=[{"name": "new_name"}]))
+
+    assert index.search("old_name") == []
+    assert [m.interface.id for m in index.search("new_name")] == [1]
+    assert len(index) == 1
+
+
+@pytest.mark.asyncio
+async def test_indexer_follows_cache_in_background() -> None:
+    cache = YApiCache()
+    cache.put_interface(_interface(1, req_query=[{"name": "page"}]))
+    indexer = FieldIndexer(cache)
+    assert indexer.pending == 1
+
+    for interface_id in range(2, INDEX_BATCH_SIZE + 3):
+        cache.put_interface(_interface(interface_id, req_query=[{"name": "page"}]))
+    # 让后台任务分批处理完队列
+    while indexer.pending:
+        await asyncio.sleep(0)
+
+    assert len(indexer.index.search("page")) == INDEX_BATCH_SIZE + 2
+
+    cache.invalidate_interface(1)
+    assert 1 not in indexer.index
+    cache.clear()
+    assert len(indexer.flush()) == 0
+
+
+def test_indexer_flush_without_event_loop() -> None:
+    cache = YApiCache()
+    indexer = FieldIndexer(cache)
+    cache.put_interface(_interface(1, res_body='{"refund_amount": 1}'))
+
+    assert indexer.pending == 1
+    assert [m.interface.id for m in indexer.flush().search("refund_amount")] == [1]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_partly_indexed_project_is_completed_before_searching(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = ServerConfig(
+        yapi_server_url=BASE_URL,
+        yapi_token="token",  # noqa: S106
+        yapi_uid="1",
+        _env_file=None,
+    )
+    cache = YApiCache()
+    indexer = FieldIndexer(cache)
+    cache.put_interface(_interface(1))
+    records = [
+        _interface(interface_id).model_dump(mode="json", by_alias=True)
+        for interface_id in range(1, PROJECT_INTERFACES + 1)
+    ]
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=httpx.Response(
+            200, json={"errcode": 0, "data": [{"_id": 1, "name": "分类", "list": records}]}
+        )
+    )
+    export_route = respx.get(f"{BASE_URL}/api/plugin/export").mock(
+        return_value=httpx.Response(200, json=[{"name": "分类", "list": records}])
+    )
+
+    async with YApiClient(BASE_URL, make_cookies("token"), cache=cache) as client:
+
+        @asynccontextmanager
+        async def open_client(_config: ServerConfig) -> AsyncIterator[YApiClient]:
+            yield client
+
+        monkeypatch.setattr(server, "get_field_indexer", lambda: indexer)
+        monkeypatch.setattr(server, "_open_client", open_client)
+        # 只索引了部分接口的项目先补齐，之后不再重复导出
+        for _ in range(2):
+            coverage = await server._index_project_fields(config, PROJECT_ID)  # noqa: SLF001
+            assert coverage == {"indexed": PROJECT_INTERFACES, "total": PROJECT_INTERFACES}
+
+    assert export_route.call_count == 1
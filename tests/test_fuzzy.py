@@ -0,0 +1,88 @@
+"""Unit tests for typo-tolerant trigram search."""
+
+import random
+
+import pytest
+
+from yapi_mcp.yapi.bitmap import bitmap_from_rows, rows_from_bitmap
+from yapi_mcp.yapi.fuzzy import MAX_CANDIDATES, substring_distance, trigrams
+from yapi_mcp.yapi.query import SearchQuery
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+
+RANDOM_CASES = 2000
+RANDOM_SEED = 7
+TRANSPOSITION_DISTANCE = 2
+
+RECORDS = [
+    {"_id": 1, "catid": 1, "title": "收据 Receipt", "path": "/api/receipt/{id}", "method": "GET"},
+    {"_id": 2, "catid": 1, "title": "用户资料", "path": "/user/profile", "method": "GET"},
+    {"_id": 3, "catid": 1, "title": "更新用户资料", "path": "/user/profile", "method": "PUT"},
+    {"_id": 4, "catid": 1, "title": "订单列表", "path": "/order/list", "method": "GET"},
+]
+
+
+def _reference_distance(needle: str, text: str) -> int:
+    previous = list(range(len(needle) + 1))
+    best = previous[-1]
+    for char in text:
+        current = [0]
+        for index, needle_char in enumerate(needle, 1):
+            current.append(
+                min(
+                    previous[index] + 1,
+                    current[index - 1] + 1,
+                    previous[index - 1] + (needle_char != char),
+                )
+            )
+        best = min(best, current[-1])
+        previous = current
+    return best
+
+
+def _snapshot() -> ProjectSnapshot:
+    return ProjectSnapshot(1).extend(RECORDS).freeze()
+
+
+def test_trigrams_are_padded_per_word() -> None:
+    assert trigrams("/Usr") == {"  u", " us", "usr", "sr "}
+
+
+def test_substring_distance_matches_dynamic_programming() -> None:
+    rng = random.Random(RANDOM_SEED)  # noqa: S311
+    for _ in range(RANDOM_CASES):
+        needle = "".join(rng.choice("ab/c") for _ in range(rng.randint(1, 9)))
+        text = "".join(rng.choice("ab/c") for _ in range(rng.randint(0, 15)))
+        assert substring_distance(needle, text) == _reference_distance(needle, text)
+    assert substring_distance("reciept", "/api/receipt/{id}") == TRANSPOSITION_DISTANCE
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [("reciept", [1]), ("/usr/profle", [2, 3]), ("ordr list", [4]), ("zzzz", [])],
+)
+def test_fuzzy_search_tolerates_typos(query: str, expected: list[int]) -> None:
+    snapshot = _snapshot()
+    rows = snapshot.trigram_index().search(query)
+    assert [snapshot.ids[row] for row in rows] == expected
+
+
+def test_fuzzy_query_keeps_field_filters() -> None:
+    snapshot = _snapshot()
+    rows = SearchQuery.parse("method:PUT /usr/profle").evaluate(snapshot, fuzzy=True)
+    assert [snapshot.ids[row] for row in rows] == [3]
+    assert SearchQuery.parse("reciept").evaluate(snapshot) == []
+
+
+def test_fuzzy_candidates_are_capped() -> None:
+    records = [
+        {"_id": index, "catid": 1, "title": f"订单详情 {index}", "path": "/order/detail"}
+        for index in range(MAX_CANDIDATES * 3)
+    ]
+    snapshot = ProjectSnapshot(1).extend(records).freeze()
+    assert len(snapshot.trigram_index().search("detial")) == MAX_CANDIDATES
+
+
+def test_rows_from_bitmap_limit() -> None:
+    mask = bitmap_from_rows(range(100))
+    assert rows_from_bitmap(mask, limit=10)[:10] == list(range(10))
+    assert len(rows_from_bitmap(mask, limit=10)) < len(rows_from_bitmap(mask))
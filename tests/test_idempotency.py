@@ -0,0 +1,78 @@
+"""Unit tests for the create idempotency ledger."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from yapi_mcp.yapi.idempotency import (
+    CreateLedger,
+    IdempotencyKeyReuseError,
+    create_key,
+    maybe_applied,
+)
+
+LEDGER_TTL = 10.0
+LEDGER_SIZE = 2
+INTERFACE_ID = 7
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_create_key_depends_on_payload_not_order() -> None:
+    payload = {"project_id": 1, "method": "GET", "path": "/a", "title": "A"}
+    assert create_key(payload) == create_key(dict(reversed(payload.items())))
+    assert create_key(payload) != create_key({**payload, "title": "B"})
+
+
+def test_ledger_records_outcome_and_expires() -> None:
+    clock = FakeClock()
+    ledger = CreateLedger(ttl=LEDGER_TTL, clock=clock)
+    ledger.begin("k", 1, "get", "/a")
+
+    record = ledger.lookup("k", 1, "GET", "/a")
+    assert record is not None
+    assert record.pending
+
+    ledger.complete("k", INTERFACE_ID)
+    record = ledger.lookup("k", 1, "GET", "/a")
+    assert record is not None
+    assert record.interface_id == INTERFACE_ID
+
+    with pytest.raises(IdempotencyKeyReuseError):
+        ledger.lookup("k", 1, "GET", "/b")
+
+    clock.now = LEDGER_TTL
+    assert ledger.lookup("k", 1, "GET", "/a") is None
+    assert len(ledger) == 0
+
+
+def test_ledger_drops_oldest_records() -> None:
+    ledger = CreateLedger(maxsize=LEDGER_SIZE)
+    for key in ("a", "b", "c"):
+        ledger.begin(key, 1, "GET", f"/{key}")
+    assert len(ledger) == LEDGER_SIZE
+    assert ledger.lookup("a", 1, "GET", "/a") is None
+
+
+def test_maybe_applied_classifies_failures() -> None:
+    request = httpx.Request("POST", "https://yapi.example.com/api/interface/add")
+
+    def status_error(code: int) -> httpx.HTTPStatusError:
+        response = httpx.Response(code, request=request)
+        return httpx.HTTPStatusError("error", request=request, response=response)
+
+    assert maybe_applied(httpx.ReadTimeout("timed out"))
+    assert maybe_applied(httpx.RemoteProtocolError("closed"))
+    assert maybe_applied(status_error(httpx.codes.BAD_GATEWAY))
+    assert maybe_applied(asyncio.CancelledError())
+    assert not maybe_applied(httpx.ConnectError("refused"))
+    assert not maybe_applied(httpx.ConnectTimeout("timed out"))
+    assert not maybe_applied(status_error(httpx.codes.OK))
+    assert not maybe_applied(status_error(httpx.codes.FORBIDDEN))
@@ -0,0 +1,75 @@
+"""Unit tests for project metadata pre-flight checks."""
+
+import pytest
+
+from yapi_mcp.yapi.cache import YApiCache
+from yapi_mcp.yapi.metadata import (
+    BasepathInPathError,
+    DuplicateRouteError,
+    ProjectMetadata,
+    UnknownCategoryError,
+)
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+
+PROJECT_ID = 1
+USER_CATID = 10
+ORDER_CATID = 20
+
+RECORDS = [
+    {"_id": 1, "catid": USER_CATID, "title": "登录", "path": "/user/login", "method": "POST"},
+    {"_id": 2, "catid": USER_CATID, "title": "资料", "path": "/user/profile", "method": "GET"},
+    {"_id": 3, "catid": ORDER_CATID, "title": "订单", "path": "/order/list", "method": "GET"},
+]
+
+
+def _snapshot() -> ProjectSnapshot:
+    snapshot = ProjectSnapshot(PROJECT_ID)
+    snapshot.add_category(USER_CATID, "用户管理")
+    snapshot.add_category(ORDER_CATID, "订单")
+    return snapshot.extend(RECORDS).freeze()
+
+
+def test_unknown_category_hint_follows_sibling_paths() -> None:
+    metadata = ProjectMetadata.from_snapshot(_snapshot())
+    with pytest.raises(UnknownCategoryError, match=r"catid 10（用户管理）"):
+        metadata.check_write(catid=99, method="GET", path="/user/settings")
+    with pytest.raises(UnknownCategoryError, match=r"项目现有分类：10（用户管理）、20（订单）"):
+        metadata.check_write(catid=99, method="GET", path="/misc")
+
+
+def test_routes_follow_local_writes() -> None:
+    metadata = ProjectMetadata.from_snapshot(_snapshot())
+    with pytest.raises(DuplicateRouteError):
+        metadata.check_write(catid=USER_CATID, method="post", path="/user/login")
+    metadata.check_write(method="POST", path="/user/login", interface_id=1)
+
+    metadata.add_route("POST", "/user/signin", 1, USER_CATID)
+    metadata.check_write(method="POST", path="/user/login")
+    with pytest.raises(DuplicateRouteError):
+        metadata.check_write(method="POST", path="/user/signin")
+
+
+def test_basepath_prefix_is_rejected() -> None:
+    metadata = ProjectMetadata(PROJECT_ID, basepath="/api/")
+    with pytest.raises(BasepathInPathError, match="请改为 /user"):
+        metadata.check_write(path="/api/user")
+    metadata.check_write(path="/apiary")
+
+
+def test_cache_rebuilds_metadata_for_new_snapshots() -> None:
+    cache = YApiCache()
+    assert cache.get_metadata(PROJECT_ID) is None
+
+    cache.put_snapshot(_snapshot())
+    metadata = cache.get_metadata(PROJECT_ID)
+    assert metadata is not None
+    metadata.basepath = "/api"
+    assert cache.get_metadata(PROJECT_ID) is metadata
+
+    cache.invalidate_project(PROJECT_ID)
+    assert cache.get_metadata(PROJECT_ID) is metadata
+
+    cache.put_snapshot(_snapshot())
+    rebuilt = cache.get_metadata(PROJECT_ID)
+    assert rebuilt is not metadata
+    assert rebuilt.basepath == "/api"
@@ -0,0 +1,158 @@
+"""Tests for the degraded read mode used while YApi is unreachable."""
+
+import httpx
+import pytest
+import respx
+from conftest import make_cookies
+
+from yapi_mcp.server import _read_with_fallback
+from yapi_mcp.yapi.cache import YApiCache
+from yapi_mcp.yapi.client import YApiClient
+from yapi_mcp.yapi.errors import OfflineError
+from yapi_mcp.yapi.offline import Connectivity
+
+BASE_URL = "https://yapi.example.com"
+PROJECT_ID = 1
+INTERFACE_ID = 123
+RETRY_INTERVAL = 30.0
+EXPIRED = 1000.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _mock_list_menu() -> respx.Route:
+    return respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": [
+                    {
+                        "_id": 10,
+                        "name": "用户模块",
+                        "list": [
+                            {
+                                "_id": INTERFACE_ID,
+                                "title": "用户登录",
+                                "path": "/api/login",
+                                "method": "POST",
+                            }
+                        ],
+                    }
+                ],
+            },
+        )
+    )
+
+
+def _mock_interface_get() -> respx.Route:
+    return respx.get(f"{BASE_URL}/api/interface/get").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": {
+                    "_id": INTERFACE_ID,
+                    "title": "用户登录",
+                    "path": "/api/login",
+                    "method": "POST",
+                    "project_id": PROJECT_ID,
+                    "catid": 10,
+                },
+            },
+        )
+    )
+
+
+def test_connectivity_goes_offline_for_retry_interval() -> None:
+    clock = FakeClock()
+    connectivity = Connectivity(RETRY_INTERVAL, clock=clock)
+    connectivity.check_writable()
+
+    connectivity.mark_down()
+    assert connectivity.offline
+    with pytest.raises(OfflineError, match="离线模式"):
+        connectivity.check_writable()
+
+    clock.now = RETRY_INTERVAL
+    assert not connectivity.offline
+    connectivity.check_writable()
+
+    connectivity.mark_down()
+    connectivity.mark_up()
+    assert not connectivity.offline
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_reads_fall_back_to_expired_cache_when_unreachable() -> None:
+    clock = FakeClock()
+    cache = YApiCache(ttl=RETRY_INTERVAL, clock=clock)
+    connectivity = Connectivity(RETRY_INTERVAL, clock=clock)
+    list_menu = _mock_list_menu()
+    interface_get = _mock_interface_get()
+
+    async with YApiClient(BASE_URL, make_cookies("token"), cache=cache) as client:
+        results, fetched_at = await _read_with_fallback(
+            connectivity,
+            lambda: client.search_interfaces(PROJECT_ID, "登录"),
+            lambda: client.search_local(PROJECT_ID, "登录"),
+        )
+        assert fetched_at is None
+        await client.get_interface(INTERFACE_ID)
+
+        clock.now = EXPIRED
+        list_menu.mock(side_effect=httpx.ConnectError("refused"))
+        interface_get.mock(side_effect=httpx.ConnectError("refused"))
+
+        results, fetched_at = await _read_with_fallback(
+            connectivity,
+            lambda: client.search_interfaces(PROJECT_ID, "登录"),
+            lambda: client.search_local(PROJECT_ID, "登录"),
+        )
+        assert [summary.id for summary in results] == [INTERFACE_ID]
+        assert fetched_at is not None
+        assert connectivity.offline
+
+        calls = interface_get.call_count
+        interface, fetched_at = await _read_with_fallback(
+            connectivity,
+            lambda: client.get_interface(INTERFACE_ID),
+            lambda: client.get_local_interface(INTERFACE_ID),
+        )
+        assert interface.id == INTERFACE_ID
+        assert fetched_at is not None
+        # 离线期间直接读本地缓存，不再等待 YApi 超时
+        assert interface_get.call_count == calls
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_forced_offline_read_without_local_copy_fails() -> None:
+    connectivity = Connectivity(RETRY_INTERVAL)
+    list_menu = _mock_list_menu()
+
+    async with YApiClient(BASE_URL, make_cookies("token"), cache=YApiCache()) as client:
+        with pytest.raises(OfflineError, match=str(PROJECT_ID)):
+            await _read_with_fallback(
+                connectivity,
+                lambda: client.search_interfaces(PROJECT_ID, "登录"),
+                lambda: client.search_local(PROJECT_ID, "登录"),
+                offline=True,
+            )
+        list_menu.mock(side_effect=httpx.ConnectError("refused"))
+        with pytest.raises(httpx.ConnectError):
+            await _read_with_fallback(
+                connectivity,
+                lambda: client.search_interfaces(PROJECT_ID, "登录"),
+                lambda: client.search_local(PROJECT_ID, "登录"),
+            )
+
+    # 强制离线的读取不请求 YApi
+    assert list_menu.call_count == 1
@@ -0,0 +1,169 @@
+"""Unit tests for converting OpenAPI / Swagger specs into YApi payloads."""
+
+import json
+
+import pytest
+
+from yapi_mcp.yapi.models import YApiInterface
+from yapi_mcp.yapi.openapi import (
+    changed_fields,
+    fingerprint,
+    interface_fields,
+    load_spec,
+    operations_from_spec,
+    spec_fields,
+)
+
+USER_CATID = 10
+OPENAPI_OPERATIONS = 3
+
+OPENAPI_SPEC = {
+    "openapi": "3.0.3",
+    "paths": {
+        "/users/{id}": {
+            "parameters": [{"name": "id", "in": "path", "required": True, "example": 7}],
+            "get": {
+                "tags": ["用户"],
+                "summary": "用户详情",
+                "description": "按 ID 查询",
+                "parameters": [
+                    {"$ref": "#/components/parameters/Trace"},
+                    {"name": "fields", "in": "query", "schema": {"type": "string"}},
+                ],
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {"schema": {"$ref": "#/components/schemas/User"}}
+                        }
+                    }
+                },
+            },
+            "delete": {"operationId": "deleteUser", "responses": {"204": {}}},
+        },
+        "/users": {
+            "post": {
+                "tags": ["用户"],
+                "requestBody": {
+                    "content": {
+                        "multipart/form-data": {
+                            "schema": {
+                                "type": "object",
+                                "required": ["avatar"],
+                                "properties": {
+                                    "avatar": {"type": "string", "format": "binary"},
+                                    "name": {"type": "string", "example": "Tom"},
+                                },
+                            }
+                        }
+                    }
+                },
+                "responses": {"default": {"description": "ok"}},
+            }
+        },
+    },
+    "components": {
+        "parameters": {
+            "Trace": {"name": "X-Trace", "in": "header", "required": True, "example": "abc"}
+        },
+        "schemas": {
+            "User": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "friends": {"type": "array", "items": {"$ref": "#/components/schemas/User"}},
+                },
+            }
+        },
+    },
+}
+
+SWAGGER_YAML = """
+swagger: "2.0"
+paths:
+  /orders:
+    post:
+      summary: 创建订单
+      parameters:
+        - name: body
+          in: body
+          schema:
+            $ref: "#/definitions/Order"
+      responses:
+        200:
+          schema:
+            $ref: "#/definitions/Order"
+definitions:
+  Order:
+    type: object
+    properties:
+      amount:
+        type: number
+"""
+
+
+def test_openapi_operations_are_converted() -> None:
+    operations = operations_from_spec(load_spec(json.dumps(OPENAPI_SPEC)))
+    assert len(operations) == OPENAPI_OPERATIONS
+    detail, delete, create = operations
+
+    assert (detail.method, detail.path, detail.category) == ("GET", "/users/{id}", "用户")
+    assert detail.payload["title"] == "用户详情"
+    assert detail.payload["markdown"] == "按 ID 查询"
+    assert detail.payload["req_params"] == [{"name": "id", "desc": "", "example": "7"}]
+    assert detail.payload["req_headers"][0]["name"] == "X-Trace"
+    assert detail.payload["req_query"][0] == {
+        "name": "fields",
+        "required": "0",
+        "desc": "",
+        "example": "",
+    }
+    schema = json.loads(detail.payload["res_body"])
+    assert schema["properties"]["id"] == {"type": "integer"}
+    # 循环引用以空对象占位
+    assert schema["properties"]["friends"]["items"] == {"type": "object"}
+
+    assert delete.payload["title"] == "deleteUser"
+    assert delete.category is None
+    assert "res_body" not in delete.payload
+
+    assert create.payload["req_body_type"] == "form"
+    assert [(f["name"], f["type"], f["required"]) for f in create.payload["req_body_form"]] == [
+        ("avatar", "file", "1"),
+        ("name", "text", "0"),
+    ]
+
+
+def test_swagger_yaml_body_and_integer_status_codes() -> None:
+    (operation,) = operations_from_spec(load_spec(SWAGGER_YAML))
+    assert operation.payload["req_body_type"] == "json"
+    assert json.loads(operation.payload["req_body"])["properties"]["amount"] == {"type": "number"}
+    assert json.loads(operation.payload["res_body"])["type"] == "object"
+
+
+@pytest.mark.parametrize("text", ['{"paths": {}}', "- a\n- b", '{"openapi": "3.0.0"'])
+def test_load_spec_rejects_non_specs(text: str) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        load_spec(text)
+
+
+def test_fingerprint_ignores_formatting_and_default_body_types() -> None:
+    (operation,) = operations_from_spec(load_spec(SWAGGER_YAML))
+    stored = YApiInterface(
+        _id=1,
+        catid=USER_CATID,
+        title="创建订单",
+        path="/orders",
+        method="POST",
+        project_id=1,
+        req_body_type="json",
+        req_body_other=json.dumps(json.loads(operation.payload["req_body"])),
+        res_body_type="json",
+        res_body=operation.payload["res_body"],
+        req_query=[],
+        markdown=None,
+    )
+    wanted = spec_fields(operation, USER_CATID)
+    assert fingerprint(interface_fields(stored)) == fingerprint(wanted)
+
+    moved = interface_fields(stored.model_copy(update={"catid": 0, "title": "旧标题"}))
+    assert changed_fields(moved, wanted) == ["catid", "title"]
@@ -0,0 +1,83 @@
+"""Unit tests for the per-login YApi client pool."""
+
+import pytest
+
+from yapi_mcp.yapi.client import YApiClient
+from yapi_mcp.yapi.pool import ClientPool, Credentials
+
+BASE_URL = "https://yapi.example.com"
+IDLE_TIMEOUT = 60.0
+
+ALICE = Credentials(BASE_URL, "token-a", "1")
+BOB = Credentials(BASE_URL, "token-b", "2", cas="cas")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _factory(credentials: Credentials) -> YApiClient:
+    return YApiClient(credentials.server_url, credentials.cookies)
+
+
+def test_credentials_cookies() -> None:
+    assert ALICE.cookies == {"_yapi_token": "token-a", "_yapi_uid": "1"}
+    assert BOB.cookies == {"_yapi_token": "token-b", "_yapi_uid": "2", "ZYBIPSCAS": "cas"}
+    # 同一用户换了 token 也是另一个登录，不共用客户端和缓存
+    assert Credentials(BASE_URL, "forged", "1") != ALICE
+
+
+@pytest.mark.asyncio
+async def test_clients_are_reused_per_login_and_evicted_when_idle() -> None:
+    clock = FakeClock()
+    pool = ClientPool(_factory, idle_timeout=IDLE_TIMEOUT, clock=clock)
+
+    async with pool.acquire(ALICE) as first, pool.acquire(ALICE) as second:
+        assert first is second
+    async with pool.acquire(BOB) as bob:
+        assert bob is not first
+    assert len(pool) == len([ALICE, BOB])
+
+    async with pool.acquire(ALICE):
+        # 正在使用的客户端不会被回收
+        clock.now = IDLE_TIMEOUT * 2
+        assert await pool.evict_idle() == 1
+        assert bob.client.is_closed
+        assert not first.client.is_closed
+
+    clock.now += IDLE_TIMEOUT
+    async with pool.acquire(BOB) as again:
+        assert again is not bob
+    assert first.client.is_closed
+    assert len(pool) == 1
+
+    await pool.close()
+    assert again.client.is_closed
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_busy_clients_are_kept() -> None:
+    clock = FakeClock()
+    busy: set[str] = {ALICE.uid}
+    pool = ClientPool(
+        _factory,
+        idle_timeout=IDLE_TIMEOUT,
+        busy=lambda client: client.client.cookies["_yapi_uid"] in busy,
+        clock=clock,
+    )
+    alice = pool.get(ALICE)
+    pool.get(BOB)
+
+    clock.now = IDLE_TIMEOUT
+    assert await pool.evict_idle() == 1
+    assert pool.get(ALICE) is alice
+
+    busy.clear()
+    clock.now += IDLE_TIMEOUT
+    assert await pool.evict_idle() == 1
+    assert alice.client.is_closed
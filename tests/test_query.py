@@ -0,0 +1,130 @@
+"""Unit tests for the field-scoped search query language."""
+
+import pytest
+
+from yapi_mcp.yapi.bitmap import bitmap_from_rows, rows_from_bitmap
+from yapi_mcp.yapi.query import QuerySyntaxError, SearchQuery
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+
+PROJECT_ID = 1
+USER_CATID = 10
+ORDER_CATID = 20
+
+RECORDS = [
+    {
+        "_id": 101,
+        "catid": USER_CATID,
+        "title": "用户登录",
+        "path": "/api/user/login",
+        "method": "POST",
+        "status": "done",
+        "tag": ["Auth"],
+        "_cat_name": "用户管理",
+    },
+    {
+        "_id": 102,
+        "catid": USER_CATID,
+        "title": "用户详情",
+        "path": "/api/user/{id}",
+        "method": "GET",
+        "status": "undone",
+        "_cat_name": "用户管理",
+    },
+    {
+        "_id": 201,
+        "catid": ORDER_CATID,
+        "title": "创建订单",
+        "path": "/api/order/create",
+        "method": "POST",
+        "status": "undone",
+        "tag": ["payment", "auth"],
+        "_cat_name": "订单",
+    },
+    {
+        "_id": 202,
+        "catid": ORDER_CATID,
+        "title": "订单退款",
+        "path": "/api/order/refund/apply",
+        "method": "PUT",
+        "status": "done",
+        "tag": ["payment"],
+        "_cat_name": "订单",
+    },
+]
+
+
+def _ids(query: str) -> list[int]:
+    snapshot = ProjectSnapshot(PROJECT_ID).extend(RECORDS).freeze()
+    return [snapshot.ids[row] for row in SearchQuery.parse(query).evaluate(snapshot)]
+
+
+def test_plain_keyword_keeps_whole_text() -> None:
+    query = SearchQuery.parse("user login")
+    assert query.keywords == ("user login",)
+    assert query.rank_keyword == "user login"
+    assert _ids("订单") == [201, 202]
+    assert _ids("") == [101, 102, 201, 202]
+
+
+@pytest.mark.parametrize("text", ["don't", 'user "profile'])
+def test_plain_keyword_with_quotes_is_not_parsed(text: str) -> None:
+    assert SearchQuery.parse(text).keywords == (text.lower(),)
+
+
+def test_apostrophe_in_keyword_next_to_field_term() -> None:
+    assert SearchQuery.parse("method:GET don't").keywords == ("don't",)
+
+
+def test_method_and_status_terms() -> None:
+    assert _ids("method:post") == [101, 201]
+    assert _ids("method:POST,PUT status:done") == [101, 202]
+    assert _ids("status:undone") == [102, 201]
+
+
+def test_tag_term_is_case_insensitive_and_exact() -> None:
+    assert _ids("tag:auth") == [101, 201]
+    assert _ids("tag:pay") == []
+    assert _ids("tag:payment method:PUT") == [202]
+
+
+def test_cat_term_matches_category_substring() -> None:
+    assert _ids("cat:用户") == [101, 102]
+    assert _ids('cat:"不存在"') == []
+
+
+def test_path_glob_matches_whole_path() -> None:
+    assert _ids("path:/api/order/*") == [201, 202]
+    assert _ids("path:/api/user/?????") == [101]
+    assert _ids("path:/api/*/create,/api/user/login") == [101, 201]
+    assert _ids("path:/api/order") == [201, 202]
+    assert _ids("path:refund") == [202]
+
+
+def test_keywords_combine_with_field_terms() -> None:
+    query = SearchQuery.parse("method:POST 订单 创建")
+    assert query.keywords == ("订单", "创建")
+    assert query.rank_keyword == "订单"
+    assert _ids("method:POST 订单") == [201]
+    assert _ids('status:undone "用户 详情"') == []
+    assert _ids("tag:payment 退款") == [202]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["method:FETCH", "status:pending", "tag:", 'cat:"未闭合'],
+)
+def test_invalid_queries_raise(text: str) -> None:
+    with pytest.raises(QuerySyntaxError):
+        SearchQuery.parse(text)
+
+
+def test_bitmap_round_trip() -> None:
+    rows = [0, 3, 8, 63, 64, 1000]
+    assert rows_from_bitmap(bitmap_from_rows(rows)) == rows
+    assert rows_from_bitmap(0) == []
+
+
+def test_equivalent_queries_are_equal() -> None:
+    assert SearchQuery.parse("method:post,PUT Order") == SearchQuery.parse("method:PUT,post order")
+    assert hash(SearchQuery.parse("path:/a/* x")) == hash(SearchQuery.parse("PATH:/A/* X"))
+    assert SearchQuery.parse("Login") == SearchQuery.parse("login")
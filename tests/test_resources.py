@@ -0,0 +1,38 @@
+"""Tests for the MCP resources exposing cached project and interface data."""
+
+from yapi_mcp.server import INTERFACE_URI, _project_listing
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+
+PROJECT_ID = 1
+CATID = 10
+EMPTY_CATID = 20
+INTERFACE_ID = 101
+
+
+def test_project_listing_links_interface_resources() -> None:
+    snapshot = ProjectSnapshot(PROJECT_ID).extend(
+        [
+            {
+                "_id": INTERFACE_ID,
+                "catid": CATID,
+                "title": "用户登录",
+                "path": "/api/login",
+                "method": "POST",
+                "_cat_name": "用户管理",
+            }
+        ]
+    )
+    snapshot.add_category(EMPTY_CATID, "空分类")
+
+    listing = _project_listing(snapshot.freeze())
+
+    assert listing["project_id"] == PROJECT_ID
+    assert listing["categories"] == [
+        {"_id": CATID, "name": "用户管理"},
+        {"_id": EMPTY_CATID, "name": "空分类"},
+    ]
+    [interface] = listing["interfaces"]
+    assert interface["_id"] == INTERFACE_ID
+    assert interface["catid"] == CATID
+    assert interface["uri"] == INTERFACE_URI.format(interface_id=INTERFACE_ID)
+    assert interface["uri"] == "yapi://interface/101"
@@ -0,0 +1,48 @@
+"""Unit tests for local JSON Schema checks."""
+
+import json
+
+from yapi_mcp.yapi.schema import MAX_SCHEMA_ERRORS, schema_errors
+
+VALID_SCHEMA = json.dumps(
+    {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "type": "object",
+        "properties": {"id": {"type": "integer"}},
+        "required": ["id"],
+    }
+)
+
+
+def test_valid_schema_has_no_errors() -> None:
+    assert schema_errors(VALID_SCHEMA) == ()
+    assert schema_errors('{"type": "object"}') == ()
+
+
+def test_invalid_type_reports_json_path() -> None:
+    errors = schema_errors('{"type": "object", "properties": {"id": {"type": "integr"}}}')
+    assert len(errors) == 1
+    assert errors[0].startswith("$.properties.id.type: ")
+
+
+def test_draft_is_taken_from_dollar_schema() -> None:
+    # draft-04 要求 exclusiveMinimum 为布尔值，draft-07 要求为数字
+    draft4 = '{"$schema": "http://json-schema.org/draft-04/schema#", "exclusiveMinimum": 1}'
+    draft7 = '{"$schema": "http://json-schema.org/draft-07/schema#", "exclusiveMinimum": 1}'
+    assert schema_errors(draft4)
+    assert schema_errors(draft7) == ()
+
+
+def test_unparseable_or_non_object_schema() -> None:
+    assert schema_errors("{type: object}")[0].startswith("无法解析为 JSON")
+    assert schema_errors("[]") == ("JSON Schema 必须是 JSON 对象",)
+
+
+def test_errors_are_capped_and_cached() -> None:
+    properties = {f"f{index}": {"type": "bad"} for index in range(MAX_SCHEMA_ERRORS * 2)}
+    text = json.dumps({"properties": properties})
+    assert len(schema_errors(text)) == MAX_SCHEMA_ERRORS
+
+    hits = schema_errors.cache_info().hits
+    schema_errors(text)
+    assert schema_errors.cache_info().hits == hits + 1
@@ -1,14 +1,17 @@
 """Tests for startup credential validation error reporting."""
 
 from pathlib import Path
+from typing import Any
 
 import httpx
 import pytest
 
 from yapi_mcp import server
+from yapi_mcp.config import TransportConfig
 from yapi_mcp.server import _print_startup_http_error
 
 BASE_URL = "https://yapi.example.com"
+SESSIONS = 2
 
 
 def _make_http_status_error(status_code: int, payload: dict | None = None) -> httpx.HTTPStatusError:
@@ -83,3 +86,68 @@ async def test_app_lifespan_reports_invalid_env_file(
     captured = capsys.readouterr()
     assert "YAPI_ENV_FILE" in captured.err
     assert "disable .env loading" in captured.err
+
+
+class FakeTenants:
+    """Stands in for the pool of per-login clients."""
+
+    def __init__(self) -> None:
+        self.closed = 0
+
+    async def close(self) -> None:
+        self.closed += 1
+
+
+def _http_transport(monkeypatch: pytest.MonkeyPatch) -> TransportConfig:
+    transport = TransportConfig(yapi_mcp_transport="http")
+    monkeypatch.setattr(server, "get_transport_config", lambda: transport)
+    return transport
+
+
+def test_main_validates_http_startup_before_listening(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test http/sse startup failures exit the process instead of failing the first session."""
+    _http_transport(monkeypatch)
+    served: list[object] = []
+
+    async def fail_validation() -> None:
+        raise server.MCPStartupError
+
+    async def run_async(*args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        served.append((args, kwargs))
+
+    monkeypatch.setattr(server, "_validate_startup", fail_validation)
+    monkeypatch.setattr(server.mcp, "run_async", run_async)
+    monkeypatch.setattr(server.mcp, "add_middleware", lambda _middleware: None)
+
+    with pytest.raises(SystemExit, match="1"):
+        server.main()
+
+    assert served == []
+
+
+@pytest.mark.asyncio
+async def test_http_logins_outlive_sessions_until_the_server_stops(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the last session ending keeps logins open; stopping the server closes them."""
+    transport = _http_transport(monkeypatch)
+    tenants = FakeTenants()
+
+    async def validate() -> None:
+        pass
+
+    async def run_async(**_kwargs: Any) -> None:  # noqa: ANN401
+        for _ in range(SESSIONS):
+            async with server.app_lifespan(server.mcp):
+                pass
+        assert tenants.closed == 0
+
+    monkeypatch.setattr(server, "_validate_startup", validate)
+    monkeypatch.setattr(server, "get_tenants", lambda: tenants)
+    monkeypatch.setattr(server.mcp, "run_async", run_async)
+
+    await server._serve(transport)  # noqa: SLF001
+
+    assert tenants.closed == 1
@@ -1,12 +1,21 @@
 """Unit tests for _validate_interface_request in server.py."""
 
+import json
+from pathlib import Path
+
 import pytest
 
-from yapi_mcp.server import _validate_interface_request
+from yapi_mcp.server import (
+    _dry_run_batch,
+    _load_import_data,
+    _load_spec_operations,
+    _validate_interface_request,
+)
 
 
 # --- 枚举值验证 ---
 
+
 def test_invalid_method_raises():
     with pytest.raises(ValueError, match="method"):
         _validate_interface_request(method="INVALID")
@@ -49,6 +58,7 @@ def test_valid_statuses_pass():
 
 # --- 互斥校验 ---
 
+
 def test_req_body_and_req_body_form_mutually_exclusive():
     with pytest.raises(ValueError, match="不能同时提供"):
         _validate_interface_request(
@@ -59,6 +69,7 @@ def test_req_body_and_req_body_form_mutually_exclusive():
 
 # --- body type 相关性验证 ---
 
+
 def test_form_type_with_req_body_raises():
     with pytest.raises(ValueError, match="form"):
         _validate_interface_request(
@@ -101,6 +112,7 @@ def test_file_type_with_req_body_form_raises():
 
 # --- JSON 数组格式验证 ---
 
+
 def test_invalid_json_in_req_query_raises():
     with pytest.raises(ValueError, match="req_query"):
         _validate_interface_request(req_query="not json")
@@ -136,6 +148,7 @@ def test_valid_json_array_in_tag_passes():
 
 # --- 所有参数为 None/空时不报错 ---
 
+
 def test_all_none_passes():
     _validate_interface_request()  # 所有参数都有默认值 None，不应抛出
 
@@ -149,3 +162,94 @@ def test_empty_strings_pass():
         req_params="",
         tag="",
     )
+
+
+# --- 返回预解析的 JSON 数组 ---
+
+
+def test_returns_parsed_json_arrays() -> None:
+    arrays = _validate_interface_request(
+        req_query='[{"name":"page"}]',
+        req_headers="",
+        tag='["tag1"]',
+    )
+    assert arrays.req_query == [{"name": "page"}]
+    assert arrays.req_headers is None
+    assert arrays.req_body_form is None
+    assert arrays.tag == ["tag1"]
+
+
+# --- JSON Schema 校验 ---
+
+BAD_SCHEMA = '{"type": "object", "properties": {"id": {"type": "integr"}}}'
+
+
+def test_schema_check_is_opt_in() -> None:
+    _validate_interface_request(req_body_type="json", req_body=BAD_SCHEMA)
+    with pytest.raises(ValueError, match=r"req_body 不是合法的 JSON Schema.*properties\.id\.type"):
+        _validate_interface_request(req_body_type="json", req_body=BAD_SCHEMA, check_schema=True)
+
+
+def test_schema_check_skips_examples_and_raw_bodies() -> None:
+    _validate_interface_request(
+        res_body=BAD_SCHEMA, res_body_is_json_schema=False, check_schema=True
+    )
+    _validate_interface_request(res_body="plain", res_body_type="raw", check_schema=True)
+    with pytest.raises(ValueError, match="res_body"):
+        _validate_interface_request(res_body=BAD_SCHEMA, check_schema=True)
+
+
+def test_dry_run_batch_reports_each_payload() -> None:
+    results = _dry_run_batch(
+        [
+            {"title": "ok", "path": "/a", "method": "GET", "req_query": [{"name": "page"}]},
+            {"title": "bad", "path": "/b", "method": "POST", "res_body": {"type": "strin"}},
+            {"title": "no path", "method": "GET"},
+            {"title": "bad path", "path": "c", "method": "GET"},
+        ]
+    )
+    assert [result["valid"] for result in results] == [True, False, False, False]
+    assert "res_body" in results[1]["errors"][0]
+    assert results[2]["errors"] == ["缺少必填字段: path"]
+    assert results[3]["errors"] == ["接口路径必须以 / 开头"]
+
+
+def test_load_spec_operations_validates_each_operation(tmp_path: Path) -> None:
+    spec = {
+        "openapi": "3.0.0",
+        "paths": {
+            "/a": {"get": {"summary": "ok"}},
+            "/b": {
+                "post": {
+                    "responses": {
+                        "200": {"content": {"application/json": {"schema": {"type": "strin"}}}}
+                    }
+                }
+            },
+        },
+    }
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_text(json.dumps(spec), encoding="utf-8")
+
+    valid, invalid = _load_spec_operations(str(spec_file))
+    assert [operation.path for operation in valid] == ["/a"]
+    assert invalid[0]["path"] == "/b"
+    assert "res_body" in invalid[0]["errors"][0]
+
+    with pytest.raises(ValueError, match="无法读取规范文件"):
+        _load_spec_operations(str(tmp_path / "missing.yaml"))
+
+
+def test_load_import_data_converts_yaml_swagger(tmp_path: Path) -> None:
+    spec_file = tmp_path / "swagger.yaml"
+    spec_file.write_text('swagger: "2.0"\npaths: {}\n', encoding="utf-8")
+    assert json.loads(_load_import_data(str(spec_file), "swagger")) == {
+        "swagger": "2.0",
+        "paths": {},
+    }
+
+    export_file = tmp_path / "export.json"
+    export_file.write_text("[]", encoding="utf-8")
+    assert _load_import_data(str(export_file), "json") == "[]"
+    with pytest.raises(ValueError, match="JSON"):
+        _load_import_data(str(spec_file), "json")
@@ -0,0 +1,165 @@
+"""Unit tests for the columnar ProjectSnapshot."""
+
+from yapi_mcp.yapi.snapshot import (
+    SCORE_EXACT,
+    SCORE_OTHER,
+    SCORE_PATH,
+    SCORE_PATH_SUFFIX,
+    SCORE_TITLE,
+    SCORE_TITLE_PREFIX,
+    ProjectSnapshot,
+)
+
+PROJECT_ID = 1
+USER_CATID = 10
+ORDER_CATID = 20
+EMPTY_CATID = 30
+LOGIN_UP_TIME = 1_700_000_001
+
+RECORDS = [
+    {
+        "_id": 101,
+        "catid": USER_CATID,
+        "title": "用户登录",
+        "path": "/api/User/Login",
+        "method": "post",
+        "status": "done",
+        "tag": ["auth"],
+        "up_time": LOGIN_UP_TIME,
+        "_cat_name": "用户管理",
+    },
+    {
+        "_id": 102,
+        "catid": USER_CATID,
+        "title": "用户注册",
+        "path": "/api/user/register",
+        "method": "POST",
+        "status": "undone",
+        "_cat_name": "用户管理",
+    },
+    {
+        "_id": 201,
+        "catid": ORDER_CATID,
+        "title": "订单列表",
+        "path": "/api/order/list",
+        "method": "GET",
+        "markdown": "支持按 Refund 状态过滤",
+        "_cat_name": "订单",
+    },
+    {
+        "_id": 202,
+        "catid": ORDER_CATID,
+        "title": "订单导出",
+        "path": "/api/order/export",
+        "method": "PROPFIND",
+        "_cat_name": "订单",
+    },
+]
+
+
+def _snapshot() -> ProjectSnapshot:
+    snapshot = ProjectSnapshot(PROJECT_ID).extend(RECORDS)
+    snapshot.add_category(EMPTY_CATID, "空分类")
+    return snapshot.freeze()
+
+
+def test_columns_round_trip() -> None:
+    snapshot = _snapshot()
+
+    assert len(snapshot) == len(RECORDS)
+    assert list(snapshot.ids) == [101, 102, 201, 202]
+    assert snapshot.title(0) == "用户登录"
+    assert snapshot.path(0) == "/api/User/Login"
+    assert snapshot.method(0) == "POST"
+    assert snapshot.method(3) == "PROPFIND"
+    assert snapshot.status(1) == "undone"
+    assert snapshot.status(2) == ""
+    assert snapshot.tags(0) == ("auth",)
+    assert snapshot.tags(1) == ()
+    assert snapshot.up_times[0] == LOGIN_UP_TIME
+    assert snapshot.categories == {
+        USER_CATID: "用户管理",
+        ORDER_CATID: "订单",
+        EMPTY_CATID: "空分类",
+    }
+    assert snapshot.summary(2) == {
+        "_id": 201,
+        "title": "订单列表",
+        "path": "/api/order/list",
+        "method": "GET",
+    }
+    assert snapshot.record(0) == {
+        "_id": 101,
+        "title": "用户登录",
+        "path": "/api/User/Login",
+        "method": "POST",
+        "catid": USER_CATID,
+        "status": "done",
+        "tag": ["auth"],
+        "up_time": 1_700_000_001,
+    }
+
+
+def test_export_and_restore_round_trip() -> None:
+    snapshot = _snapshot()
+    fetched_at = snapshot.fetched_at - 60
+
+    restored = ProjectSnapshot.restore(snapshot.project_id, snapshot.export(), fetched_at)
+
+    assert restored.fetched_at == fetched_at
+    assert restored.categories == snapshot.categories
+    assert [restored.record(row) for row in range(len(restored))] == [
+        snapshot.record(row) for row in range(len(snapshot))
+    ]
+    # 冷文本(desc/markdown)同样保留，按描述仍能搜到
+    assert restored.search("refund") == snapshot.search("refund") != []
+
+
+def test_search_is_case_insensitive_over_title_and_path() -> None:
+    snapshot = _snapshot()
+
+    assert snapshot.search("USER/") == [0, 1]
+    assert snapshot.search("注册") == [1]
+
+
+def test_search_matches_category_name_and_cold_text() -> None:
+    snapshot = _snapshot()
+
+    assert snapshot.search("订单") == [2, 3]
+    assert snapshot.search("用户管理") == [0, 1]
+    assert snapshot.search("refund") == [2]
+
+
+def test_search_does_not_match_across_rows_or_fields() -> None:
+    snapshot = _snapshot()
+
+    # "Login" 与下一行 "用户注册" 之间、标题与路径之间均有分隔符
+    assert snapshot.search("login用户") == []
+    assert snapshot.search("登录/api") == []
+
+
+def test_empty_keyword_returns_all_rows() -> None:
+    assert _snapshot().search("") == [0, 1, 2, 3]
+
+
+def test_score_prefers_title_matches_over_path_and_category() -> None:
+    snapshot = _snapshot()
+
+    assert snapshot.score(0, "用户登录") == SCORE_EXACT
+    assert snapshot.score(0, "用户") == SCORE_TITLE_PREFIX
+    assert snapshot.score(2, "列表") == SCORE_TITLE
+    assert snapshot.score(2, "/list") == SCORE_PATH_SUFFIX
+    assert snapshot.score(2, "order") == SCORE_PATH
+    assert snapshot.score(2, "refund") == SCORE_OTHER
+
+
+def test_category_counts_include_empty_categories() -> None:
+    snapshot = _snapshot()
+    assert snapshot.category_counts() == {USER_CATID: 2, ORDER_CATID: 2, EMPTY_CATID: 0}
+
+
+def test_category_ids_by_name() -> None:
+    snapshot = _snapshot()
+    assert snapshot.category_ids(" 订单 ") == [ORDER_CATID]
+    assert snapshot.category_ids("用户") == [USER_CATID]
+    assert snapshot.category_ids("不存在") == []
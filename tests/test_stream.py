@@ -0,0 +1,114 @@
+"""Unit tests for the incremental JSON stream parser."""
+
+import json
+
+import pytest
+
+from yapi_mcp.yapi.stream import (
+    EVENT_END,
+    EVENT_VALUE,
+    IncompleteJSONError,
+    JSONStreamError,
+    JSONStreamParser,
+    MalformedJSONError,
+)
+
+ITEM_PATH = ("data", "*", "list", "*")
+NAME_PATH = ("data", "*", "name")
+CATEGORY_PATH = ("data", "*")
+CATEGORY_COUNT = 3
+
+TRICKY_TITLE = 'quote " brace } bracket ] 中文'
+
+LIST_MENU = {
+    "errcode": 0,
+    "errmsg": "成功！",
+    "data": [
+        {
+            "_id": cat_id,
+            "name": f"分类{cat_id}",
+            "list": [
+                {
+                    "_id": cat_id * 10 + i,
+                    "title": f"{TRICKY_TITLE} {i}",
+                    "path": "/api/\\escaped",
+                    "tag": ["a", "b"],
+                    "nested": {"x": [1, {"y": None}], "n": -1.5e3, "ok": True},
+                }
+                for i in range(2)
+            ],
+        }
+        for cat_id in range(CATEGORY_COUNT)
+    ],
+}
+
+
+def _parse(raw: bytes, chunk_size: int) -> list[tuple]:
+    parser = JSONStreamParser(
+        item_paths=[ITEM_PATH],
+        scalar_paths=[("errcode",), NAME_PATH],
+        end_paths=[CATEGORY_PATH],
+    )
+    events = []
+    for start in range(0, len(raw), chunk_size):
+        events.extend(parser.feed(raw[start : start + chunk_size]))
+    events.extend(parser.close())
+    return events
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_items_survive_any_chunk_boundary(chunk_size: int, indent: int | None) -> None:
+    raw = json.dumps(LIST_MENU, ensure_ascii=False, indent=indent).encode()
+
+    events = _parse(raw, chunk_size)
+
+    items = [value for kind, path, value in events if path == ITEM_PATH]
+    assert items == [item for cat in LIST_MENU["data"] for item in cat["list"]]
+    names = [value for kind, path, value in events if path == NAME_PATH]
+    assert names == [cat["name"] for cat in LIST_MENU["data"]]
+    assert events[0] == (EVENT_VALUE, ("errcode",), 0)
+    assert sum(1 for kind, _, _ in events if kind == EVENT_END) == CATEGORY_COUNT
+
+
+def test_unselected_values_are_not_emitted() -> None:
+    raw = json.dumps(LIST_MENU).encode()
+    parser = JSONStreamParser(item_paths=[ITEM_PATH])
+
+    events = parser.feed(raw) + parser.close()
+
+    assert {path for _, path, _ in events} == {ITEM_PATH}
+
+
+def test_top_level_array() -> None:
+    raw = json.dumps([{"name": "a", "list": [{"x": 1}]}]).encode()
+    parser = JSONStreamParser(item_paths=[("*", "list", "*")], scalar_paths=[("*", "name")])
+
+    events = parser.feed(raw) + parser.close()
+
+    assert events == [
+        (EVENT_VALUE, ("*", "name"), "a"),
+        (EVENT_VALUE, ("*", "list", "*"), {"x": 1}),
+    ]
+
+
+def test_truncated_stream_raises() -> None:
+    raw = json.dumps(LIST_MENU).encode()
+    parser = JSONStreamParser(item_paths=[ITEM_PATH])
+    parser.feed(raw[:-5])
+
+    with pytest.raises(IncompleteJSONError):
+        parser.close()
+
+
+@pytest.mark.parametrize("raw", [b'{"errcode": 0x1}', b'{"data": [{"list": [{"_id": 1,}]}]}'])
+def test_malformed_stream_raises(raw: bytes) -> None:
+    parser = JSONStreamParser(item_paths=[ITEM_PATH], scalar_paths=[("errcode",)])
+
+    with pytest.raises(MalformedJSONError):
+        parser.feed(raw)
+
+
+def test_stream_errors_are_not_value_errors() -> None:
+    # 工具层把 ValueError 报告为参数错误，响应损坏属于服务端错误
+    assert not issubclass(JSONStreamError, ValueError)
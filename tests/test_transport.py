@@ -0,0 +1,118 @@
+"""Tests for serving many MCP sessions from one process."""
+
+import asyncio
+from functools import partial
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from yapi_mcp import server
+from yapi_mcp.config import ServerConfig, TransportConfig
+from yapi_mcp.server import SessionConcurrencyLimit, _request_credentials, _Tenant
+from yapi_mcp.yapi.cache import YApiCache
+from yapi_mcp.yapi.pool import ClientPool, Credentials
+
+SESSION_LIMIT = 2
+CALLS_PER_SESSION = 5
+SESSIONS = 2
+BASE_URL = "https://yapi.example.com"
+IDLE_TIMEOUT = 60.0
+SHARED_PROJECT_ID = 1
+
+
+class FakeSession:
+    """Stands in for the MCP session a tool call belongs to."""
+
+
+@pytest.mark.asyncio
+async def test_session_concurrency_limit_is_per_session() -> None:
+    limit = SessionConcurrencyLimit(SESSION_LIMIT)
+    sessions = [FakeSession() for _ in range(SESSIONS)]
+    running = dict.fromkeys(range(SESSIONS), 0)
+    peak = dict.fromkeys(range(SESSIONS), 0)
+
+    def call(index: int) -> Any:  # noqa: ANN401
+        async def call_next(_context: object) -> int:
+            running[index] += 1
+            peak[index] = max(peak[index], running[index])
+            await asyncio.sleep(0.01)
+            running[index] -= 1
+            return index
+
+        context = SimpleNamespace(fastmcp_context=SimpleNamespace(session=sessions[index]))
+        return limit.on_call_tool(context, call_next)
+
+    results = await asyncio.gather(
+        *(call(index) for index in range(SESSIONS) for _ in range(CALLS_PER_SESSION))
+    )
+
+    assert sorted(results) == sorted(list(range(SESSIONS)) * CALLS_PER_SESSION)
+    assert peak == dict.fromkeys(range(SESSIONS), SESSION_LIMIT)
+
+
+def _config(**overrides: Any) -> ServerConfig:  # noqa: ANN401
+    return ServerConfig(
+        yapi_server_url=BASE_URL,
+        yapi_token="service",  # noqa: S106
+        yapi_uid="0",
+        _env_file=None,
+        **overrides,
+    )
+
+
+def test_request_credentials_prefer_headers_over_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = _config()
+    headers: dict[str, str] = {}
+    monkeypatch.setattr(server, "get_http_headers", lambda: headers)
+    monkeypatch.setattr(
+        server, "get_transport_config", lambda: TransportConfig(yapi_mcp_transport="stdio")
+    )
+
+    assert _request_credentials(config) == Credentials(f"{BASE_URL}/", "service", "0")
+
+    headers.update({"x-yapi-token": "alice-token", "x-yapi-uid": "1", "x-yapi-cas": "cas"})
+    assert _request_credentials(config) == Credentials(f"{BASE_URL}/", "alice-token", "1", "cas")
+
+    del headers["x-yapi-uid"]
+    with pytest.raises(ValueError, match="x-yapi-uid"):
+        _request_credentials(config)
+
+
+@pytest.mark.parametrize("transport", ["http", "sse"])
+def test_http_calls_without_headers_need_the_default_login_opt_in(
+    monkeypatch: pytest.MonkeyPatch, transport: str
+) -> None:
+    monkeypatch.setattr(server, "get_http_headers", dict)
+    monkeypatch.setattr(
+        server, "get_transport_config", lambda: TransportConfig(yapi_mcp_transport=transport)
+    )
+
+    with pytest.raises(ValueError, match="缺少请求头 x-yapi-token 与 x-yapi-uid"):
+        _request_credentials(_config())
+
+    opted_in = _config(yapi_allow_default_login=True)
+    assert _request_credentials(opted_in) == Credentials(f"{BASE_URL}/", "service", "0")
+
+
+@pytest.mark.asyncio
+async def test_evicted_tenants_stop_following_the_shared_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = _config(yapi_shared_projects=[SHARED_PROJECT_ID])
+    shared = YApiCache()
+    monkeypatch.setattr(server, "get_shared_cache", lambda: shared)
+    monkeypatch.setattr(server, "get_cache_backend", lambda: None)
+    now = [0.0]
+    pool = ClientPool(
+        partial(_Tenant, config=config), idle_timeout=IDLE_TIMEOUT, clock=lambda: now[0]
+    )
+    logins = [Credentials(BASE_URL, f"token-{uid}", str(uid)) for uid in range(SESSIONS)]
+    for credentials in logins:
+        pool.get(credentials)
+    assert len(shared._listeners) == len(logins)  # noqa: SLF001
+
+    now[0] = IDLE_TIMEOUT
+    assert await pool.evict_idle() == len(logins)
+    # 回收的登录不再占用共享缓存的监听列表，其字段索引可被释放
+    assert shared._listeners == []  # noqa: SLF001
@@ -0,0 +1,128 @@
+"""Unit tests for the adaptive project change watcher."""
+
+import asyncio
+from collections.abc import Hashable
+
+import pytest
+
+from yapi_mcp.yapi.snapshot import ProjectSnapshot
+from yapi_mcp.yapi.watcher import ProjectWatcher, SnapshotChanges, diff_snapshots
+
+PROJECT_ID = 1
+MIN_INTERVAL = 1.0
+MAX_INTERVAL = 4.0
+FAST_INTERVAL = 0.01
+
+
+def _snapshot(**up_times: int) -> ProjectSnapshot:
+    """Snapshot with one interface per keyword, e.g. ``_snapshot(i1=5)`` -> ID 1 at up_time 5."""
+    snapshot = ProjectSnapshot(PROJECT_ID)
+    for key, up_time in up_times.items():
+        snapshot.append({"_id": int(key[1:]), "title": key, "path": f"/{key}", "up_time": up_time})
+    return snapshot.freeze()
+
+
+class Upstream:
+    def __init__(self, *snapshots: ProjectSnapshot) -> None:
+        self.snapshots = list(snapshots)
+        self.fail = False
+
+    async def fetch(self, project_id: int) -> ProjectSnapshot:
+        assert project_id == PROJECT_ID
+        if self.fail:
+            msg = "unreachable"
+            raise ConnectionError(msg)
+        return self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, SnapshotChanges, frozenset[Hashable]]] = []
+        self.event = asyncio.Event()
+
+    async def __call__(
+        self, project_id: int, changes: SnapshotChanges, subscribers: frozenset[Hashable]
+    ) -> None:
+        self.calls.append((project_id, changes, subscribers))
+        self.event.set()
+
+
+def test_diff_snapshots_by_up_time() -> None:
+    changes = diff_snapshots(_snapshot(i1=1, i2=1, i3=1), _snapshot(i1=1, i2=2, i4=1))
+
+    assert changes.added == [4]
+    assert changes.removed == [3]
+    assert changes.modified == [2]
+    assert sorted(changes.interface_ids) == [2, 3, 4]
+    assert not diff_snapshots(_snapshot(i1=1), _snapshot(i1=1))
+
+
+@pytest.mark.asyncio
+async def test_poll_interval_backs_off_and_resets_on_change() -> None:
+    upstream = Upstream(_snapshot(i1=1), _snapshot(i1=1), _snapshot(i1=1), _snapshot(i1=2))
+    recorder = Recorder()
+    watcher = ProjectWatcher(
+        upstream.fetch, recorder, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL
+    )
+    watcher.watch(PROJECT_ID, "session")
+
+    try:
+        # 首次轮询没有可比较的快照，只记录
+        assert not await watcher.poll(PROJECT_ID)
+        assert not await watcher.poll(PROJECT_ID)
+        assert not await watcher.poll(PROJECT_ID)
+        assert watcher.interval(PROJECT_ID) == MAX_INTERVAL
+
+        changes = await watcher.poll(PROJECT_ID)
+        assert changes.modified == [1]
+        assert watcher.interval(PROJECT_ID) == MIN_INTERVAL
+        assert recorder.calls == [(PROJECT_ID, changes, frozenset({"session"}))]
+
+        upstream.fail = True
+        with pytest.raises(ConnectionError):
+            await watcher.poll(PROJECT_ID)
+        assert watcher.interval(PROJECT_ID) == MIN_INTERVAL * 2
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_first_poll_compares_with_cached_snapshot() -> None:
+    upstream = Upstream(_snapshot(i1=2))
+    recorder = Recorder()
+    watcher = ProjectWatcher(
+        upstream.fetch,
+        recorder,
+        min_interval=MIN_INTERVAL,
+        initial={PROJECT_ID: _snapshot(i1=1)}.get,
+    )
+    watcher.watch(PROJECT_ID, "session")
+
+    try:
+        changes = await watcher.poll(PROJECT_ID)
+        assert changes.modified == [1]
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_background_loop_reports_changes_until_unwatched() -> None:
+    upstream = Upstream(_snapshot(i1=1), _snapshot(i1=2))
+    recorder = Recorder()
+    watcher = ProjectWatcher(
+        upstream.fetch, recorder, min_interval=FAST_INTERVAL, max_interval=FAST_INTERVAL
+    )
+    watcher.watch(PROJECT_ID, "a")
+    watcher.watch(PROJECT_ID, "b")
+
+    try:
+        await asyncio.wait_for(recorder.event.wait(), timeout=1)
+        assert recorder.calls[0][2] == frozenset({"a", "b"})
+
+        watcher.unwatch(PROJECT_ID, "a")
+        assert watcher.projects == [PROJECT_ID]
+        watcher.forget("b")
+        assert watcher.projects == []
+        assert watcher.interval(PROJECT_ID) is None
+    finally:
+        await watcher.stop()
@@ -0,0 +1,103 @@
+"""Unit tests for the coalescing interface update queue."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from yapi_mcp.yapi.write_queue import UpdateCoalescer
+
+DEBOUNCE = 0.01
+INTERFACE_ID = 1
+OTHER_INTERFACE_ID = 2
+SEEN_UP_TIME = 100
+MERGED_CALLS = 3
+
+
+class RecordingUpdate:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[tuple[int, dict[str, Any]]] = []
+        self.fail = fail
+
+    async def __call__(self, interface_id: int, patch: dict[str, Any]) -> dict[str, Any]:
+        self.calls.append((interface_id, dict(patch)))
+        await asyncio.sleep(0)
+        if self.fail:
+            msg = "upstream failed"
+            raise RuntimeError(msg)
+        return {"action": "updated", "interface_id": interface_id}
+
+
+@pytest.mark.asyncio
+async def test_patches_within_window_are_merged() -> None:
+    update = RecordingUpdate()
+    queue = UpdateCoalescer(update, DEBOUNCE)
+
+    futures = [
+        queue.submit(
+            INTERFACE_ID, {"title": "a", "status": "undone", "expected_up_time": SEEN_UP_TIME}
+        ),
+        queue.submit(INTERFACE_ID, {"title": "b", "status": None, "expected_up_time": 999}),
+        queue.submit(INTERFACE_ID, {"markdown": ""}),
+    ]
+    results = await asyncio.gather(*futures)
+
+    assert update.calls == [
+        (
+            INTERFACE_ID,
+            {"title": "b", "status": "undone", "expected_up_time": SEEN_UP_TIME, "markdown": ""},
+        )
+    ]
+    assert all(result["merged_updates"] == MERGED_CALLS for result in results)
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_waiter() -> None:
+    queue = UpdateCoalescer(RecordingUpdate(fail=True), DEBOUNCE)
+    first = queue.submit(INTERFACE_ID, {"title": "a"})
+    second = queue.submit(INTERFACE_ID, {"title": "b"})
+
+    for future in (first, second):
+        with pytest.raises(RuntimeError, match="upstream failed"):
+            await future
+
+
+@pytest.mark.asyncio
+async def test_flush_sends_immediately_and_in_order() -> None:
+    update = RecordingUpdate()
+    queue = UpdateCoalescer(update, delay=60.0)
+
+    first = queue.submit(INTERFACE_ID, {"title": "a"})
+    await queue.flush(INTERFACE_ID)
+    assert first.done()
+
+    queue.submit(INTERFACE_ID, {"title": "b"})
+    queue.submit(OTHER_INTERFACE_ID, {"title": "c"})
+    assert queue.pending == len((INTERFACE_ID, OTHER_INTERFACE_ID))
+    await queue.flush()
+
+    assert queue.pending == 0
+    assert [call[1]["title"] for call in update.calls] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_batches_being_sent_are_counted_until_they_finish() -> None:
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_update(interface_id: int, _patch: dict[str, Any]) -> dict[str, Any]:
+        started.set()
+        await release.wait()
+        return {"action": "updated", "interface_id": interface_id}
+
+    queue = UpdateCoalescer(slow_update, DEBOUNCE)
+    future = queue.submit(INTERFACE_ID, {"title": "a"})
+    await started.wait()
+
+    # 已出队但尚未完成的批次仍占用客户端，不能被回收
+    assert queue.pending == 0
+    assert queue.inflight == 1
+
+    release.set()
+    await future
+    await asyncio.sleep(0)
+    assert queue.inflight == 0
@@ -1,14 +1,23 @@
 """Integration tests for YApiClient with mocked HTTP responses."""
 
+import asyncio
 import json
 
 import httpx
 import pytest
 import respx
+from pydantic import ValidationError
 
 from conftest import make_cookies
+from yapi_mcp.yapi.cache import YApiCache
 from yapi_mcp.yapi.client import YApiClient
-from yapi_mcp.yapi.models import YApiInterface, YApiInterfaceSummary
+from yapi_mcp.yapi.errors import UpdateConflictError
+from yapi_mcp.yapi.idempotency import IdempotencyKeyReuseError
+from yapi_mcp.yapi.metadata import BasepathInPathError, DuplicateRouteError, UnknownCategoryError
+from yapi_mcp.yapi.models import INTERFACE_LIST_ADAPTER, YApiInterface, YApiInterfaceSummary
+from yapi_mcp.yapi.openapi import SpecOperation
+from yapi_mcp.yapi.query import QuerySyntaxError
+from yapi_mcp.yapi.stream import IncompleteJSONError
 
 BASE_URL = "https://yapi.example.com"
 DEFAULT_TOKEN = "token"  # noqa: S105
@@ -17,6 +26,12 @@ DEFAULT_INTERFACE_ID = 123
 CREATED_INTERFACE_ID = 789
 
 
+def _mock_project_get(basepath: str = "") -> respx.Route:
+    return respx.get(f"{BASE_URL}/api/project/get").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {"basepath": basepath}})
+    )
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_search_interfaces_success() -> None:
@@ -73,7 +88,8 @@ async def test_search_interfaces_returns_all() -> None:
         {"_id": i, "title": f"接口{i}", "path": f"/api/{i}", "method": "GET"} for i in range(60)
     ]
     mock_interfaces_cat2 = [
-        {"_id": i, "title": f"接口{i}", "path": f"/api/{i}", "method": "GET"} for i in range(60, 100)
+        {"_id": i, "title": f"接口{i}", "path": f"/api/{i}", "method": "GET"}
+        for i in range(60, 100)
     ]
 
     respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
@@ -195,6 +211,34 @@ async def test_create_interface_with_new_params() -> None:
     assert sent_payload["tag"] == ["v2", "auth"]
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_create_interface_accepts_parsed_lists() -> None:
+    """Pre-parsed array arguments are sent as-is."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    add_route = respx.post(f"{BASE_URL}/api/interface/add").mock(
+        return_value=httpx.Response(
+            200,
+            json={"errcode": 0, "data": {"_id": CREATED_INTERFACE_ID}},
+        )
+    )
+
+    async with YApiClient(BASE_URL, cookies) as client:
+        await client.create_interface(
+            project_id=1,
+            catid=100,
+            title="预解析参数",
+            path="/api/items",
+            method="GET",
+            req_query=[{"name": "page"}],
+            tag=["v2"],
+        )
+
+    sent_payload = json.loads(add_route.calls[0].request.content)
+    assert sent_payload["req_query"] == [{"name": "page"}]
+    assert sent_payload["tag"] == ["v2"]
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_update_interface_success() -> None:
@@ -313,7 +357,10 @@ async def test_check_login_status_success() -> None:
     respx.get(f"{BASE_URL}/api/user/status").mock(
         return_value=httpx.Response(
             200,
-            json={"errcode": 0, "data": {"username": "testuser", "email": "test@example.com", "role": "member"}},
+            json={
+                "errcode": 0,
+                "data": {"username": "testuser", "email": "test@example.com", "role": "member"},
+            },
         )
     )
 
@@ -329,9 +376,7 @@ async def test_check_login_status_auth_failure() -> None:
     """Test credential validation with HTTP 401 raises HTTPStatusError."""
     cookies = make_cookies("expired_token")
 
-    respx.get(f"{BASE_URL}/api/user/status").mock(
-        return_value=httpx.Response(401)
-    )
+    respx.get(f"{BASE_URL}/api/user/status").mock(return_value=httpx.Response(401))
 
     async with YApiClient(BASE_URL, cookies) as client:
         with pytest.raises(httpx.HTTPStatusError):
@@ -354,3 +399,941 @@ async def test_check_login_status_errcode_nonzero() -> None:
     async with YApiClient(BASE_URL, cookies) as client:
         with pytest.raises(httpx.HTTPStatusError):
             await client.check_login_status()
+
+
+EXPORT_PROJECT_ID = 7
+EXPORT_CATID = 100
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_export_project_joins_ids_from_list_menu() -> None:
+    """Test export_project fills stripped _id/catid from list_menu and feeds the cache."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+
+    export_route = respx.get(f"{BASE_URL}/api/plugin/export").mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {
+                    "name": "用户模块",
+                    "list": [
+                        {
+                            "title": "用户登录",
+                            "path": "/api/login",
+                            "method": "POST",
+                            "req_body_other": '{"type":"object"}',
+                        },
+                        {"title": "已删除接口", "path": "/api/gone", "method": "GET"},
+                    ],
+                }
+            ],
+        )
+    )
+    menu_route = respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": [
+                    {
+                        "_id": 100,
+                        "name": "用户模块",
+                        "list": [
+                            {
+                                "_id": DEFAULT_INTERFACE_ID,
+                                "catid": 100,
+                                "title": "用户登录",
+                                "path": "/api/login",
+                                "method": "POST",
+                            }
+                        ],
+                    }
+                ],
+            },
+        )
+    )
+    get_route = respx.get(f"{BASE_URL}/api/interface/get")
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        interfaces = await client.export_project(EXPORT_PROJECT_ID)
+        cached = await client.get_interface(DEFAULT_INTERFACE_ID)
+
+    assert export_route.call_count == 1
+    assert menu_route.call_count == 1
+    assert not get_route.called
+    assert [interface.id for interface in interfaces] == [DEFAULT_INTERFACE_ID]
+    assert interfaces[0].catid == EXPORT_CATID
+    assert interfaces[0].project_id == EXPORT_PROJECT_ID
+    assert cached.req_body_other == '{"type":"object"}'
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_export_project_skips_list_menu_when_ids_present() -> None:
+    """Test export_project uses export records directly when they carry IDs."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+
+    respx.get(f"{BASE_URL}/api/plugin/export").mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {
+                    "name": "分类1",
+                    "list": [
+                        {
+                            "_id": DEFAULT_INTERFACE_ID,
+                            "catid": 100,
+                            "project_id": EXPORT_PROJECT_ID,
+                            "title": "用户登录",
+                            "path": "/api/login",
+                            "method": "POST",
+                        }
+                    ],
+                }
+            ],
+        )
+    )
+    menu_route = respx.get(f"{BASE_URL}/api/interface/list_menu")
+
+    async with YApiClient(BASE_URL, cookies) as client:
+        interfaces = await client.export_project(EXPORT_PROJECT_ID)
+
+    assert not menu_route.called
+    assert interfaces[0].id == DEFAULT_INTERFACE_ID
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_interface_uses_cache_and_update_invalidates() -> None:
+    """Test get_interface is served from cache until update_interface invalidates it."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+
+    get_route = respx.get(f"{BASE_URL}/api/interface/get").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": {
+                    "_id": DEFAULT_INTERFACE_ID,
+                    "title": "用户登录",
+                    "path": "/api/login",
+                    "method": "POST",
+                    "project_id": 1,
+                    "catid": 100,
+                },
+            },
+        )
+    )
+    respx.post(f"{BASE_URL}/api/interface/up").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {}})
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.get_interface(DEFAULT_INTERFACE_ID)
+        await client.get_interface(DEFAULT_INTERFACE_ID)
+        assert get_route.call_count == 1
+
+        await client.update_interface(DEFAULT_INTERFACE_ID, title="新标题")
+
+    assert cache.get_interface(DEFAULT_INTERFACE_ID) is None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_iter_list_menu_trims_fields_and_handles_late_category_name() -> None:
+    """Test streamed list_menu records keep index fields and the category name."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+
+    # 分类名位于 list 之后，仍应正确注入 _cat_name
+    body = (
+        '{"errcode":0,"data":[{"_id":100,"list":[{"_id":1,"title":"登录","path":"/login",'
+        '"method":"POST","uid":11,"edit_uid":0,"__v":0}],"name":"用户模块"}]}'
+    )
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=httpx.Response(200, content=body.encode())
+    )
+
+    async with YApiClient(BASE_URL, cookies) as client:
+        records = [record async for record in client.iter_list_menu(1)]
+
+    assert records == [
+        {
+            "_id": 1,
+            "catid": 100,
+            "title": "登录",
+            "path": "/login",
+            "method": "POST",
+            "_cat_name": "用户模块",
+        }
+    ]
+
+
+MENU_FETCHES_AFTER_CREATE = 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_search_interfaces_reuses_cached_snapshot_until_create() -> None:
+    """Test searches share one list_menu fetch and create_interface invalidates it."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+
+    menu_route = respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": [
+                    {
+                        "_id": 100,
+                        "name": "用户模块",
+                        "list": [
+                            {"_id": 1, "title": "用户登录", "path": "/login", "method": "POST"},
+                            {"_id": 2, "title": "订单列表", "path": "/orders", "method": "GET"},
+                        ],
+                    }
+                ],
+            },
+        )
+    )
+    respx.post(f"{BASE_URL}/api/interface/add").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {"_id": 3}})
+    )
+    _mock_project_get()
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        first = await client.search_interfaces(1, "登录")
+        second = await client.search_interfaces(1, "orders")
+        assert menu_route.call_count == 1
+
+        await client.create_interface(1, 100, "新接口", "/new", "GET")
+        await client.search_interfaces(1, "")
+
+    assert [result.id for result in first] == [1]
+    assert [result.id for result in second] == [2]
+    assert menu_route.call_count == MENU_FETCHES_AFTER_CREATE
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_get_interface_strict_validation_flag() -> None:
+    """Test trusted responses skip validation unless strict_validation is set."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+
+    respx.get(f"{BASE_URL}/api/interface/get").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": {
+                    "_id": DEFAULT_INTERFACE_ID,
+                    "title": "自定义方法",
+                    "path": "/api/custom",
+                    "method": "PROPFIND",
+                    "project_id": 1,
+                    "catid": 100,
+                },
+            },
+        )
+    )
+
+    async with YApiClient(BASE_URL, cookies) as client:
+        interface = await client.get_interface(DEFAULT_INTERFACE_ID)
+    assert interface.id == DEFAULT_INTERFACE_ID
+    assert interface.method == "PROPFIND"
+
+    async with YApiClient(BASE_URL, cookies, strict_validation=True) as client:
+        with pytest.raises(ValidationError):
+            await client.get_interface(DEFAULT_INTERFACE_ID)
+
+
+def test_list_adapter_output_matches_model_dump() -> None:
+    """Test the precompiled serializers emit the same JSON as model_dump + json.dumps."""
+    data = {
+        "_id": DEFAULT_INTERFACE_ID,
+        "catid": 100,
+        "title": '用户 "登录"',
+        "path": "/api/login",
+        "method": "POST",
+        "project_id": 1,
+        "req_query": [{"name": "page", "required": "1"}],
+        "tag": ["auth"],
+    }
+    validated = YApiInterface(**data)
+    constructed = YApiInterface.model_construct(**data)
+
+    expected = json.dumps([validated.model_dump(by_alias=True)], ensure_ascii=False, indent=2)
+
+    assert INTERFACE_LIST_ADAPTER.dump_json([constructed], by_alias=True, indent=2).decode() == (
+        expected
+    )
+
+
+def _menu_response(project_id: int, titles: list[str]) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "errcode": 0,
+            "data": [
+                {
+                    "_id": project_id * 10,
+                    "name": f"项目{project_id}分类",
+                    "list": [
+                        {
+                            "_id": project_id * 100 + index,
+                            "title": title,
+                            "path": f"/p{project_id}/{index}",
+                            "method": "GET",
+                        }
+                        for index, title in enumerate(titles)
+                    ],
+                }
+            ],
+        },
+    )
+
+
+SLOW_PROJECT_ID = 3
+FAILING_PROJECT_ID = 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_search_projects_merges_ranked_hits_with_partial_failures() -> None:
+    """Test cross-project search ranks hits and reports failed/timed-out projects."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+
+    async def list_menu(request: httpx.Request) -> httpx.Response:
+        project_id = int(request.url.params["project_id"])
+        if project_id == FAILING_PROJECT_ID:
+            return httpx.Response(500, json={"errcode": 500, "errmsg": "服务器错误"})
+        if project_id == SLOW_PROJECT_ID:
+            await asyncio.sleep(5)
+        titles = {1: ["订单退款查询", "退款"], 4: ["申请退款"]}[project_id]
+        return _menu_response(project_id, titles)
+
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(side_effect=list_menu)
+
+    async with YApiClient(BASE_URL, cookies, cache=YApiCache()) as client:
+        result = await client.search_projects(
+            [1, FAILING_PROJECT_ID, SLOW_PROJECT_ID, 4, 1], "退款", concurrency=2, timeout=0.5
+        )
+
+    assert [(hit.project_id, hit.summary["title"]) for hit in result.hits] == [
+        (1, "退款"),
+        (1, "订单退款查询"),
+        (4, "申请退款"),
+    ]
+    assert list(result.errors) == [FAILING_PROJECT_ID]
+    assert result.timed_out == [SLOW_PROJECT_ID]
+    assert result.partial
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_list_group_projects() -> None:
+    """Test listing the projects of a group."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+
+    respx.get(f"{BASE_URL}/api/project/list").mock(
+        return_value=httpx.Response(
+            200,
+            json={"errcode": 0, "data": {"list": [{"_id": 1, "name": "A"}, {"_id": 4}]}},
+        )
+    )
+
+    async with YApiClient(BASE_URL, cookies) as client:
+        projects = await client.list_group_projects(group_id=9)
+
+    assert [project["_id"] for project in projects] == [1, 4]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_search_with_field_query() -> None:
+    """Test field-scoped queries filter the snapshot; bad queries fail before any request."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    route = respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询", "退款查询", "退款申请"])
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=YApiCache()) as client:
+        with pytest.raises(QuerySyntaxError):
+            await client.search_projects([1], "method:FETCH")
+        assert not route.called
+
+        results = await client.search_interfaces(1, "method:GET path:/p1/* 查询")
+        result = await client.search_projects([1], "path:/p1/? 退款")
+
+    assert [item.title for item in results] == ["订单查询", "退款查询"]
+    assert [hit.summary["title"] for hit in result.hits] == ["退款查询", "退款申请"]
+
+
+SEARCH_WITH_DETAILS_TOTAL = 3
+SEARCH_WITH_DETAILS_FETCHES = 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_search_with_details_fetches_best_hits_concurrently() -> None:
+    """Test search-then-fetch ranks hits and reuses cached definitions."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["查询退款记录", "退款", "退款申请", "订单列表"])
+    )
+
+    def interface_get(request: httpx.Request) -> httpx.Response:
+        interface_id = int(request.url.params["id"])
+        return httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": {
+                    "_id": interface_id,
+                    "title": f"接口{interface_id}",
+                    "path": f"/p1/{interface_id}",
+                    "method": "GET",
+                    "project_id": 1,
+                    "catid": 10,
+                },
+            },
+        )
+
+    get_route = respx.get(f"{BASE_URL}/api/interface/get").mock(side_effect=interface_get)
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.get_interface(101)
+        result = await client.search_with_details(1, "退款", top=2)
+
+    # "退款" 完全匹配优先，其次为标题前缀匹配，"查询退款记录" 排在最后
+    assert result.total == SEARCH_WITH_DETAILS_TOTAL
+    assert [interface.id for interface in result.interfaces] == [101, 102]
+    assert get_route.call_count == SEARCH_WITH_DETAILS_FETCHES
+
+
+RESULT_CACHE_MISSES = 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_search_results_are_cached_per_snapshot_version() -> None:
+    """Test repeated equivalent searches hit the result cache until the project changes."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询", "退款查询"])
+    )
+    respx.post(f"{BASE_URL}/api/interface/add").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {"_id": 3}})
+    )
+    _mock_project_get()
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        first = await client.search_interfaces(1, "method:get 查询")
+        second = await client.search_interfaces(1, "METHOD:GET 查询")
+        assert cache.results.hits == 1
+
+        await client.create_interface(1, 10, "新接口", "/new", "GET")
+        await client.search_interfaces(1, "method:get 查询")
+
+    assert first == second
+    assert cache.results.hits == 1
+    assert cache.results.misses == RESULT_CACHE_MISSES
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_unchanged_refresh_keeps_the_cached_snapshot() -> None:
+    """A forced re-fetch (e.g. a watcher poll) with the same rows keeps the snapshot version."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        side_effect=[
+            _menu_response(1, ["订单查询"]),
+            _menu_response(1, ["订单查询"]),
+            _menu_response(1, ["订单查询", "退款查询"]),
+        ]
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        first = await client.get_project_snapshot(1)
+        polled = await client.get_project_snapshot(1, refresh=True)
+        changed = await client.get_project_snapshot(1, refresh=True)
+
+    assert polled is first
+    assert changed is not first
+    assert changed.version > first.version
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_truncated_list_menu_is_not_reported_as_invalid_input() -> None:
+    """A list_menu body cut off mid-document raises a stream error, not a ValueError."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    body = _menu_response(1, ["订单查询", "退款查询"]).content
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=httpx.Response(200, content=body[: len(body) // 2])
+    )
+
+    async with YApiClient(BASE_URL, cookies) as client:
+        with pytest.raises(IncompleteJSONError) as excinfo:
+            await client.search_interfaces(1, "订单")
+
+    assert not isinstance(excinfo.value, ValueError)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_create_interface_preflight_rejects_conflicts_locally() -> None:
+    """Cached metadata rejects duplicate routes, basepath prefixes and unknown categories."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    menu_route = respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询", "退款查询"])
+    )
+    project_route = _mock_project_get("/api/v1")
+    add_route = respx.post(f"{BASE_URL}/api/interface/add").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {"_id": 3}})
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.search_interfaces(1, "")
+        with pytest.raises(DuplicateRouteError, match="接口 ID 100"):
+            await client.create_interface(1, 10, "重复", "/p1/0", "get")
+        with pytest.raises(BasepathInPathError, match="请改为 /orders"):
+            await client.create_interface(1, 10, "含 basepath", "/api/v1/orders", "GET")
+        with pytest.raises(UnknownCategoryError, match=r"catid 10（项目1分类）"):
+            await client.create_interface(1, 99, "错误分类", "/p1/new", "GET")
+        # 分类不存在时会刷新一次快照确认
+        assert menu_route.call_count == MENU_FETCHES_AFTER_CREATE
+
+        await client.create_interface(1, 10, "新接口", "/p1/new", "GET")
+        # 快照被写操作失效后，元数据仍记得刚创建的接口
+        with pytest.raises(DuplicateRouteError, match="接口 ID 3"):
+            await client.create_interface(1, 10, "再次创建", "/p1/new", "GET")
+
+    assert add_route.call_count == 1
+    assert project_route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_update_interface_preflight_allows_own_route() -> None:
+    """Updating an interface may keep its route but not take another one's."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询", "退款查询"])
+    )
+    _mock_project_get()
+    respx.get(f"{BASE_URL}/api/interface/get").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": {
+                    "_id": 100,
+                    "catid": 10,
+                    "project_id": 1,
+                    "title": "订单查询",
+                    "path": "/p1/0",
+                    "method": "GET",
+                },
+            },
+        )
+    )
+    up_route = respx.post(f"{BASE_URL}/api/interface/up").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {}})
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.search_interfaces(1, "")
+        await client.update_interface(100, path="/p1/0", title="新标题")
+        with pytest.raises(DuplicateRouteError, match="接口 ID 101"):
+            await client.update_interface(100, path="/p1/1")
+
+    assert up_route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_update_interface_preflight_checks_method_only_changes() -> None:
+    """Changing only the method is checked against the route it moves onto."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    routes = [(100, "GET"), (101, "POST")]
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": [
+                    {
+                        "_id": 10,
+                        "name": "订单",
+                        "list": [
+                            {"_id": _id, "title": method, "path": "/orders", "method": method}
+                            for _id, method in routes
+                        ],
+                    }
+                ],
+            },
+        )
+    )
+    _mock_project_get()
+    respx.get(f"{BASE_URL}/api/interface/get").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": {
+                    "_id": 100,
+                    "catid": 10,
+                    "project_id": 1,
+                    "title": "GET",
+                    "path": "/orders",
+                    "method": "GET",
+                },
+            },
+        )
+    )
+    up_route = respx.post(f"{BASE_URL}/api/interface/up").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {}})
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.search_interfaces(1, "")
+        with pytest.raises(DuplicateRouteError, match="接口 ID 101"):
+            await client.update_interface(100, method="post")
+        await client.update_interface(100, method="PUT")
+
+    assert up_route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_list_categories_reuses_search_snapshot() -> None:
+    """Listing categories after a search is served from the cached snapshot."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    menu_route = respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询", "退款查询"])
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.search_interfaces(1, "订单")
+        categories = await client.list_categories(1)
+        named = await client.list_categories(1, "项目1")
+
+    assert categories == [{"_id": 10, "name": "项目1分类", "interface_count": 2}]
+    assert named == categories
+    assert menu_route.call_count == 1
+
+
+def _interface_response(up_time: int) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "errcode": 0,
+            "data": {
+                "_id": 100,
+                "catid": CURRENT_CATID,
+                "project_id": 1,
+                "title": "订单查询",
+                "path": "/p1/0",
+                "method": "GET",
+                "up_time": up_time,
+            },
+        },
+    )
+
+
+CURRENT_CATID = 10
+SEEN_UP_TIME = 1_700_000_000
+MOVED_UP_TIME = 1_700_000_100
+READS_WITH_CONFLICT_CHECK = 2
+UPDATES_SENT = 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_update_interface_rejects_moved_up_time() -> None:
+    """expected_up_time forces a fresh read and refuses to overwrite newer changes."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    get_route = respx.get(f"{BASE_URL}/api/interface/get").mock(
+        side_effect=[_interface_response(SEEN_UP_TIME), _interface_response(MOVED_UP_TIME)]
+    )
+    up_route = respx.post(f"{BASE_URL}/api/interface/up").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {}})
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.get_interface(100)
+        with pytest.raises(UpdateConflictError) as exc_info:
+            await client.update_interface(100, title="新标题", check_conflict=True)
+
+    assert exc_info.value.current_up_time == MOVED_UP_TIME
+    assert get_route.call_count == READS_WITH_CONFLICT_CHECK
+    assert up_route.call_count == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_update_interface_with_matching_up_time() -> None:
+    """A matching expected_up_time lets the update through."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    respx.get(f"{BASE_URL}/api/interface/get").mock(return_value=_interface_response(SEEN_UP_TIME))
+    up_route = respx.post(f"{BASE_URL}/api/interface/up").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {}})
+    )
+
+    async with YApiClient(BASE_URL, cookies) as client:
+        await client.update_interface(100, title="新标题", expected_up_time=SEEN_UP_TIME)
+
+    assert json.loads(up_route.calls[0].request.content)["catid"] == CURRENT_CATID
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_update_interface_skips_read_when_catid_and_snapshot_known() -> None:
+    """With catid supplied and the project snapshot cached, no /interface/get is sent."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询", "退款查询"])
+    )
+    _mock_project_get()
+    get_route = respx.get(f"{BASE_URL}/api/interface/get").mock(
+        return_value=_interface_response(SEEN_UP_TIME)
+    )
+    up_route = respx.post(f"{BASE_URL}/api/interface/up").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {}})
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.search_interfaces(1, "")
+        await client.update_interface(100, catid=10, title="新标题")
+        # 未知分类时仍需读取现有定义
+        await client.update_interface(101, title="另一个")
+
+    assert up_route.call_count == UPDATES_SENT
+    assert get_route.call_count == 1
+
+
+RECOVERED_INTERFACE_ID = 100
+CREATE_ATTEMPTS = 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_create_interface_retry_after_timeout_finds_created_interface() -> None:
+    """A retry after an ambiguous timeout looks the route up instead of posting again."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    add_route = respx.post(f"{BASE_URL}/api/interface/add").mock(
+        side_effect=httpx.ReadTimeout("timed out")
+    )
+    menu_route = respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询"])
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.create_interface(1, 10, "订单查询", "/p1/0", "GET")
+        result = await client.create_interface(1, 10, "订单查询", "/p1/0", "GET")
+
+    assert result == {"action": "created", "interface_id": RECOVERED_INTERFACE_ID, "replayed": True}
+    assert add_route.call_count == 1
+    assert menu_route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_create_interface_retry_posts_again_when_route_is_missing() -> None:
+    """Without the route in the fresh snapshot the create is sent again."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    add_route = respx.post(f"{BASE_URL}/api/interface/add").mock(
+        side_effect=[
+            httpx.Response(502),
+            httpx.Response(200, json={"errcode": 0, "data": {"_id": CREATED_INTERFACE_ID}}),
+        ]
+    )
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(return_value=_menu_response(1, []))
+    _mock_project_get()
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.create_interface(1, 10, "新接口", "/p1/new", "GET")
+        result = await client.create_interface(1, 10, "新接口", "/p1/new", "GET")
+
+    assert result == {"action": "created", "interface_id": CREATED_INTERFACE_ID}
+    assert add_route.call_count == CREATE_ATTEMPTS
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_create_interface_replays_completed_key() -> None:
+    """Repeating a completed create returns the recorded interface; keys are bound to a route."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    add_route = respx.post(f"{BASE_URL}/api/interface/add").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {"_id": CREATED_INTERFACE_ID}})
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        first = await client.create_interface(1, 10, "新接口", "/new", "GET", idempotency_key="k1")
+        again = await client.create_interface(1, 10, "改名", "/new", "get", idempotency_key="k1")
+        with pytest.raises(IdempotencyKeyReuseError, match="GET /new"):
+            await client.create_interface(1, 10, "其他", "/other", "GET", idempotency_key="k1")
+
+    assert first["interface_id"] == again["interface_id"] == CREATED_INTERFACE_ID
+    assert again["replayed"] is True
+    assert add_route.call_count == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_create_interface_recreates_deleted_interface_under_derived_key() -> None:
+    """An identical create after the interface was deleted upstream posts again."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    add_route = respx.post(f"{BASE_URL}/api/interface/add").mock(
+        side_effect=[
+            httpx.Response(200, json={"errcode": 0, "data": {"_id": RECOVERED_INTERFACE_ID}}),
+            httpx.Response(200, json={"errcode": 0, "data": {"_id": CREATED_INTERFACE_ID}}),
+        ]
+    )
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        side_effect=[_menu_response(1, ["订单查询"]), _menu_response(1, [])]
+    )
+    _mock_project_get()
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        first = await client.create_interface(1, 10, "订单查询", "/p1/0", "GET")
+        replayed = await client.create_interface(1, 10, "订单查询", "/p1/0", "GET")
+        # 接口在 YApi 中被删除后，同样的创建请求是一次新的创建
+        recreated = await client.create_interface(1, 10, "订单查询", "/p1/0", "GET")
+
+    assert first["interface_id"] == replayed["interface_id"] == RECOVERED_INTERFACE_ID
+    assert replayed["replayed"] is True
+    assert recreated == {"action": "created", "interface_id": CREATED_INTERFACE_ID}
+    assert add_route.call_count == CREATE_ATTEMPTS
+
+
+NEW_CATEGORY_ID = 30
+MENU_FETCHES_AROUND_IMPORT = 2
+
+
+def _spec_operation(method: str, path: str, title: str, category: str) -> SpecOperation:
+    return SpecOperation(method, path, category, {"title": title, "path": path, "method": method})
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_import_plans_and_sends_only_changed_operations() -> None:
+    """Unchanged operations are skipped; new tags become categories before creating."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询", "退款查询"])
+    )
+    respx.get(f"{BASE_URL}/api/interface/get", params={"id": "100"}).mock(
+        return_value=_interface_response(SEEN_UP_TIME)
+    )
+    respx.get(f"{BASE_URL}/api/interface/get", params={"id": "101"}).mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "errcode": 0,
+                "data": {
+                    "_id": 101,
+                    "catid": 10,
+                    "project_id": 1,
+                    "title": "退款查询",
+                    "path": "/p1/1",
+                    "method": "GET",
+                },
+            },
+        )
+    )
+    _mock_project_get()
+    cat_route = respx.post(f"{BASE_URL}/api/interface/add_cat").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {"_id": NEW_CATEGORY_ID}})
+    )
+    add_route = respx.post(f"{BASE_URL}/api/interface/add").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {"_id": CREATED_INTERFACE_ID}})
+    )
+    up_route = respx.post(f"{BASE_URL}/api/interface/up").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "data": {}})
+    )
+    operations = [
+        _spec_operation("GET", "/p1/0", "订单查询", "项目1分类"),
+        _spec_operation("GET", "/p1/1", "退款详情", "项目1分类"),
+        _spec_operation("POST", "/refunds", "申请退款", "退款"),
+    ]
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        plan = await client.plan_import(1, operations)
+        assert plan.unchanged == 1
+        assert plan.new_categories == ["退款"]
+        assert [(write.interface_id, write.changed) for write in plan.writes] == [
+            (None, []),
+            (101, ["title"]),
+        ]
+        assert cache.fingerprints[100][0] == SEEN_UP_TIME
+
+        outcomes = await client.apply_import(plan)
+
+    assert [outcome["action"] for outcome in outcomes] == ["created", "updated"]
+    assert outcomes[0]["interface_id"] == CREATED_INTERFACE_ID
+    assert cat_route.call_count == 1
+    assert json.loads(add_route.calls[0].request.content)["catid"] == NEW_CATEGORY_ID
+    update = json.loads(up_route.calls[0].request.content)
+    assert update["title"] == "退款详情"
+    assert update["req_query"] == []
+    assert update["switch_notice"] is False
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_import_data_posts_document_with_project_token() -> None:
+    """The whole document goes to /open/import_data and the project's cache is dropped."""
+    cookies = make_cookies(DEFAULT_TOKEN)
+    cache = YApiCache()
+    menu_route = respx.get(f"{BASE_URL}/api/interface/list_menu").mock(
+        return_value=_menu_response(1, ["订单查询"])
+    )
+    import_route = respx.post(f"{BASE_URL}/api/open/import_data").mock(
+        return_value=httpx.Response(200, json={"errcode": 0, "errmsg": "成功导入接口 1 个"})
+    )
+
+    async with YApiClient(BASE_URL, cookies, cache=cache) as client:
+        await client.list_categories(1)
+        result = await client.import_data(1, "project-token", '{"swagger": "2.0"}', merge="good")
+        with pytest.raises(ValueError, match="mergin"):
+            await client.import_data(1, "project-token", "{}", merge="merge")
+        assert cache.get_metadata(1) is None
+        await client.list_categories(1)
+
+    assert result == {
+        "action": "imported",
+        "project_id": 1,
+        "merge": "good",
+        "message": "成功导入接口 1 个",
+    }
+    body = json.loads(import_route.calls[0].request.content)
+    assert body == {
+        "type": "swagger",
+        "merge": "good",
+        "token": "project-token",
+        "json": '{"swagger": "2.0"}',
+    }
+    assert import_route.call_count == 1
+    # 导入后重新拉取接口列表
+    assert menu_route.call_count == MENU_FETCHES_AROUND_IMPORT